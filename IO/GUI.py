@@ -230,9 +230,9 @@ class InputWindow(ctk.CTk):
         if selected_sensor == "ДЗИП":
             result_window = ZIPWindow(self, params)
         elif selected_sensor == "ДПИП":
-            result_window = SIPWindow(self, params)
-        else:
             result_window = PIPWindow(self, params)
+        else:
+            result_window = SIPWindow(self, params)
 
         # Обработчик закрытия дочернего окна
         result_window.protocol("WM_DELETE_WINDOW",
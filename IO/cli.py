@@ -0,0 +1,921 @@
+"""Консольный пакетный расчет датчиков без графического интерфейса
+
+Примеры:
+    python -m IO.cli calc расчеты/ --xv 0.1 --output результаты/
+    python -m IO.cli calc Тестовое.json --xv 0.1 --in-place
+    python -m IO.cli calc варианты.csv --xv 0.1 --output результаты.csv
+    python -m IO.cli sweep Тестовое.json --xv 0.1 --axis l0=0.11:0.3:1000 --axis D1=10:14:1000 -o перебор.csv
+    python -m IO.cli optimize --xv 0.1 --d-zT-min 10 --param z0=500 --param p_n=1.75e-7 -o подбор.json
+    python -m IO.cli pareto Тестовое.json --xv 0.1 --d-zT-min 10 --archive фронт.npz -o фронт.csv
+    python -m IO.cli tolerance Тестовое.json --xv 0.1 --d-zT-min 10 --tol D1=0.05 --tol mu_c=10% -n 1000000
+    python -m IO.cli sobol Тестовое.json --xv 0.1 --bound d2=3.5:4.5 --bound d_n=0.06:0.1 -n 8192
+    python -m IO.cli surrogate Тестовое.json --xv 0.1 --bound D2=7:11 --bound d2=3:5 --degree 6 -o модель.npz
+    python -m IO.cli field Тестовое.json --xv 0.1 --points 21
+    python -m IO.cli saturation Тестовое.json --xv 0.1 --material "Сталь 10" --current 3
+    python -m IO.cli frequency Тестовое.json --xv 0.1 --material "Сталь 10" --f-min 100 --f-max 1e6
+    python -m IO.cli thermal Тестовое.json --xv 0.1 --t-min -40 --t-max 120 --alpha mu_c=-2e-3
+    python -m IO.cli transient Тестовое.json --xv 0.1 --motion sine:0.1:200 --motion step:0.1:0.002:0.0005 --duration 0.01
+    python -m IO.cli demodulate Тестовое.json --xv 0.1 --scheme ПОСМ --fs 200000 --motion-f 20 --noise 1e-3
+    python -m IO.cli lookup Тестовое.json --xv 0.1 --quantity U --max-error 0.01 -o zip_lut.h
+    python -m IO.cli stream Тестовое.json --xv 0.1 --quantity U --simulate --rate 100000 --duration 2 --table lut.bin
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from models.sensor_zip import calc_batch, PARAMETERS, DEFAULTS
+from models import sensor_pip, sensor_sip
+from models.sweep import ParameterGrid, SweepStats, run_sweep
+from models.optimize_zip import optimize, OBJECTIVES, VARIABLES
+from models.pareto_zip import explore, ParetoArchive, DEFAULT_CRITERIA
+from models.tolerance_zip import analyze, OUTPUTS, DISTRIBUTIONS
+from models import sobol_zip, surrogate_zip, field_zip, saturation_zip, frequency_zip, thermal_zip, transient_zip, demodulation_zip, lookup_zip, stream_zip
+from core.bridge import SCHEMES
+from core.materials import BHCurve, MATERIALS, RESISTIVITY
+
+
+# Имена полей окна ZIPWindow, отличающиеся от параметров ZIPSensor
+PARAMETER_ALIASES = {"p_n_user": "p_n", "mu_c_user": "mu_c", "z0_user": "z0"}
+
+# Поля окна ZIPWindow по параметрам ZIPSensor (для записи файлов расчета)
+WINDOW_FIELDS = {name: field for field, name in PARAMETER_ALIASES.items()}
+
+# Параметры, читаемые из файлов расчета (ДЗИП, ДПИП и ДСИП, для sweep --sensor)
+KNOWN_PARAMETERS = PARAMETERS + tuple(dict.fromkeys(name for name in sensor_pip.PARAMETERS + sensor_sip.PARAMETERS
+                                                    if name not in PARAMETERS))
+
+
+def expand_paths(paths, suffixes=(".json", ".csv")):
+    """Список файлов: каталоги раскрываются в отсортированный список файлов расчета"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.lower().endswith(suffixes))
+        else:
+            files.append(path)
+    return files
+
+
+def sensor_parameters(values):
+    """Параметры датчика из словаря значений (с учетом имен полей окна)"""
+    params = {}
+    for key, value in values.items():
+        name = PARAMETER_ALIASES.get(key, key)
+        if name in KNOWN_PARAMETERS and value not in (None, ""):
+            params[name] = float(value)
+    return params
+
+
+def read_calculation(path):
+    """Файл расчета в формате ZIPWindow.save_calculation"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "user_parameters" not in data:
+        raise ValueError("Неверный формат файла расчёта")
+    return data
+
+
+def calculation_parameters(data):
+    params = sensor_parameters(data.get("metadata", {}))
+    params.update(sensor_parameters(data["user_parameters"]))
+    return params
+
+
+def read_csv(path):
+    """CSV с вариантами параметров в строках: (столбцы, параметры ZIPSensor)"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        fieldnames = reader.fieldnames or []
+
+    columns = {name: [row[name] for row in rows] for name in fieldnames}
+    params = {}
+    for key, values in columns.items():
+        name = PARAMETER_ALIASES.get(key, key)
+        if name in PARAMETERS:
+            params[name] = np.array([float(v) for v in values])
+    return columns, params
+
+
+def write_csv(path, columns, results):
+    names = list(columns) + [key for key in results if key not in columns]
+    count = len(next(iter(results.values()))) if results else 0
+
+    f = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+    try:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        for i in range(count):
+            writer.writerow([columns[name][i] if name in columns else repr(float(results[name][i]))
+                             for name in names])
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def stack_parameters(designs):
+    """Список полных словарей параметров -> столбцы для пакетного расчета"""
+    return {name: np.array([design[name] for design in designs]) for name in PARAMETERS}
+
+
+def report_throughput(count, elapsed, file=None):
+    file = file or sys.stderr
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"Рассчитано вариантов: {count} за {elapsed:.3f} с ({rate:.0f} вариантов/с)", file=file)
+
+
+def run_json(files, common, output=None, in_place=False):
+    """Пакетный расчет файлов расчета; результаты записываются в calculation_results"""
+    documents, designs = [], []
+    for path in files:
+        try:
+            data = read_calculation(path)
+        except (OSError, ValueError) as e:
+            print(f"Пропущен {path}: {e}", file=sys.stderr)
+            continue
+
+        sensor_type = data.get("metadata", {}).get("sensor_type", "ДЗИП")
+        if sensor_type != "ДЗИП":
+            print(f"Пропущен {path}: тип датчика {sensor_type} не поддерживается", file=sys.stderr)
+            continue
+
+        design = {**DEFAULTS, **common, **calculation_parameters(data)}
+        missing = [name for name in PARAMETERS if name not in design]
+        if missing:
+            print(f"Пропущен {path}: не заданы параметры {', '.join(missing)}", file=sys.stderr)
+            continue
+
+        documents.append((path, data))
+        designs.append(design)
+
+    if not designs:
+        return 0
+
+    table = stack_parameters(designs)
+
+    start = time.perf_counter()
+    results = calc_batch(table)
+    elapsed = time.perf_counter() - start
+
+    for i, (path, data) in enumerate(documents):
+        data["calculation_results"] = {key: float(values[i]) for key, values in results.items()}
+        if in_place:
+            target = path
+        elif output:
+            os.makedirs(output, exist_ok=True)
+            target = os.path.join(output, os.path.basename(path))
+        else:
+            continue
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+    if not output and not in_place:
+        for (path, _), d_z, f_p in zip(documents, results["d_z"], results["f_p"]):
+            print(f"{path}: d_z = {d_z * 100:.3f} %, f_p = {f_p:.3f} кГц")
+
+    report_throughput(len(documents), elapsed)
+    return len(documents)
+
+
+def run_csv(path, common, output=None):
+    columns, params = read_csv(path)
+
+    start = time.perf_counter()
+    results = calc_batch({**common, **params})
+    elapsed = time.perf_counter() - start
+
+    write_csv(output or "-", columns, results)
+    report_throughput(len(results["d_z"]), elapsed)
+    return len(results["d_z"])
+
+
+def common_parameters(args):
+    common = {}
+    if args.xv is not None:
+        common["xv"] = args.xv
+    if args.d_zT_min is not None:
+        common["d_zT_min"] = args.d_zT_min
+    for item in args.param or []:
+        name, _, value = item.partition("=")
+        common[PARAMETER_ALIASES.get(name, name)] = float(value)
+    return common
+
+
+def cmd_calc(args):
+    files = expand_paths(args.paths)
+    common = common_parameters(args)
+
+    json_files = [f for f in files if f.lower().endswith(".json")]
+    csv_files = [f for f in files if f.lower().endswith(".csv")]
+
+    if json_files:
+        run_json(json_files, common, args.output, args.in_place)
+
+    for path in csv_files:
+        if args.output and len(csv_files) > 1:
+            os.makedirs(args.output, exist_ok=True)
+            target = os.path.join(args.output, os.path.basename(path))
+        else:
+            target = args.output
+        run_csv(path, common, target)
+    return 0
+
+
+def parse_axis(text):
+    """Ось перебора: ИМЯ=начало:конец:точек или ИМЯ=знач1,знач2,..."""
+    name, _, spec = text.partition("=")
+    if ":" in spec:
+        start, stop, num = spec.split(":")
+        values = np.linspace(float(start), float(stop), int(num))
+    else:
+        values = np.array([float(v) for v in spec.split(",")])
+    return PARAMETER_ALIASES.get(name, name), values
+
+
+def cmd_sweep(args):
+    common = dict(DEFAULTS)
+    for path in args.base or []:
+        common.update(calculation_parameters(read_calculation(path)))
+    common.update(common_parameters(args))
+
+    axes = dict(parse_axis(text) for text in args.axis)
+    grid = ParameterGrid(axes, {k: v for k, v in common.items() if k not in axes})
+    keys = args.keys.split(",") if args.keys else None
+
+    stats = SweepStats()
+    f = sys.stdout if args.output in (None, "-") else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        header = True
+        for chunk in run_sweep(grid, args.sensor, args.chunk, args.workers, keys, stats=stats):
+            names = list(chunk.params) + list(chunk.results)
+            table = np.column_stack([*chunk.params.values(), *chunk.results.values()])
+            np.savetxt(f, table, delimiter=",", fmt="%.17g",
+                       header=",".join(names) if header else "", comments="")
+            header = False
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+    for pid, rate in sorted(stats.worker_rates().items()):
+        count = stats.workers[pid][0]
+        print(f"Процесс {pid}: {count} вариантов, {rate:.0f} вариантов/с", file=sys.stderr)
+    report_throughput(stats.designs, stats.elapsed)
+    return 0
+
+
+def parse_bound(text):
+    """Границы варьируемого параметра: ИМЯ=мин:макс"""
+    name, _, spec = text.partition("=")
+    low, high = spec.split(":")
+    return PARAMETER_ALIASES.get(name, name), (float(low), float(high))
+
+
+def cmd_optimize(args):
+    common = {}
+    for path in args.base or []:
+        common.update(calculation_parameters(read_calculation(path)))
+    common.update(common_parameters(args))
+
+    xv = common.pop("xv", None)
+    d_zT_min = common.pop("d_zT_min", None)
+    if xv is None or d_zT_min is None:
+        raise ValueError("Необходимо задать --xv и --d-zT-min")
+    eta_max = common.pop("eta_max", DEFAULTS["eta_max"])
+    # Геометрия из базового файла не фиксируется - ее подбирает оптимизатор
+    fixed = {name for name in VARIABLES if any(item.startswith(name + "=") for item in args.param or [])}
+    common = {k: v for k, v in common.items() if k not in VARIABLES or k in fixed}
+
+    result = optimize(xv, d_zT_min, dict(parse_bound(text) for text in args.bound or []),
+                      eta_max, args.objective, common, args.population, args.generations,
+                      seed=args.seed)
+
+    status = "требования выполнены" if result.feasible else f"требования не выполнены (нарушение {result.violation:.3g})"
+    print(f"Подбор: {status}, цель {args.objective} = {result.objective:.6g}, поколений {len(result.history)}")
+    for name in VARIABLES:
+        print(f"{name} = {result.params[name]:.6g}")
+    print(f"d_z = {result.results['d_z'] * 100:.3f} %, eta = {result.results['eta'] * 100:.3f} %, "
+          f"f_p = {result.results['f_p']:.3f} кГц")
+
+    if args.output:
+        data = {
+            "metadata": {"sensor_type": "ДЗИП", "xv": xv, "d_zT_min": d_zT_min, "eta_max": eta_max},
+            "user_parameters": {WINDOW_FIELDS.get(name, name): float(result.params[name]) for name in PARAMETERS
+                                if name not in ("xv", "d_zT_min")},
+            "calculation_results": result.results,
+            "optimization_history": [list(item) for item in result.history],
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+    report_throughput(result.evaluations, result.elapsed)
+    return 0 if result.feasible else 2
+
+
+def parse_criterion(text):
+    """Критерий: ИМЯ (минимизировать) или -ИМЯ (максимизировать)"""
+    return (text[1:], -1) if text.startswith("-") else (text, 1)
+
+
+def cmd_pareto(args):
+    common = {}
+    for path in args.base or []:
+        common.update(calculation_parameters(read_calculation(path)))
+    common.update(common_parameters(args))
+
+    xv = common.pop("xv", None)
+    if xv is None:
+        raise ValueError("Необходимо задать --xv")
+    d_zT_min = common.pop("d_zT_min", 0.0)
+    eta_max = common.pop("eta_max", DEFAULTS["eta_max"])
+    fixed = {name for name in VARIABLES if any(item.startswith(name + "=") for item in args.param or [])}
+    common = {k: v for k, v in common.items() if k not in VARIABLES or k in fixed}
+
+    criteria = dict(parse_criterion(text) for text in args.criteria.split(",")) if args.criteria else None
+    archive = ParetoArchive.load(args.archive) if args.archive and os.path.exists(args.archive) else None
+
+    archive, evaluations, elapsed = explore(
+        xv, d_zT_min, dict(parse_bound(text) for text in args.bound or []), eta_max, criteria,
+        common, archive, args.population, args.generations, capacity=args.capacity, seed=args.seed
+    )
+    if args.archive:
+        archive.save(args.archive)
+
+    columns = {**archive.params(), **archive.objectives()}
+    f = sys.stdout if args.output in (None, "-") else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        np.savetxt(f, np.column_stack(list(columns.values())) if len(archive) else np.empty((0, len(columns))),
+                   delimiter=",", fmt="%.17g", header=",".join(columns), comments="")
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+    print(f"Недоминируемых вариантов: {len(archive)}", file=sys.stderr)
+    report_throughput(evaluations, elapsed)
+    return 0
+
+
+def parse_tolerance(text, nominal):
+    """Допуск: ИМЯ=ЗНАЧЕНИЕ (в единицах параметра) или ИМЯ=ПРОЦЕНТ% (от номинала)"""
+    name, _, spec = text.partition("=")
+    name = PARAMETER_ALIASES.get(name, name)
+    if spec.endswith("%"):
+        return name, abs(nominal[name]) * float(spec[:-1]) / 100
+    return name, float(spec)
+
+
+def cmd_tolerance(args):
+    nominal = {}
+    for path in args.base or []:
+        nominal.update(calculation_parameters(read_calculation(path)))
+    nominal.update(common_parameters(args))
+    if "xv" not in nominal:
+        raise ValueError("Необходимо задать --xv")
+
+    tolerances = dict(parse_tolerance(text, {**DEFAULTS, **nominal}) for text in args.tol)
+    outputs = args.keys.split(",") if args.keys else OUTPUTS
+    result = analyze(nominal, tolerances, args.samples, args.chunk, args.distribution, outputs,
+                     seed=args.seed)
+
+    levels = (0.00135, 0.5, 0.99865)
+    print("результат,среднее,ско,мин,q0.135%,медиана,q99.865%,макс")
+    for name, stats in result.summary(levels).items():
+        q = stats["quantiles"]
+        values = (stats["mean"], stats["std"], stats["min"], *(q[level] for level in levels), stats["max"])
+        print(name + "," + ",".join(f"{v:.6g}" for v in values))
+    print(f"Годных: {result.passed} из {result.samples} ({result.yield_ * 100:.3f} %), "
+          f"d_zT_min = {nominal.get('d_zT_min', 0.0)} %", file=sys.stderr)
+    report_throughput(result.samples, result.elapsed)
+    return 0
+
+
+def cmd_sobol(args):
+    nominal = {}
+    for path in args.base or []:
+        nominal.update(calculation_parameters(read_calculation(path)))
+    nominal.update(common_parameters(args))
+    if "xv" not in nominal:
+        raise ValueError("Необходимо задать --xv")
+
+    bounds = dict(parse_bound(text) for text in args.bound or [])
+    outputs = args.keys.split(",") if args.keys else sobol_zip.OUTPUTS
+    result = sobol_zip.analyze(nominal, bounds or None, args.samples, outputs, args.chunk, args.workers,
+                               confidence=args.confidence, seed=args.seed)
+
+    print("результат,параметр,S1,S1_мин,S1_макс,ST,ST_мин,ST_макс")
+    for output, indices in result.summary().items():
+        for name, item in indices.items():
+            values = (item["S1"], *item["S1_conf"], item["ST"], *item["ST_conf"])
+            print(f"{output},{name}," + ",".join(f"{v:.4f}" for v in values))
+    for output, share in result.valid.items():
+        print(f"{output}: в оценку вошло {share * 100:.1f} % вариантов", file=sys.stderr)
+    report_throughput(result.evaluations, result.elapsed)
+    return 0
+
+
+def cmd_surrogate(args):
+    nominal = {}
+    for path in args.base or []:
+        nominal.update(calculation_parameters(read_calculation(path)))
+    nominal.update(common_parameters(args))
+    if "xv" not in nominal:
+        raise ValueError("Необходимо задать --xv")
+
+    bounds = dict(parse_bound(text) for text in args.bound)
+    outputs = args.keys.split(",") if args.keys else surrogate_zip.OUTPUTS
+    surrogate, elapsed = surrogate_zip.fit(bounds, nominal, outputs, args.degree, args.samples,
+                                           tolerance=args.tolerance, seed=args.seed)
+    surrogate.save(args.output)
+
+    print(f"Членов разложения: {len(surrogate.exponents)}, построение {elapsed:.3f} с")
+    for name, error in surrogate.errors.items():
+        status = "аппроксимация" if error <= surrogate.tolerance else "точный расчет"
+        print(f"{name}: наибольшая погрешность {error * 100:.4f} % ({status})")
+    return 0
+
+
+def cmd_field(args):
+    params = {}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    result = field_zip.compare(params, args.points, args.mu_r, args.step, args.gap_cells, material=args.material)
+    print("x,L,L_схема,погрешность_схемы,L/L0,L/L0_схема")
+    for row in zip(result["x"], result["L"], result["L_lumped"], result["L_error"],
+                   result["L_rel"], result["L_rel_lumped"]):
+        print(",".join(f"{v:.6g}" for v in row))
+    print(f"k_x: расчет поля {result['k_x']:.6g}, схема замещения {result['k_x_lumped']:.6g}", file=sys.stderr)
+    print(f"Неизвестных: {result['unknowns']} (в зазоре {result['gap_unknowns']}), "
+          f"{result['elapsed']:.3f} с", file=sys.stderr)
+    return 0
+
+
+def cmd_saturation(args):
+    params = {**DEFAULTS}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    curve = BHCurve.from_csv(args.bh) if args.bh else BHCurve.from_name(args.material)
+    results = calc_batch(params)
+    result = saturation_zip.calc_characteristic(results, params, curve, args.current, args.points)
+    print("x,z_x1,z_x2,B_1,mu_r1")
+    for row in zip(result["x"], result["z_x1"], result["z_x2"], result["B_1"], result["mu_r1"]):
+        print(",".join(f"{v:.6g}" for v in row))
+    print(f"z_0 = {float(result['z_0']):.6g} Ом (без насыщения {float(results['z_0']):.6g} Ом), "
+          f"gamma = {float(result['gamma']) * 100:.4f} % (без насыщения {float(results['gamma']) * 100:.4f} %), "
+          f"итераций {result['iterations']}", file=sys.stderr)
+    return 0
+
+
+def cmd_frequency(args):
+    params = {**DEFAULTS}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    options = {"material": args.material, "rho": args.rho, "tan_h": args.tan_h, "mu_r": args.mu_r}
+    f = np.logspace(np.log10(args.f_min), np.log10(args.f_max), args.f_points)
+    results = calc_batch(params)
+    grid = frequency_zip.calc_impedance(results, params, f, points=3, **options)
+    print("f,|Z|,R,X,eta,Q,S")
+    for j, value in enumerate(f):
+        Z = grid["Z_1"][1, j]
+        row = (value, abs(Z), Z.real, Z.imag, grid["eta"][1, j], grid["Q"][1, j], grid["S"][2, j])
+        print(",".join(f"{v:.6g}" for v in row))
+
+    choice = frequency_zip.calc_frequency(results, params, f, **options)
+    print(f"|Z(0)| = z0 = {params['z0']:.6g} Ом при f = {float(choice['f_p']):.6g} Гц: "
+          f"eta = {float(choice['eta']) * 100:.4f} %, Q = {float(choice['Q']):.4g}, "
+          f"S = {float(choice['S']) * 100:.4f} %", file=sys.stderr)
+    return 0
+
+
+def cmd_thermal(args):
+    params = {**DEFAULTS}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    coefficients = {}
+    for item in args.alpha or []:
+        name, _, value = item.partition("=")
+        if name not in thermal_zip.COEFFICIENTS:
+            raise ValueError(f"Неизвестный температурный коэффициент: {name}")
+        coefficients[name] = float(value)
+
+    T = np.linspace(args.t_min, args.t_max, args.t_points)
+    result = thermal_zip.calc_temperature(params, T, coefficients, args.t_ref)
+    print("T,d_z,eta,f_p,z_0,delta_d_z,delta_z_0")
+    for row in zip(T, *(result[name] for name in ("d_z", "eta", "f_p", "z_0", "delta_d_z", "delta_z_0"))):
+        print(",".join(f"{v:.6g}" for v in row))
+    print(f"d_z = {float(result['nominal']['d_z']) * 100:.4f} % при {args.t_ref:g} °C, "
+          f"температурная погрешность {float(result['error']) * 100:.4f} %, "
+          f"k_T = {float(result['k_T']):.4g} 1/K", file=sys.stderr)
+    return 0
+
+
+def parse_motion(text, duration):
+    """Закон движения якоря: sine:АМПЛИТУДА:ЧАСТОТА или step:АМПЛИТУДА:НАЧАЛО:ФРОНТ (мм, Гц, с)"""
+    kind, *values = text.split(":")
+    values = [float(v) for v in values]
+    if kind == "sine" and len(values) == 2:
+        return transient_zip.sine(*values, duration)
+    if kind == "step" and len(values) == 3:
+        return transient_zip.step(*values, duration)
+    raise ValueError(f"Неверный закон движения: {text}")
+
+
+def cmd_transient(args):
+    params = {**DEFAULTS}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    profiles = [parse_motion(text, args.duration) for text in args.motion]
+    options = {"U": args.voltage, "f": args.frequency, "samples": args.samples, "method": args.method}
+    results = calc_batch(params)
+    start = time.perf_counter()
+    f = sys.stdout if args.output in (None, "-") else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        f.write("profile,t,x,i_1,i_2,u\n")
+        for chunk in transient_zip.run_profiles(results, params, profiles, args.group_size, args.workers,
+                                                **options):
+            for k in range(chunk.u.shape[0]):
+                table = np.column_stack([np.full(len(chunk.t), chunk.first + k), chunk.t, chunk.x[k],
+                                         chunk.i_1[k], chunk.i_2[k], chunk.u[k]])
+                np.savetxt(f, table, delimiter=",", fmt="%.10g")
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    print(f"Законов движения: {len(profiles)}, время {time.perf_counter() - start:.2f} с", file=sys.stderr)
+    return 0
+
+
+def cmd_demodulate(args):
+    params = {**DEFAULTS}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    t = np.arange(int(round(args.duration * args.fs))) / args.fs
+    x = (args.amplitude or params["xv"]) * np.sin(2 * np.pi * args.motion_f * t)
+    results = calc_batch(params)
+    result = demodulation_zip.calc_demodulation(
+        results, params, x, args.fs, args.block, args.noise, args.seed, scheme=args.scheme,
+        U=args.voltage, f=args.frequency, cutoff=args.cutoff, order=args.order
+    )
+    if args.output:
+        table = np.column_stack([t, x, result["x_hat"], result["error"]])[::args.step]
+        np.savetxt(args.output, table, delimiter=",", fmt="%.10g", header="t,x,x_hat,error", comments="")
+    print(f"f = {result['f']:.6g} Гц, фильтр {result['cutoff']:.6g} Гц: погрешность "
+          f"{result['gamma'] * 100:.4f} % (нелинейность схемы {result['gamma_b'] * 100:.4f} %), "
+          f"{result['rate']:.3g} отсчетов/с", file=sys.stderr)
+    return 0
+
+
+def cmd_lookup(args):
+    params = {**DEFAULTS}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    results = calc_batch(params)
+    characteristic = lookup_zip.Characteristic(results, params, args.quantity, args.scheme, args.voltage)
+    max_error = args.max_error / 100 if args.max_error is not None else None
+    table, errors = lookup_zip.build(characteristic, args.points, args.bits, args.input_bits, max_error)
+    if args.output:
+        table.save(args.output, args.name)
+    print(f"Таблица x({args.quantity}): {table.points} точек, int{table.bits}_t, вход {table.input_bits} бит; "
+          f"погрешность интерполяции {errors['interpolation'] * 100:.5f} %, "
+          f"с округлением {errors['total'] * 100:.5f} % от xv", file=sys.stderr)
+    return 0
+
+
+async def run_stream(args, characteristic):
+    if args.table:
+        with open(args.table, "rb") as f:
+            convert = lookup_zip.LookupTable.from_bytes(f.read(), args.quantity).evaluate
+    else:
+        convert = characteristic.inverse
+
+    simulated = stream_zip.GeneratorSource(characteristic, args.rate, args.duration, frequency=args.motion_f,
+                                           noise=args.noise, block=args.block, seed=args.seed)
+    if args.serve is not None:
+        server = await stream_zip.serve(simulated, port=args.serve)
+        print(f"Имитатор стенда: порт {server.sockets[0].getsockname()[1]}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    if args.replay:
+        source = stream_zip.FileSource(args.replay, args.rate if args.paced else None, args.block)
+    elif args.connect:
+        host, _, port = args.connect.rpartition(":")
+        source = stream_zip.SocketSource(host or "127.0.0.1", int(port), args.block)
+    else:
+        source = simulated
+
+    f = None if args.output is None else sys.stdout if args.output == "-" else open(
+        args.output, "w", encoding="utf-8", newline="")
+    try:
+        sink = None if f is None else (lambda start, x: np.savetxt(f, x, fmt="%.10g"))
+        return await stream_zip.convert_stream(source, convert, sink, args.queue)
+    finally:
+        if f not in (None, sys.stdout):
+            f.close()
+
+
+def cmd_stream(args):
+    params = {**DEFAULTS}
+    for path in args.base or []:
+        params.update(calculation_parameters(read_calculation(path)))
+    params.update(common_parameters(args))
+    if "xv" not in params:
+        raise ValueError("Необходимо задать --xv")
+
+    results = calc_batch(params)
+    characteristic = lookup_zip.Characteristic(results, params, args.quantity, args.scheme, args.voltage)
+    stats = asyncio.run(run_stream(args, characteristic))
+    latency = ", ".join(f"p{q} {value * 1e3:.3f}" for q, value in stats.percentiles().items())
+    print(f"Отсчетов {stats.samples}, блоков {stats.blocks}, {stats.rate:.3g} отсчетов/с; "
+          f"задержка блока, мс: {latency}", file=sys.stderr)
+    if stats.max_error:
+        print(f"Наибольшая погрешность перемещения {stats.max_error:.3g} мм", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m IO.cli",
+        description="Пакетный расчет индуктивных преобразователей без графического интерфейса"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    calc = commands.add_parser("calc", help="расчет ДЗИП по файлам расчета (JSON) или таблицам (CSV)")
+    calc.add_argument("paths", nargs="+", help="файлы .json/.csv или каталоги с ними")
+    calc.add_argument("--xv", type=float, help="диапазон измерений, мм (если не задан в файле)")
+    calc.add_argument("--d-zT-min", dest="d_zT_min", type=float, help="допустимая погрешность, %%")
+    calc.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ",
+                      help="общий параметр для всех вариантов, например mu_c=3000")
+    calc.add_argument("--output", "-o", help="каталог (для JSON) или файл (для CSV) результатов")
+    calc.add_argument("--in-place", action="store_true", help="записать результаты в исходные файлы JSON")
+    calc.set_defaults(func=cmd_calc)
+
+    sweep = commands.add_parser("sweep", help="перебор сетки параметров на нескольких процессах")
+    sweep.add_argument("base", nargs="*", help="файлы расчета с базовыми значениями параметров")
+    sweep.add_argument("--axis", action="append", required=True, metavar="ИМЯ=НАЧ:КОН:ТОЧЕК",
+                       help="ось перебора (или ИМЯ=знач1,знач2,...)")
+    sweep.add_argument("--sensor", default="ДЗИП",
+                       help="тип датчика или датчик со схемой включения, например ДЗИП/ПРСМ")
+    sweep.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    sweep.add_argument("--d-zT-min", dest="d_zT_min", type=float, help="допустимая погрешность, %%")
+    sweep.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="общий параметр")
+    sweep.add_argument("--keys", help="сохраняемые результаты через запятую, например d_z,eta,f_p")
+    sweep.add_argument("--workers", type=int, help="число процессов (по умолчанию - число ядер)")
+    sweep.add_argument("--chunk", type=int, default=100_000, help="вариантов в одной части")
+    sweep.add_argument("--output", "-o", help="файл CSV результатов (по умолчанию stdout)")
+    sweep.set_defaults(func=cmd_sweep)
+
+    opt = commands.add_parser("optimize", help="подбор геометрии ДЗИП по требованиям к погрешности")
+    opt.add_argument("base", nargs="*", help="файлы расчета с параметрами материалов и питания")
+    opt.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    opt.add_argument("--d-zT-min", dest="d_zT_min", type=float, help="допустимая погрешность, %%")
+    opt.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ",
+                     help="фиксированный параметр (в том числе размер, исключаемый из подбора)")
+    opt.add_argument("--bound", action="append", metavar="ИМЯ=МИН:МАКС", help="границы подбираемого размера")
+    opt.add_argument("--objective", choices=sorted(OBJECTIVES), default="size",
+                     help="минимизируемая величина: габаритный объем или частота питания")
+    opt.add_argument("--population", type=int, default=60, help="размер популяции")
+    opt.add_argument("--generations", type=int, default=300, help="наибольшее число поколений")
+    opt.add_argument("--seed", type=int, help="начальное значение генератора случайных чисел")
+    opt.add_argument("--output", "-o", help="файл расчета JSON для найденного варианта")
+    opt.set_defaults(func=cmd_optimize)
+
+    pareto = commands.add_parser("pareto", help="множество Парето вариантов ДЗИП по нескольким критериям")
+    pareto.add_argument("base", nargs="*", help="файлы расчета с параметрами материалов и питания")
+    pareto.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    pareto.add_argument("--d-zT-min", dest="d_zT_min", type=float, help="допустимая погрешность, %%")
+    pareto.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="фиксированный параметр")
+    pareto.add_argument("--bound", action="append", metavar="ИМЯ=МИН:МАКС", help="границы подбираемого размера")
+    pareto.add_argument("--criteria", help="критерии через запятую, '-' перед именем - максимизировать "
+                        f"(по умолчанию {','.join(('-' if s < 0 else '') + n for n, s in DEFAULT_CRITERIA.items())})")
+    pareto.add_argument("--archive", help="файл архива .npz: продолжить поиск и сохранить результат")
+    pareto.add_argument("--capacity", type=int, default=500, help="наибольший размер архива")
+    pareto.add_argument("--population", type=int, default=100, help="вариантов в поколении")
+    pareto.add_argument("--generations", type=int, default=200, help="число поколений")
+    pareto.add_argument("--seed", type=int, help="начальное значение генератора случайных чисел")
+    pareto.add_argument("--output", "-o", help="файл CSV недоминируемых вариантов (по умолчанию stdout)")
+    pareto.set_defaults(func=cmd_pareto)
+
+    tol = commands.add_parser("tolerance", help="разброс результатов ДЗИП от допусков изготовления (Монте-Карло)")
+    tol.add_argument("base", nargs="*", help="файлы расчета с номинальными параметрами")
+    tol.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    tol.add_argument("--d-zT-min", dest="d_zT_min", type=float, help="допустимая погрешность, %%")
+    tol.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="номинальное значение параметра")
+    tol.add_argument("--tol", action="append", required=True, metavar="ИМЯ=ДОПУСК",
+                     help="половина поля допуска в единицах параметра или в %% от номинала, например mu_c=10%%")
+    tol.add_argument("--distribution", choices=DISTRIBUTIONS, default="normal",
+                     help="закон распределения отклонений (normal: поле допуска = 6 sigma)")
+    tol.add_argument("--samples", "-n", type=int, default=1_000_000, help="число вариантов")
+    tol.add_argument("--chunk", type=int, default=200_000, help="вариантов в одной части")
+    tol.add_argument("--keys", help=f"результаты через запятую (по умолчанию {','.join(OUTPUTS)})")
+    tol.add_argument("--seed", type=int, help="начальное значение генератора случайных чисел")
+    tol.set_defaults(func=cmd_tolerance)
+
+    sobol = commands.add_parser("sobol", help="индексы Соболя результатов ДЗИП (глобальная чувствительность)")
+    sobol.add_argument("base", nargs="*", help="файлы расчета с номинальными параметрами")
+    sobol.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    sobol.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="номинальное значение параметра")
+    sobol.add_argument("--bound", action="append", metavar="ИМЯ=МИН:МАКС",
+                       help="границы варьируемого параметра (по умолчанию все параметры +-10 %% от номинала)")
+    sobol.add_argument("--samples", "-n", type=int, default=4096,
+                       help="точек последовательности Соболя (расчетов - в k+2 раза больше)")
+    sobol.add_argument("--keys", help=f"результаты через запятую (по умолчанию {','.join(sobol_zip.OUTPUTS)})")
+    sobol.add_argument("--confidence", type=float, default=0.95, help="доверительная вероятность интервалов")
+    sobol.add_argument("--workers", type=int, help="число процессов (по умолчанию - число ядер)")
+    sobol.add_argument("--chunk", type=int, default=100_000, help="вариантов в одной части")
+    sobol.add_argument("--seed", type=int, help="начальное значение генератора случайных чисел")
+    sobol.set_defaults(func=cmd_sobol, d_zT_min=None)
+
+    sur = commands.add_parser("surrogate", help="построение быстрой аппроксимации результатов ДЗИП")
+    sur.add_argument("base", nargs="*", help="файлы расчета с параметрами, не входящими в аппроксимацию")
+    sur.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    sur.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="фиксированный параметр")
+    sur.add_argument("--bound", action="append", required=True, metavar="ИМЯ=МИН:МАКС",
+                     help="границы параметра аппроксимации")
+    sur.add_argument("--degree", type=int, default=4, help="наибольшая степень многочленов")
+    sur.add_argument("--samples", "-n", type=int, help="точек построения (по умолчанию - 4 на член разложения)")
+    sur.add_argument("--tolerance", type=float, default=surrogate_zip.TOLERANCE,
+                     help="допустимая относительная погрешность (при превышении - точный расчет)")
+    sur.add_argument("--keys", help=f"результаты через запятую (по умолчанию {','.join(surrogate_zip.OUTPUTS)})")
+    sur.add_argument("--seed", type=int, help="начальное значение генератора случайных чисел")
+    sur.add_argument("--output", "-o", required=True, help="файл аппроксимации .npz")
+    sur.set_defaults(func=cmd_surrogate, d_zT_min=None)
+
+    field = commands.add_parser("field", help="численный расчет поля ДЗИП и сравнение со схемой замещения")
+    field.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    field.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    field.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    field.add_argument("--points", type=int, default=21, help="точек характеристики L(x) на [-xv, xv]")
+    field.add_argument("--material", choices=sorted(MATERIALS), default="Сталь 10", help="материал магнитопровода")
+    field.add_argument("--mu-r", dest="mu_r", type=float,
+                       help="относительная проницаемость стали (по умолчанию - начальная проницаемость материала)")
+    field.add_argument("--step", type=float, help="наибольший шаг сетки в области датчика, мм (по умолчанию D1/80)")
+    field.add_argument("--gap-cells", dest="gap_cells", type=int, default=2, help="ячеек сетки по высоте зазора")
+    field.set_defaults(func=cmd_field, d_zT_min=None)
+
+    sat = commands.add_parser("saturation", help="характеристика ДЗИП с насыщением стали по кривой B(H)")
+    sat.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    sat.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    sat.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    sat.add_argument("--material", choices=sorted(MATERIALS), default="Сталь 10", help="материал магнитопровода")
+    sat.add_argument("--bh", help="файл CSV кривой намагничивания со столбцами H (А/м) и B (Тл)")
+    sat.add_argument("--current", type=float, required=True, help="амплитуда тока катушки, А")
+    sat.add_argument("--points", type=int, default=21, help="точек характеристики на [-xv, xv]")
+    sat.set_defaults(func=cmd_saturation, d_zT_min=None)
+
+    freq = commands.add_parser("frequency", help="частотная характеристика Z(f) ДЗИП с потерями в стали")
+    freq.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    freq.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    freq.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    freq.add_argument("--f-min", dest="f_min", type=float, default=10.0, help="наименьшая частота, Гц")
+    freq.add_argument("--f-max", dest="f_max", type=float, default=1e6, help="наибольшая частота, Гц")
+    freq.add_argument("--f-points", dest="f_points", type=int, default=61, help="точек по частоте (логарифмически)")
+    freq.add_argument("--material", choices=sorted(RESISTIVITY), default="Сталь 10",
+                      help="материал магнитопровода (проницаемость и удельное сопротивление)")
+    freq.add_argument("--rho", type=float, help="удельное сопротивление стали, Ом·м")
+    freq.add_argument("--tan-h", dest="tan_h", type=float, default=0.0, help="тангенс угла потерь на гистерезис")
+    freq.add_argument("--mu-r", dest="mu_r", type=float,
+                      help="относительная проницаемость стали (по умолчанию - начальная проницаемость материала)")
+    freq.set_defaults(func=cmd_frequency, d_zT_min=None)
+
+    thermal = commands.add_parser("thermal", help="температурная погрешность ДЗИП")
+    thermal.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    thermal.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    thermal.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    thermal.add_argument("--t-min", dest="t_min", type=float, default=thermal_zip.T_RANGE[0],
+                         help="наименьшая температура, °C")
+    thermal.add_argument("--t-max", dest="t_max", type=float, default=thermal_zip.T_RANGE[1],
+                         help="наибольшая температура, °C")
+    thermal.add_argument("--t-points", dest="t_points", type=int, default=9, help="число температур")
+    thermal.add_argument("--t-ref", dest="t_ref", type=float, default=thermal_zip.T_REF,
+                         help="температура, при которой заданы параметры, °C")
+    thermal.add_argument("--alpha", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ",
+                         help=f"температурный коэффициент, 1/K ({', '.join(thermal_zip.COEFFICIENTS)})")
+    thermal.set_defaults(func=cmd_thermal, d_zT_min=None)
+
+    trans = commands.add_parser("transient", help="переходный процесс ДЗИП при движении якоря")
+    trans.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    trans.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    trans.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    trans.add_argument("--motion", action="append", required=True, metavar="ЗАКОН",
+                       help="sine:АМПЛИТУДА:ЧАСТОТА или step:АМПЛИТУДА:НАЧАЛО:ФРОНТ (мм, Гц, с)")
+    trans.add_argument("--duration", type=float, default=0.01, help="длительность, с")
+    trans.add_argument("--voltage", type=float, default=1.0, help="амплитуда напряжения питания, В")
+    trans.add_argument("--frequency", type=float, help="частота питания, Гц (по умолчанию по f_p)")
+    trans.add_argument("--samples", type=int, default=transient_zip.SAMPLES, help="отсчетов на период питания")
+    trans.add_argument("--method", choices=transient_zip.METHODS, default="Radau", help="метод интегрирования")
+    trans.add_argument("--group-size", dest="group_size", type=int, default=8,
+                       help="законов движения в одной системе уравнений")
+    trans.add_argument("--workers", type=int, help="число процессов")
+    trans.add_argument("-o", "--output", help="файл CSV (по умолчанию stdout)")
+    trans.set_defaults(func=cmd_transient, d_zT_min=None)
+
+    demod = commands.add_parser("demodulate", help="синхронное детектирование выходного сигнала моста")
+    demod.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    demod.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    demod.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    demod.add_argument("--scheme", choices=SCHEMES, default="ПРСМ", help="схема включения")
+    demod.add_argument("--fs", type=float, default=200e3, help="частота дискретизации, Гц")
+    demod.add_argument("--duration", type=float, default=5.0, help="длительность, с")
+    demod.add_argument("--amplitude", type=float, help="амплитуда движения якоря, мм (по умолчанию xv)")
+    demod.add_argument("--motion-f", dest="motion_f", type=float, default=20.0, help="частота движения якоря, Гц")
+    demod.add_argument("--voltage", type=float, default=1.0, help="амплитуда напряжения питания, В")
+    demod.add_argument("--frequency", type=float, help="частота питания, Гц (по умолчанию по f_p)")
+    demod.add_argument("--cutoff", type=float, help="частота среза фильтра, Гц (по умолчанию f/10)")
+    demod.add_argument("--order", type=int, default=demodulation_zip.ORDER, help="порядок фильтра")
+    demod.add_argument("--noise", type=float, default=0.0, help="СКО шума на выходе моста, В")
+    demod.add_argument("--seed", type=int, help="зерно генератора шума")
+    demod.add_argument("--block", type=int, default=demodulation_zip.BLOCK, help="отсчетов в блоке")
+    demod.add_argument("--step", type=int, default=100, help="шаг прореживания отсчетов в файле")
+    demod.add_argument("-o", "--output", help="файл CSV с отсчетами t, x, x_hat, error")
+    demod.set_defaults(func=cmd_demodulate, d_zT_min=None)
+
+    lookup = commands.add_parser("lookup", help="таблица обратной характеристики для встроенного ПО")
+    lookup.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    lookup.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    lookup.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    lookup.add_argument("--quantity", choices=lookup_zip.QUANTITIES, default="Z",
+                        help="Z - сопротивление половины датчика, U - выходное напряжение схемы")
+    lookup.add_argument("--scheme", choices=SCHEMES, default="ПРСМ", help="схема включения (для U)")
+    lookup.add_argument("--voltage", type=float, default=1.0, help="напряжение питания схемы, В")
+    lookup.add_argument("--points", type=int, help="число точек таблицы 2**n + 1 (по умолчанию 257)")
+    lookup.add_argument("--max-error", dest="max_error", type=float,
+                        help="допустимая погрешность, %% от xv (подбор числа точек)")
+    lookup.add_argument("--bits", type=int, choices=lookup_zip.BITS, default=16, help="разрядность кодов перемещения")
+    lookup.add_argument("--input-bits", dest="input_bits", type=int, default=16, help="разрядность кода АЦП")
+    lookup.add_argument("--name", default="zip_lut", help="имя таблицы в заголовочном файле C")
+    lookup.add_argument("-o", "--output", help="файл .h (заголовок C) или двоичный файл")
+    lookup.set_defaults(func=cmd_lookup, d_zT_min=None)
+
+    stream = commands.add_parser("stream", help="потоковое преобразование измерений в перемещение")
+    stream.add_argument("base", nargs="*", help="файлы расчета с параметрами датчика")
+    stream.add_argument("--xv", type=float, help="диапазон измерений, мм")
+    stream.add_argument("--param", action="append", metavar="ИМЯ=ЗНАЧЕНИЕ", help="параметр датчика")
+    stream.add_argument("--quantity", choices=lookup_zip.QUANTITIES, default="Z",
+                        help="Z - сопротивление половины датчика, U - выходное напряжение схемы")
+    stream.add_argument("--scheme", choices=SCHEMES, default="ПРСМ", help="схема включения (для U)")
+    stream.add_argument("--voltage", type=float, default=1.0, help="напряжение питания схемы, В")
+    stream.add_argument("--table", help="двоичный файл таблицы (lookup); по умолчанию - точное обращение")
+    source = stream.add_mutually_exclusive_group()
+    source.add_argument("--simulate", action="store_true", help="имитация измерений (по умолчанию)")
+    source.add_argument("--replay", metavar="ФАЙЛ", help="воспроизведение измерений из .npy или CSV")
+    source.add_argument("--connect", metavar="ХОСТ:ПОРТ", help="измерения из TCP-соединения (float64)")
+    source.add_argument("--serve", type=int, metavar="ПОРТ", help="запустить имитатор стенда на порту")
+    stream.add_argument("--rate", type=float, default=100_000, help="частота отсчетов, Гц")
+    stream.add_argument("--paced", action="store_true", help="воспроизводить файл с частотой --rate")
+    stream.add_argument("--duration", type=float, default=1.0, help="длительность имитации, с")
+    stream.add_argument("--motion-f", dest="motion_f", type=float, default=20.0, help="частота движения якоря, Гц")
+    stream.add_argument("--noise", type=float, default=0.0, help="СКО шума измерений")
+    stream.add_argument("--seed", type=int, help="зерно генератора шума")
+    stream.add_argument("--block", type=int, default=stream_zip.BLOCK, help="отсчетов в блоке")
+    stream.add_argument("--queue", type=int, default=stream_zip.QUEUE_SIZE, help="блоков в очереди")
+    stream.add_argument("-o", "--output", help="файл перемещений, мм ('-' - stdout)")
+    stream.set_defaults(func=cmd_stream, d_zT_min=None)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
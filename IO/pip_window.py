@@ -1,34 +1,265 @@
 import customtkinter as ctk
+from tkinter import messagebox
+from matplotlib.patches import Rectangle
+from models import sensor_pip
+from core.validation import pip_geometry_violation
+from IO.zip_window import ZIPWindow
 
 
-class PIPWindow(ctk.CTkToplevel):
-    def __init__(self, parent, params):
-        super().__init__()
-        self.title("ДПИП - Результаты расчета")
-        self.geometry("1000x700")
-        self.params = params
-        self.create_tabs()
+class PIPWindow(ZIPWindow):
+    """Окно расчета ДПИП: интерфейс, файлы и отчеты - как в ZIPWindow"""
 
-    def create_tabs(self):
-        self.tabview = ctk.CTkTabview(self)
-        self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
+    SENSOR = "ДПИП"
+    MODEL = sensor_pip
+    SENSITIVITY = None
+    SENSOR_DESCRIPTION = "дифференциального ПИП"
 
-        self.scheme_tab = self.tabview.add("Scheme")
-        self.results_tab = self.tabview.add("Results")
-        self.params_tab = self.tabview.add("Start Params")
+    GEOMETRY_FIELDS = ("D1", "D2", "d1", "d2", "h2", "h3", "l0", "t_B")
 
-        self.setup_scheme_tab()
-        self.setup_results_tab()
-        self.setup_params_tab()
+    INPUT_NAMES = {
+        **{k: v for k, v in ZIPWindow.INPUT_NAMES.items() if k != "h1"},
+        "d1": "Внешний диаметр якоря d1, мм",
+        "d2": "Внутренний диаметр якоря d2, мм",
+        "h2": "Высота катушки h2, мм",
+        "h3": "Высота сердечника h3, мм",
+        "l0": "Начальное перекрытие l0, мм",
+        "t_B": "Радиальный зазор t_B, мм",
+    }
 
-    def setup_scheme_tab(self):
-        label = ctk.CTkLabel(self.scheme_tab, text="Схема ДПИП", font=("Arial", 16))
-        label.pack(pady=20)
+    RESULT_NAMES = {
+        "S_B": "Площадь сечения воздушной части магнитопровода S_B",
+        "H": "Толщина верхней части сердечника H",
+        "d": "Диаметр отверстия сердечника d",
+        "L_cd": "Длина сечения сердечника L_cd",
+        "h_c": "Высота средней линии h_c",
+        "S_cd": "Площадь сечения сердечника S_cd",
+        "S_y": "Площадь сечения якоря S_y",
+        "L_y": "Длина якоря L_y",
+        "L_c": "Длина магнитопровода L_c",
+        "S_c": "Площадь магнитопровода S_c",
+        "S_ok": "Площадь окна катушки S_ok",
+        "R_cp": "Средний радиус катушки R_cp",
+        "N": "Коэффициент размагничивания магнитопровода N",
+        "R_mC": "Магнитное сопротивление стальной части R_mC",
+        "R_B0": "Начальное сопротивление воздушных зазоров R_B0",
+        "k_x": "Коэффициент чувствительности k_x",
+        "alpha": "Коэффициент alpha",
+        "beta": "Коэффициент beta",
+        "Z_x": "Полное электрическое сопротивление катушки Z_x",
+        "w_0": "Удельное число витков катушки w_0",
+        "w": "Число витков катушки w",
+        "R_k": "Активное сопротивление катушки R_k",
+        "f_p": "Частота напряжения питания f_p",
+        "gamma": "Приведенная погрешность от нелинейности gamma",
+        "q": "Параметр q",
+        "d_z": "Относительная девиация сопротивления d_z",
+        "eta": "Доля активного сопротивления катушки eta",
+    }
 
-    def setup_results_tab(self):
-        label = ctk.CTkLabel(self.results_tab, text="Результаты ДПИП", font=("Arial", 16))
-        label.pack(pady=20)
+    RESULT_UNITS = {
+        'S_B': 'мм²', 'S_cd': 'мм²', 'S_y': 'мм²', 'S_c': 'мм²', 'S_ok': 'мм²',
+        'H': 'мм', 'd': 'мм', 'h_c': 'мм',
+        'L_cd': 'мм', 'L_y': 'мм', 'L_c': 'мм', 'R_cp': 'мм',
+        'Z_x': 'Ом', 'R_k': 'Ом',
+        'f_p': 'Гц',
+        'gamma': '%', 'd_z': '%', 'eta': '%',
+        'k_x': '1/мм'
+    }
 
-    def setup_params_tab(self):
-        label = ctk.CTkLabel(self.params_tab, text="Параметры ДПИП", font=("Arial", 16))
-        label.pack(pady=20)
\ No newline at end of file
+    RESULT_CATEGORIES = {
+        "Геометрические параметры": [
+            'S_B', 'H', 'd', 'L_cd', 'h_c', 'S_cd', 'S_y', 'L_y', 'L_c', 'S_c', 'S_ok', 'R_cp'
+        ],
+        "Магнитные параметры": [
+            'N', 'R_mC', 'R_B0', 'k_x', 'alpha', 'beta'
+        ],
+        "Электрические параметры": [
+            'Z_x', 'w_0', 'w', 'R_k', 'f_p'
+        ],
+        "Параметры точности": [
+            'gamma', 'q', 'd_z', 'eta'
+        ]
+    }
+
+    def init_parameters(self):
+        super().init_parameters()
+        self.t_B = 0.0
+
+    def create_geometry_section(self):
+        """Создание секции геометрических параметров"""
+        geom_label = ctk.CTkLabel(
+            self.left_frame,
+            text="Геометрические параметры:",
+            font=("Arial", 12, "bold")
+        )
+        geom_label.pack(pady=(10, 4), anchor="w")
+
+        geom_params = [
+            ("Внешний диаметр D1, мм:", "D1", ""),
+            ("Внешний диаметр D2, мм:", "D2", ""),
+            ("Диаметр якоря d1, мм:", "d1", ""),
+            ("Диаметр отв. якоря d2, мм:", "d2", "0"),
+            ("Высота катушки h2, мм:", "h2", ""),
+            ("Высота сердечника h3, мм:", "h3", ""),
+            ("Начальное перекрытие l0, мм:", "l0", ""),
+            ("Радиальный зазор t_B, мм:", "t_B", ""),
+        ]
+
+        for label_text, name, default in geom_params:
+            self.create_input_row(label_text, name, default)
+
+    def draw_scheme(self):
+        self.draw_pip_scheme()
+
+    def draw_pip_scheme(self):
+        """Отрисовка схемы ПИП: сердечник с катушкой и якорь в отверстии d"""
+        try:
+            self.update_parameters_from_input(skip_validation=True)
+
+            # Проверяем, есть ли основные геометрические параметры
+            if not all([self.D1, self.D2, self.d1, self.h2, self.h3, self.l0, self.t_B]):
+                self.draw_empty_scheme()
+                return
+
+        except Exception:
+            self.draw_empty_scheme()
+            return
+
+        appearance = ctk.get_appearance_mode()
+        if appearance.lower().startswith("dark"):
+            bg = "#2b2b2b"
+            line_color = "white"
+        else:
+            bg = "white"
+            line_color = "black"
+
+        self.ax.clear()
+        self.figure.patch.set_facecolor(bg)
+        self.ax.set_facecolor(bg)
+        self.ax.set_aspect("equal")
+
+        D1, D2, d1, d2 = self.D1, self.D2, self.d1, self.d2
+        h2, h3, l0 = self.h2, self.h3, self.l0
+        d = d1 + 2 * self.t_B
+        H = h3 - h2
+
+        # Координаты: нижний полюс (перекрытие l0), окно катушки h2, верхняя часть H
+        y_window_bottom = l0
+        y_window_top = y_window_bottom + h2
+        y_core_top = y_window_top + H
+
+        # --- СЕРДЕЧНИК ---
+        for sign in (-1, 1):
+            x_outer = sign * D1 / 2
+            x_bore = sign * d / 2
+            x_window = sign * D2 / 2
+            # нижний полюс и верхняя часть с отверстием d
+            self.ax.add_patch(Rectangle((min(x_bore, x_window), 0), abs(x_window - x_bore), l0,
+                                        linewidth=2, edgecolor=line_color, facecolor="none"))
+            self.ax.add_patch(Rectangle((min(x_bore, x_outer), y_window_top), abs(x_outer - x_bore), H,
+                                        linewidth=2, edgecolor=line_color, facecolor="none"))
+            # наружная стенка
+            self.ax.add_patch(Rectangle((min(x_window, x_outer), 0), abs(x_outer - x_window), y_window_top,
+                                        linewidth=2, edgecolor=line_color, facecolor="none"))
+
+            # --- КАТУШКА ---
+            x0, x1 = sorted((x_bore, x_window))
+            self.ax.add_patch(Rectangle((x0, y_window_bottom), x1 - x0, h2,
+                                        linewidth=2, edgecolor=line_color, facecolor="none"))
+            self.ax.plot([x0, x1], [y_window_bottom, y_window_top], color=line_color, linewidth=1)
+            self.ax.plot([x0, x1], [y_window_top, y_window_bottom], color=line_color, linewidth=1)
+
+        # --- ЯКОРЬ ---
+        y_armature_top = y_core_top + H
+        self.ax.add_patch(Rectangle((-d1 / 2, 0), d1, y_armature_top,
+                                    linewidth=2, edgecolor=line_color, facecolor="none"))
+        if d2 > 0:
+            self.ax.add_patch(Rectangle((-d2 / 2, 0), d2, y_armature_top,
+                                        linewidth=1, linestyle=":", edgecolor=line_color, facecolor="none"))
+
+        # --- ПЕРЕКРЫТИЕ l0 ---
+        self.ax.text(D1 / 2 * 1.05, l0 / 2, f"l₀ = {self.format_value(l0)} мм",
+                     color=line_color, fontsize=9, va="center")
+
+        # --- ОСЬ X ---
+        y_min = -l0 * 0.5
+        y_max = y_armature_top + H * 0.5
+        self.ax.plot([0, 0], [y_min, y_max], linestyle="--", color=line_color)
+
+        # --- ПОДПИСИ ---
+        self.ax.text(D1 / 2 * 0.8, y_core_top + H * 0.3, "1", fontsize=12, fontweight="bold", color=line_color)
+        self.ax.text(-(D2 + d) / 4, y_window_bottom + h2 / 2, "2", fontsize=12, fontweight="bold",
+                     color=line_color, ha="center", va="center", bbox=dict(facecolor=bg, edgecolor="none"))
+        self.ax.text(0, y_armature_top + H * 0.2, "3", fontsize=12, fontweight="bold", color=line_color, ha="center")
+
+        # --- МАСШТАБ ---
+        x_extent = D1 / 2 * 1.6
+        self.ax.set_xlim(-x_extent, x_extent)
+        self.ax.set_ylim(y_min, y_max)
+        self.ax.axis("off")
+
+        if hasattr(self, "canvas"):
+            self.canvas.draw()
+
+    def _validate_geometry(self):
+        """Проверка геометрических условий ДПИП"""
+        errors = []
+
+        # Проверка обязательных полей (якорь может быть сплошным, d2 = 0)
+        required_fields = ["D1", "D2", "d1", "h2", "h3", "l0", "t_B",
+                           "d_n", "p_n_user", "mu_c_user", "z0_user"]
+
+        for param in required_fields:
+            if getattr(self, param) <= 0:
+                errors.append(f"{param} должен быть задан и положителен")
+                self.input_frames[param].configure(fg_color="red")
+
+        if not errors:
+            d = self.d1 + 2 * self.t_B
+
+            if self.D1 <= self.D2:
+                errors.append("D1 должен быть больше D2")
+                self.input_frames["D1"].configure(fg_color="red")
+                self.input_frames["D2"].configure(fg_color="red")
+
+            if self.D2 <= d:
+                errors.append(f"D2 должен быть больше диаметра отверстия d = d1 + 2·t_B ({self.format_value(d)} мм)")
+                self.input_frames["D2"].configure(fg_color="red")
+                self.input_frames["t_B"].configure(fg_color="red")
+
+            if self.d1 <= self.d2:
+                errors.append("d1 должен быть больше d2")
+                self.input_frames["d1"].configure(fg_color="red")
+                self.input_frames["d2"].configure(fg_color="red")
+
+            if self.h3 <= self.h2:
+                errors.append("h3 должен быть больше h2")
+                self.input_frames["h3"].configure(fg_color="red")
+                self.input_frames["h2"].configure(fg_color="red")
+
+        # Проверка требования по перекрытию
+        if self.l0 <= self.xv:
+            errors.append(f"Начальное перекрытие l0 ({self.l0} мм) должно быть больше диапазона измерения xv ({self.xv} мм)")
+            self.input_frames["l0"].configure(fg_color="red")
+
+        if errors:
+            error_msg = "Ошибка параметров:\n" + "\n".join(errors)
+            messagebox.showerror("Ошибка", error_msg)
+            raise ValueError(error_msg)
+
+    def inputs_valid(self, values):
+        required = [values[name] for name in self.GEOMETRY_FIELDS if name != "d2"]
+        if min(required) <= 0 or values["z0_user"] <= 0 or values["d_n"] <= 0:
+            return False
+        return pip_geometry_violation(values["D1"], values["D2"], values["d1"], values["d2"], values["h2"],
+                                      values["h3"], values["l0"], values["t_B"], self.xv) == 0
+
+    def graph_inputs(self):
+        """Входные величины графа расчета из параметров окна"""
+        return {
+            "D1": self.D1, "D2": self.D2, "d1": self.d1, "d2": self.d2,
+            "h2": self.h2, "h3": self.h3, "l0": self.l0, "t_B": self.t_B,
+            "z0": self.z0_user, "d_n": self.d_n, "xv": self.xv,
+            "x": self.x, "K_kp": self.K_kp, "p_n": self.p_n_user,
+            "mu_0": self.mu_0, "mu_c": self.mu_c_user
+        }
@@ -0,0 +1,168 @@
+import queue
+import threading
+
+
+class CancelledError(Exception):
+    """Задание отменено пользователем или заменено более новым"""
+
+
+class CalcJob:
+    """Задание планировщика: функция выполняется в рабочем потоке
+
+    Функция получает задание первым аргументом и может сообщать о ходе
+    работы через report() и проверять отмену через check() или cancelled.
+    """
+
+    def __init__(self, key, func, args, kwargs, on_done=None, on_error=None, on_progress=None):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.scheduler = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Прерывание задания, если оно отменено"""
+        if self._cancel.is_set():
+            raise CancelledError(self.key)
+
+    def report(self, fraction, text=""):
+        """Ход выполнения: доля 0..1 и подпись (передаются в главный поток)"""
+        self.check()
+        if self.scheduler is not None:
+            self.scheduler._events.put(("progress", self, (fraction, text)))
+
+
+class CalcScheduler:
+    """Выполнение расчетов в рабочем потоке без блокировки окна Tk
+
+    Задания выполняются по очереди в одном потоке, поэтому могут пользоваться
+    общими объектами расчета (графом, кэшем) без блокировок. Из задания с
+    тем же ключом остается только последнее: ожидающее задание заменяется,
+    выполняющееся отменяется. Обратные вызовы on_done(result),
+    on_error(exception), on_progress(fraction, text) и on_state(busy)
+    вызываются в главном потоке через after(), так как Tk не допускает
+    обращения к виджетам из других потоков.
+    """
+
+    def __init__(self, widget, poll_ms=50, on_state=None):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.on_state = on_state
+        self._events = queue.Queue()
+        self._pending = {}        # ключ -> ожидающее задание
+        self._order = []          # ключи ожидающих заданий в порядке поступления
+        self._current = None
+        self._lock = threading.Condition()
+        self._closed = False
+        self._after_id = None
+        self._thread = threading.Thread(target=self._worker, name="calc-scheduler", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        with self._lock:
+            return self._current is not None or bool(self._order)
+
+    def submit(self, key, func, *args, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """Постановка задания func(job, *args, **kwargs) в очередь"""
+        job = CalcJob(key, func, args, kwargs, on_done, on_error, on_progress)
+        job.scheduler = self
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Планировщик остановлен")
+            if key in self._pending:
+                self._pending[key].cancel()
+            else:
+                self._order.append(key)
+            self._pending[key] = job
+            if self._current is not None and self._current.key == key:
+                self._current.cancel()
+            self._lock.notify()
+        self._schedule_poll()
+        if self.on_state is not None:
+            self.on_state(True)
+        return job
+
+    def cancel(self, key=None):
+        """Отмена заданий с ключом key (или всех)"""
+        with self._lock:
+            for k in list(self._order):
+                if key is None or k == key:
+                    self._pending.pop(k).cancel()
+                    self._order.remove(k)
+            if self._current is not None and (key is None or self._current.key == key):
+                self._current.cancel()
+
+    def close(self):
+        """Остановка рабочего потока (при закрытии окна)"""
+        self.cancel()
+        with self._lock:
+            self._closed = True
+            self._lock.notify()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                while not self._order and not self._closed:
+                    self._lock.wait()
+                if self._closed:
+                    return
+                job = self._pending.pop(self._order.pop(0))
+                self._current = job
+
+            try:
+                job.check()
+                result = job.func(job, *job.args, **job.kwargs)
+                job.check()
+                self._events.put(("done", job, result))
+            except CancelledError:
+                self._events.put(("cancelled", job, None))
+            except Exception as e:
+                self._events.put(("error", job, e))
+            finally:
+                with self._lock:
+                    self._current = None
+
+    def _schedule_poll(self):
+        if self._after_id is None and not self._closed:
+            self._after_id = self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Обработка событий рабочего потока в главном потоке"""
+        self._after_id = None
+        while True:
+            try:
+                kind, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            # Результаты отмененных и замененных заданий не показываются
+            if job.cancelled and kind != "cancelled":
+                continue
+            if kind == "progress" and job.on_progress is not None:
+                job.on_progress(*payload)
+            elif kind == "done" and job.on_done is not None:
+                job.on_done(payload)
+            elif kind == "error" and job.on_error is not None:
+                job.on_error(payload)
+
+        if self.busy or not self._events.empty():
+            self._schedule_poll()
+        elif self.on_state is not None:
+            self.on_state(False)
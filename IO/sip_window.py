@@ -1,34 +1,239 @@
 import customtkinter as ctk
+from tkinter import messagebox
+from matplotlib.patches import Rectangle
+from models import sensor_sip
+from core.trace import calc_mode, MODE_SILENT
+from core.validation import sip_geometry_violation
+from IO.zip_window import ZIPWindow
 
 
-class SIPWindow(ctk.CTkToplevel):
-    def __init__(self, parent, params):
-        super().__init__()
-        self.title("ДСИП - Результаты расчета")
-        self.geometry("1000x700")
-        self.params = params
-        self.create_tabs()
+class SIPWindow(ZIPWindow):
+    """Окно расчета ДСИП: интерфейс, файлы и отчеты - как в ZIPWindow"""
 
-    def create_tabs(self):
-        self.tabview = ctk.CTkTabview(self)
-        self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
+    SENSOR = "ДСИП"
+    MODEL = sensor_sip
+    SENSITIVITY = None
+    SENSOR_DESCRIPTION = "дифференциального соленоидного ИП"
 
-        self.scheme_tab = self.tabview.add("Scheme")
-        self.results_tab = self.tabview.add("Results")
-        self.params_tab = self.tabview.add("Start Params")
+    GEOMETRY_FIELDS = ("R", "r", "l_k", "l_c", "t_B")
 
-        self.setup_scheme_tab()
-        self.setup_results_tab()
-        self.setup_params_tab()
+    PERCENT_RESULTS = ("gamma", "d_z", "eta", "delta_ma")
 
-    def setup_scheme_tab(self):
-        label = ctk.CTkLabel(self.scheme_tab, text="Схема ДСИП", font=("Arial", 16))
-        label.pack(pady=20)
+    INPUT_NAMES = {
+        **{k: v for k, v in ZIPWindow.INPUT_NAMES.items()
+           if k not in ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0")},
+        "R": "Внешний радиус катушки R, мм",
+        "r": "Радиус сердечника r, мм",
+        "l_k": "Длина катушки l_k, мм",
+        "l_c": "Длина сердечника l_c, мм",
+        "t_B": "Толщина каркаса t_B, мм",
+    }
 
-    def setup_results_tab(self):
-        label = ctk.CTkLabel(self.results_tab, text="Результаты ДСИП", font=("Arial", 16))
-        label.pack(pady=20)
+    RESULT_NAMES = {
+        "p_k": "Половина длины катушки p_k",
+        "p_c": "Половина длины сердечника p_c",
+        "s": "Коэффициент s",
+        "q": "Коэффициент q",
+        "p": "Безразмерный параметр точки перегиба p",
+        "x_P": "Точка перегиба x_П",
+        "l_T": "Расстояние между торцами катушек l_T",
+        "x_c": "Положение середины сердечника x_c",
+        "S_ok": "Площадь окна катушки S_ok",
+        "N": "Коэффициент размагничивания сердечника N",
+        "mu_C": "Эффективная проницаемость сердечника mu_C",
+        "M_p": "Коэффициент M_p",
+        "N_p": "Коэффициент N_p",
+        "K_p": "Коэффициент K_p",
+        "alpha": "Коэффициент alpha",
+        "beta": "Коэффициент beta",
+        "c": "Коэффициент c",
+        "d": "Коэффициент d",
+        "L_0": "Безразмерная начальная индуктивность L_0p",
+        "a": "Параметр характеристики a",
+        "b": "Параметр характеристики b",
+        "lambda": "Коэффициент lambda",
+        "gamma": "Приведенная погрешность от нелинейности gamma",
+        "d_z": "Относительная девиация сопротивления d_z",
+        "delta_ma": "Погрешность приближения характеристики delta_ma",
+        "w_0": "Удельное число витков катушки w_0",
+        "w": "Число витков катушки w",
+        "R_k": "Активное сопротивление катушки R_k",
+        "eta": "Доля активного сопротивления катушки eta",
+        "L_k": "Собственная индуктивность катушки L_k",
+        "A_L": "Коэффициент A_L",
+        "L_x": "Индуктивность соленоида L_x",
+        "f_p": "Частота напряжения питания f_p",
+        "Z_x": "Полное электрическое сопротивление катушки Z_x",
+    }
 
-    def setup_params_tab(self):
-        label = ctk.CTkLabel(self.params_tab, text="Параметры ДСИП", font=("Arial", 16))
-        label.pack(pady=20)
\ No newline at end of file
+    RESULT_UNITS = {
+        'p_k': 'мм', 'p_c': 'мм', 'x_P': 'мм', 'l_T': 'мм', 'x_c': 'мм',
+        'S_ok': 'мм²',
+        'a': '1/мм', 'b': '1/мм²',
+        'Z_x': 'Ом', 'R_k': 'Ом',
+        'L_k': 'Гн', 'L_x': 'Гн',
+        'f_p': 'Гц',
+        'gamma': '%', 'd_z': '%', 'eta': '%', 'delta_ma': '%'
+    }
+
+    RESULT_CATEGORIES = {
+        "Геометрические параметры": [
+            'p_k', 'p_c', 's', 'q', 'p', 'x_P', 'l_T', 'x_c', 'S_ok'
+        ],
+        "Магнитные параметры": [
+            'N', 'mu_C', 'M_p', 'N_p', 'K_p', 'alpha', 'beta', 'c', 'd', 'L_0', 'a', 'b'
+        ],
+        "Электрические параметры": [
+            'Z_x', 'w_0', 'w', 'R_k', 'L_k', 'A_L', 'L_x', 'f_p'
+        ],
+        "Параметры точности": [
+            'lambda', 'gamma', 'd_z', 'delta_ma', 'eta'
+        ]
+    }
+
+    def init_parameters(self):
+        super().init_parameters()
+        self.R = 0.0
+        self.r = 0.0
+        self.l_k = 0.0
+        self.l_c = 0.0
+        self.t_B = 0.0
+
+    def create_geometry_section(self):
+        """Создание секции геометрических параметров"""
+        geom_label = ctk.CTkLabel(
+            self.left_frame,
+            text="Геометрические параметры:",
+            font=("Arial", 12, "bold")
+        )
+        geom_label.pack(pady=(10, 4), anchor="w")
+
+        geom_params = [
+            ("Внешний радиус катушки R, мм:", "R", ""),
+            ("Радиус сердечника r, мм:", "r", ""),
+            ("Длина катушки l_k, мм:", "l_k", ""),
+            ("Длина сердечника l_c, мм:", "l_c", ""),
+            ("Толщина каркаса t_B, мм:", "t_B", ""),
+        ]
+
+        for label_text, name, default in geom_params:
+            self.create_input_row(label_text, name, default)
+
+    def draw_scheme(self):
+        self.draw_sip_scheme()
+
+    def draw_sip_scheme(self):
+        """Отрисовка схемы СИП: две катушки и сердечник в среднем положении"""
+        try:
+            self.update_parameters_from_input(skip_validation=True)
+
+            # Проверяем, есть ли основные геометрические параметры
+            if not all([self.R, self.r, self.l_k, self.l_c]):
+                self.draw_empty_scheme()
+                return
+
+            # Положение катушек задается точкой перегиба x_П
+            with calc_mode(MODE_SILENT):
+                x_P = sensor_sip.calc_geometry(self.R, self.r, self.l_k, self.l_c, self.t_B, self.K_kp)['x_P']
+            if not x_P > 0:
+                self.draw_empty_scheme()
+                return
+
+        except Exception:
+            self.draw_empty_scheme()
+            return
+
+        appearance = ctk.get_appearance_mode()
+        if appearance.lower().startswith("dark"):
+            bg = "#2b2b2b"
+            line_color = "white"
+        else:
+            bg = "white"
+            line_color = "black"
+
+        self.ax.clear()
+        self.figure.patch.set_facecolor(bg)
+        self.ax.set_facecolor(bg)
+        self.ax.set_aspect("equal")
+
+        R, r, l_k, l_c = self.R, self.r, self.l_k, self.l_c
+        r_in = r + self.t_B
+
+        # Ось соленоида горизонтальна, сердечник в среднем положении x = 0
+        for sign in (-1, 1):
+            x0 = sign * x_P - l_k / 2
+
+            # --- КАТУШКИ (сечение обмотки сверху и снизу от оси) ---
+            for y0 in (r_in, -R):
+                self.ax.add_patch(Rectangle((x0, y0), l_k, R - r_in,
+                                            linewidth=2, edgecolor=line_color, facecolor="none"))
+                self.ax.plot([x0, x0 + l_k], [y0, y0 + R - r_in], color=line_color, linewidth=1)
+                self.ax.plot([x0, x0 + l_k], [y0 + R - r_in, y0], color=line_color, linewidth=1)
+
+        # --- СЕРДЕЧНИК ---
+        self.ax.add_patch(Rectangle((-l_c / 2, -r), l_c, 2 * r,
+                                    linewidth=2, edgecolor=line_color, facecolor="none"))
+
+        # --- ОСЬ X ---
+        x_extent = max(x_P + l_k / 2, l_c / 2) * 1.15
+        self.ax.plot([-x_extent, x_extent], [0, 0], linestyle="--", color=line_color)
+
+        # --- ПОДПИСИ ---
+        self.ax.text(-x_P, R * 1.15, "1", fontsize=12, fontweight="bold", color=line_color, ha="center")
+        self.ax.text(x_P, R * 1.15, "2", fontsize=12, fontweight="bold", color=line_color, ha="center")
+        self.ax.text(0, r * 0.3, "3", fontsize=12, fontweight="bold", color=line_color, ha="center",
+                     bbox=dict(facecolor=bg, edgecolor="none"))
+        self.ax.text(0, -R * 1.35, f"l_T = {self.format_value(2 * x_P - l_k)} мм",
+                     color=line_color, fontsize=9, ha="center")
+
+        # --- МАСШТАБ ---
+        self.ax.set_xlim(-x_extent, x_extent)
+        self.ax.set_ylim(-R * 1.6, R * 1.6)
+        self.ax.axis("off")
+
+        if hasattr(self, "canvas"):
+            self.canvas.draw()
+
+    def _validate_geometry(self):
+        """Проверка геометрических условий ДСИП"""
+        errors = []
+
+        # Проверка обязательных полей (каркас может отсутствовать, t_B = 0)
+        required_fields = ["R", "r", "l_k", "l_c",
+                           "d_n", "p_n_user", "mu_c_user", "z0_user"]
+
+        for param in required_fields:
+            if getattr(self, param) <= 0:
+                errors.append(f"{param} должен быть задан и положителен")
+                self.input_frames[param].configure(fg_color="red")
+
+        if not errors and self.R <= self.r + self.t_B:
+            errors.append(f"R должен быть больше r + t_B ({self.format_value(self.r + self.t_B)} мм)")
+            self.input_frames["R"].configure(fg_color="red")
+            self.input_frames["t_B"].configure(fg_color="red")
+
+        # Проверка требования по диапазону измерения
+        if self.l_k / 2 <= self.xv:
+            errors.append(f"Половина длины катушки l_k/2 ({self.l_k / 2} мм) должна быть больше диапазона измерения xv ({self.xv} мм)")
+            self.input_frames["l_k"].configure(fg_color="red")
+
+        if errors:
+            error_msg = "Ошибка параметров:\n" + "\n".join(errors)
+            messagebox.showerror("Ошибка", error_msg)
+            raise ValueError(error_msg)
+
+    def inputs_valid(self, values):
+        required = [values[name] for name in self.GEOMETRY_FIELDS if name != "t_B"]
+        if min(required) <= 0 or values["z0_user"] <= 0 or values["d_n"] <= 0:
+            return False
+        return sip_geometry_violation(values["R"], values["r"], values["l_k"], values["l_c"],
+                                      values["t_B"], self.xv) == 0
+
+    def graph_inputs(self):
+        """Входные величины графа расчета из параметров окна"""
+        return {
+            "R": self.R, "r": self.r, "l_k": self.l_k, "l_c": self.l_c, "t_B": self.t_B,
+            "z0": self.z0_user, "d_n": self.d_n, "xv": self.xv,
+            "x": self.x, "K_kp": self.K_kp, "p_n": self.p_n_user,
+            "mu_0": self.mu_0, "mu_c": self.mu_c_user
+        }
@@ -1,24 +1,137 @@
 import customtkinter as ctk
 import json
+import numpy as np
 import os
 from datetime import datetime
 from tkinter import filedialog, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.patches import Rectangle
-from models.sensor_zip import ZIPSensor
+from models import sensor_zip, sensitivity_zip, bridge
+from core.bridge import OPTIMAL_LOAD
+from core.trace import CalcTrace, calc_mode, MODE_SILENT
+from core.validation import geometry_violation
+from IO.scheduler import CalcScheduler
 
 
 class ZIPWindow(ctk.CTkToplevel):
+    SENSOR = "ДЗИП"
+    MODEL = sensor_zip  # модель датчика (build_graph, calc_characteristic)
+    SENSITIVITY = sensitivity_zip  # производные результатов по параметрам (None - не выводятся)
+    SENSOR_DESCRIPTION = "дифференциального законченного ИП"
+
+    # Геометрические параметры (поля ввода и таблица входных данных отчета)
+    GEOMETRY_FIELDS = ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0")
+
+    # Результаты, выводимые в процентах
+    PERCENT_RESULTS = ("gamma", "d_z", "eta")
+
+    # Русские названия входных параметров (отчет HTML)
+    INPUT_NAMES = {
+        "xv": "Диапазон измерений xv, мм",
+        "d_zT_min": "Минимальная погрешность d_zT_min, %",
+        "eta_max": "Максимальный КПД eta_max",
+        "x": "Относительная погрешность x",
+        "K_kp": "Коэффициент использования K_kp",
+        "mu_0": "Магнитная проницаемость вакуума mu_0",
+        "D1": "Внешний диаметр D1, мм",
+        "D2": "Внешний диаметр D2, мм",
+        "d1": "Диаметр отверстия d1, мм",
+        "d2": "Диаметр отверстия d2, мм",
+        "h1": "Высота катушки h1, мм",
+        "h2": "Высота сердечника h2, мм",
+        "h3": "Толщина якоря h3, мм",
+        "l0": "Начальный зазор l0, мм",
+        "d_n": "Диаметр провода d_n, мм",
+        "p_n_user": "Удельное сопротивление меди p_n, Ом·мм²/м",
+        "mu_c_user": "Магнитная проницаемость mu_c",
+        "z0_user": "Начальное сопротивление z0, Ом",
+    }
+
+    # Русские названия результатов
+    RESULT_NAMES = {
+        "S_B": "Площадь сечения воздушной части магнитопровода S_B",
+        "L_cd": "Длина сечения сердечника L_cd",
+        "S_cd": "Площадь сечения сердечника S_cd",
+        "S_y": "Площадь сечения якоря S_y",
+        "L_y": "Длина якоря L_y",
+        "L_c": "Длина магнитопровода L_c",
+        "S_c": "Площадь магнитопровода S_c",
+        "S_ok": "Площадь окна катушки S_ok",
+        "R_cp": "Средний радиус катушки R_cp",
+        "N": "Коэффициент размагничивания магнитопровода N",
+        "R_mC": "Магнитное сопротивление стальной части R_mC",
+        "R_mb": "Зависимость сопротивления от перемещения якоря R_mb",
+        "k_B": "Коэффициент k_B",
+        "R_B0": "Начальное сопротивление R_B0",
+        "k_x": "Коэффициент чувствительности k_x",
+        "z_0": "Начальное электрическое сопротивление катушки z_0",
+        "Z_x": "Полное электрическое сопротивление катушки Z_x",
+        "gamma": "Максимальная приведенная погрешность gamma",
+        "q": "Параметр q",
+        "gamma_pi": "Гамма пи gamma_pi",
+        "d_z": "Максимальная приведенная погрешность d_z",
+        "w_0": "Удельное число витков катушки w_0",
+        "w": "Число витков катушки w",
+        "R_k": "Активное сопротивление катушки R_k",
+        "eta": "Доля активного сопротивления катушки eta",
+        "f_p": "Частота напряжения питания f_p",
+    }
+
+    # Единицы измерения результатов
+    RESULT_UNITS = {
+        'S_B': 'мм²', 'S_cd': 'мм²', 'S_y': 'мм²', 'S_c': 'мм²', 'S_ok': 'мм²',
+        'L_cd': 'мм', 'L_y': 'мм', 'L_c': 'мм', 'R_cp': 'мм',
+        'z_0': 'Ом', 'Z_x': 'Ом', 'R_k': 'Ом', 'R_B0': 'Ом',
+        'f_p': 'кГц',
+        'gamma': '%', 'd_z': '%', 'eta': '%',
+        'k_x': '1/мм', 'k_B': '1/мм'
+    }
+
+    # Группы результатов
+    RESULT_CATEGORIES = {
+        "Геометрические параметры": [
+            'S_B', 'L_cd', 'S_cd', 'S_y', 'L_y', 'L_c', 'S_c', 'S_ok', 'R_cp'
+        ],
+        "Магнитные параметры": [
+            'N', 'R_mC', 'R_mb', 'k_B', 'R_B0', 'k_x'
+        ],
+        "Электрические параметры": [
+            'z_0', 'Z_x', 'w_0', 'w', 'R_k', 'f_p'
+        ],
+        "Параметры точности": [
+            'gamma', 'q', 'gamma_pi', 'd_z', 'eta'
+        ]
+    }
+
+    # Результаты расчета схемы включения (models.bridge.calc_circuit), общие для всех датчиков
+    CIRCUIT_NAMES = {
+        "U_0": "Выходное напряжение при x = 0 U_0",
+        "S_U": "Крутизна выходного напряжения S_U",
+        "gamma_b": "Приведенная погрешность выходного напряжения gamma_b",
+        "gamma_s": "Нелинейность, вносимая схемой gamma_s",
+        "I_k": "Ток катушки I_k",
+        "Delta_T": "Плотность тока в обмотке Delta_T",
+        "P_r": "Мощность, рассеиваемая катушкой P_r",
+    }
+    CIRCUIT_UNITS = {'U_0': 'В', 'S_U': 'В/мм', 'gamma_b': '%', 'gamma_s': '%',
+                     'I_k': 'А', 'Delta_T': 'А/мм²', 'P_r': 'Вт'}
+    CIRCUIT_PERCENT = ("gamma_b", "gamma_s")
+
     def __init__(self, parent, params=None):
         super().__init__(parent)
-        self.title("ДЗИП — Расчёт и схема")
+        self.title(f"{self.SENSOR} — Расчёт и схема")
         self.geometry("1400x800")
         self.params = params or {}
-        self.sensor = None
+        self.graph = self.create_graph()  # пересчитывает только величины, зависящие от изменённых полей
         self.calculation_results = None
+        self.calculation_trace = None
+        self.calculation_sensitivity = None
         self.current_file_path = None
 
+        # Расчеты выполняются в рабочем потоке, окно остается отзывчивым
+        self.scheduler = CalcScheduler(self, on_state=self.on_scheduler_state)
+
         # Инициализация параметров
         self.init_parameters()
 
@@ -30,12 +143,16 @@ class ZIPWindow(ctk.CTkToplevel):
         # Создание виджетов
         self.create_widgets()
 
+    def create_graph(self):
+        """Граф расчета датчика"""
+        return self.MODEL.build_graph()
+
     def init_parameters(self):
         """Инициализация параметров по умолчанию"""
         # Основные параметры из родительского окна
         self.xv = self.params.get("xv", 0.0)
         self.d_zT_min = self.params.get("d_zT_min", 0.0)
-        self.selected_sensor = self.params.get("selected_sensor", "ДЗИП")
+        self.selected_sensor = self.params.get("selected_sensor", self.SENSOR)
         self.selected_scheme = self.params.get("selected_scheme", "ПРСМ")
 
         # Общие параметры (будут вводиться пользователем)
@@ -98,6 +215,9 @@ class ZIPWindow(ctk.CTkToplevel):
         # Кнопки управления
         self.create_control_buttons()
 
+        # Ход выполнения и отмена
+        self.create_progress_section()
+
         # Статус файла
         self.file_status_label = ctk.CTkLabel(
             self.left_frame,
@@ -264,6 +384,7 @@ class ZIPWindow(ctk.CTkToplevel):
         if default:
             ent.insert(0, default)
         ent.pack(fill="x", padx=4)
+        ent.bind("<KeyRelease>", self.live_recalculate)
 
         self.input_entries[name] = ent
         self.input_frames[name] = frame
@@ -280,7 +401,7 @@ class ZIPWindow(ctk.CTkToplevel):
             btn_frame1,
             text="Обновить схему",
             fg_color="#FF8C00",
-            command=self.draw_zip_scheme
+            command=self.draw_scheme
         ).grid(row=0, column=0, padx=2, sticky="ew")
 
         ctk.CTkButton(
@@ -328,16 +449,69 @@ class ZIPWindow(ctk.CTkToplevel):
             command=self.load_calculation
         ).pack(side="right", padx=4, expand=True)
 
+    def create_progress_section(self):
+        """Создание индикатора выполнения расчета с кнопкой отмены"""
+        progress_frame = ctk.CTkFrame(self.left_frame)
+        progress_frame.pack(fill="x", padx=6, pady=(8, 0))
+        progress_frame.grid_columnconfigure(0, weight=1)
+
+        self.progress_bar = ctk.CTkProgressBar(progress_frame)
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=0, column=0, padx=4, pady=4, sticky="ew")
+
+        self.cancel_button = ctk.CTkButton(
+            progress_frame,
+            text="Отмена",
+            width=80,
+            fg_color="#B22222",
+            state="disabled",
+            command=self.scheduler.cancel
+        )
+        self.cancel_button.grid(row=0, column=1, padx=4, pady=4)
+
+        self.progress_label = ctk.CTkLabel(progress_frame, text="", text_color="gray")
+        self.progress_label.grid(row=1, column=0, columnspan=2, padx=4, sticky="w")
+
+    def on_scheduler_state(self, busy):
+        """Переключение индикатора при начале и окончании фоновых расчетов"""
+        if busy:
+            self.progress_label.configure(text="Выполняется расчёт...")
+            self.cancel_button.configure(state="normal")
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+            self.progress_bar.set(0)
+            self.progress_label.configure(text="")
+            self.cancel_button.configure(state="disabled")
+
+    def on_progress(self, fraction, text=""):
+        """Ход выполнения задания с известной долей готовности"""
+        self.progress_bar.stop()
+        self.progress_bar.configure(mode="determinate")
+        self.progress_bar.set(fraction)
+        if text:
+            self.progress_label.configure(text=text)
+
+    def destroy(self):
+        self.scheduler.close()
+        super().destroy()
+
     def create_right_panel(self):
         """Создание правой панели со схемой и результатами"""
         self.right_frame = ctk.CTkFrame(self)
         self.right_frame.grid(row=0, column=1, sticky="nsew", padx=8, pady=8)
         self.right_frame.grid_rowconfigure(1, weight=1)
         self.right_frame.grid_columnconfigure(0, weight=1)
+        self.right_frame.grid_columnconfigure(1, weight=1)
 
         # Схема
         self.create_scheme_frame()
 
+        # Статическая характеристика
+        self.create_characteristic_frame()
+
         # Результаты расчета
         self.create_results_frame()
 
@@ -348,17 +522,104 @@ class ZIPWindow(ctk.CTkToplevel):
 
         label = ctk.CTkLabel(
             self.scheme_frame,
-            text="Расчётная схема ЗИП",
+            text=f"Расчётная схема {self.SENSOR}",
             font=("Arial", 14, "bold")
         )
         label.pack(pady=4)
 
         self.create_scheme_canvas()
 
+    def create_characteristic_frame(self):
+        """Создание фрейма со статической характеристикой Z(x)"""
+        self.characteristic_frame = ctk.CTkFrame(self.right_frame)
+        self.characteristic_frame.grid(row=0, column=1, sticky="nsew", padx=6, pady=6)
+
+        label = ctk.CTkLabel(
+            self.characteristic_frame,
+            text="Статическая характеристика Z(x)",
+            font=("Arial", 14, "bold")
+        )
+        label.pack(pady=4)
+
+        appearance = ctk.get_appearance_mode()
+        facecolor = "white" if appearance.lower().startswith("light") else "#2b2b2b"
+        text_color = "black" if appearance.lower().startswith("light") else "white"
+
+        self.char_figure, (self.char_ax_z, self.char_ax_delta) = plt.subplots(
+            2, 1, figsize=(8, 6), dpi=50, sharex=True
+        )
+        self.char_figure.patch.set_facecolor(facecolor)
+        for ax, ylabel in ((self.char_ax_z, "Z/z0"), (self.char_ax_delta, "δ, %")):
+            ax.set_facecolor(facecolor)
+            ax.set_ylabel(ylabel, color=text_color)
+            ax.tick_params(colors=text_color)
+            ax.grid(True, alpha=0.3)
+        self.char_ax_delta.set_xlabel("x, мм", color=text_color)
+
+        # Линии перерисовываются поверх сохраненного фона (blitting)
+        self.char_line_z1, = self.char_ax_z.plot([], [], color="#1f77b4", label="z_x1", animated=True)
+        self.char_line_z2, = self.char_ax_z.plot([], [], color="#d62728", label="z_x2", animated=True)
+        self.char_line_delta, = self.char_ax_delta.plot([], [], color="#2ca02c", animated=True)
+        self.char_ax_z.legend(loc="upper left")
+        self.char_figure.tight_layout()
+
+        self.char_background = None
+        self.char_data = None
+        self.char_canvas = FigureCanvasTkAgg(self.char_figure, self.characteristic_frame)
+        self.char_canvas.mpl_connect("draw_event", self.on_characteristic_draw)
+        self.char_canvas.draw()
+        self.char_canvas.get_tk_widget().pack(fill="both", expand=True, padx=6, pady=6)
+
+    def on_characteristic_draw(self, event=None):
+        """Сохранение фона после полной перерисовки и вывод линий поверх него"""
+        self.char_background = self.char_canvas.copy_from_bbox(self.char_figure.bbox)
+        self.blit_characteristic()
+
+    def blit_characteristic(self):
+        for line in (self.char_line_z1, self.char_line_z2, self.char_line_delta):
+            line.axes.draw_artist(line)
+        self.char_canvas.blit(self.char_figure.bbox)
+
+    def draw_characteristic(self, characteristic):
+        """Обновление графика Z(x)
+
+        Если новые кривые помещаются в текущие пределы осей, перерисовываются
+        только линии поверх сохраненного фона; иначе пределы расширяются
+        (или сужаются при сильном уменьшении размаха) и холст рисуется целиком.
+        """
+        x = characteristic["x"]
+        z_x1 = characteristic["z_x1"] / characteristic["z_0"]
+        z_x2 = characteristic["z_x2"] / characteristic["z_0"]
+        delta = characteristic["delta"] * 100
+
+        self.char_line_z1.set_data(x, z_x1)
+        self.char_line_z2.set_data(x, z_x2)
+        self.char_line_delta.set_data(x, delta)
+
+        rescale = False
+        for ax, low, high in ((self.char_ax_z, min(z_x1.min(), z_x2.min()), max(z_x1.max(), z_x2.max())),
+                              (self.char_ax_delta, delta.min(), delta.max())):
+            if not (np.isfinite(low) and np.isfinite(high)):
+                continue
+            bottom, top = ax.get_ylim()
+            span = max(high - low, 1e-12)
+            if low < bottom or high > top or (top - bottom) > 4 * span:
+                ax.set_ylim(low - 0.1 * span, high + 0.1 * span)
+                rescale = True
+        if tuple(self.char_ax_z.get_xlim()) != (x[0], x[-1]):
+            self.char_ax_z.set_xlim(x[0], x[-1])
+            rescale = True
+
+        if rescale or self.char_background is None:
+            self.char_canvas.draw()  # фон и линии обновит on_characteristic_draw
+        else:
+            self.char_canvas.restore_region(self.char_background)
+            self.blit_characteristic()
+
     def create_results_frame(self):
         """Создание фрейма с результатами"""
         self.results_frame = ctk.CTkFrame(self.right_frame)
-        self.results_frame.grid(row=1, column=0, sticky="nsew", padx=6, pady=6)
+        self.results_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=6, pady=6)
 
         rlabel = ctk.CTkLabel(
             self.results_frame,
@@ -431,8 +692,8 @@ class ZIPWindow(ctk.CTkToplevel):
     def change_theme(self):
         """Изменение темы интерфейса"""
         ctk.set_appearance_mode(self.theme_var.get())
-        if any([self.D1, self.D2, self.d1, self.d2, self.h1, self.h2, self.h3, self.l0]):
-            self.draw_zip_scheme()
+        if any(getattr(self, name) for name in self.GEOMETRY_FIELDS):
+            self.draw_scheme()
         else:
             self.draw_empty_scheme()
 
@@ -457,6 +718,10 @@ class ZIPWindow(ctk.CTkToplevel):
         else:
             return str(value)
 
+    def draw_scheme(self):
+        """Отрисовка расчетной схемы датчика"""
+        self.draw_zip_scheme()
+
     def draw_zip_scheme(self):
         """Отрисовка схемы ЗИП (оригинальный размер)"""
         try:
@@ -667,27 +932,99 @@ class ZIPWindow(ctk.CTkToplevel):
         """Выполнение расчета"""
         try:
             self.update_parameters_from_input(skip_validation=False)
-            self.draw_zip_scheme()
-
-            # Создание датчика и расчет
-            self.sensor = ZIPSensor(
-                D1=self.D1, D2=self.D2, d1=self.d1, d2=self.d2,
-                h1=self.h1, h2=self.h2, h3=self.h3, l0=self.l0,
-                z0=self.z0_user, d_n=self.d_n, xv=self.xv,
-                d_zT_min=self.d_zT_min, eta_max=self.eta_max,
-                x=self.x, K_kp=self.K_kp, p_n=self.p_n_user,
-                mu_0=self.mu_0, mu_c=self.mu_c_user
-            )
-
-            self.calculation_results = self.sensor.calc()
-            self.update_results_display()
+            self.draw_scheme()
 
-            if self.current_file_path:
-                self.file_status_label.configure(text="Файл изменён", text_color="orange")
+            # Расчет по графу зависимостей в рабочем потоке
+            self.scheduler.submit(
+                "calc", self.calc_job, self.graph_inputs(),
+                on_done=self.on_calc_done,
+                on_error=lambda e: messagebox.showerror("Ошибка", f"Ошибка расчёта: {e}")
+            )
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка расчёта: {e}")
 
+    def calc_job(self, job, inputs, mode=None):
+        """Расчет (выполняется в рабочем потоке планировщика)"""
+        trace = CalcTrace()
+        self.graph.set(**inputs)
+        with calc_mode(mode, trace):
+            results = self.graph.evaluate()
+        job.check()
+        characteristic = None
+        if inputs["xv"] > 0:
+            characteristic = self.calc_characteristic(results, inputs)
+            with calc_mode(mode, trace):
+                results = {**results, **self.calc_circuit(results, inputs)}
+        job.check()
+        return results, trace, characteristic, self.calc_sensitivity(inputs)
+
+    def calc_characteristic(self, results, inputs):
+        """Статическая характеристика для графика Z(x)"""
+        return self.MODEL.calc_characteristic(results, inputs)
+
+    def calc_circuit(self, results, inputs):
+        """Выбранная схема включения при U = 1 В и оптимальной нагрузке"""
+        k, sigma = OPTIMAL_LOAD[self.selected_scheme]
+        circuit = {"U": bridge.DEFAULT_U, "k": k, "sigma": sigma}
+        return bridge.calc_circuit(results, inputs, circuit, self.MODEL, self.selected_scheme)
+
+    def calc_sensitivity(self, inputs):
+        """Производные результатов по параметрам (Sensitivity) для таблицы чувствительности"""
+        if self.SENSITIVITY is None:
+            return None
+        return self.SENSITIVITY.jacobian(**inputs)
+
+    def on_calc_done(self, result):
+        self.calculation_results, self.calculation_trace, characteristic, self.calculation_sensitivity = result
+        self.update_results_display()
+        if characteristic is not None:
+            self.draw_characteristic(characteristic)
+
+        if self.current_file_path:
+            self.file_status_label.configure(text="Файл изменён", text_color="orange")
+
+    def graph_inputs(self):
+        """Входные величины графа расчета из параметров окна"""
+        return {
+            "D1": self.D1, "D2": self.D2, "d1": self.d1, "d2": self.d2,
+            "h1": self.h1, "h2": self.h2, "h3": self.h3, "l0": self.l0,
+            "z0": self.z0_user, "d_n": self.d_n, "xv": self.xv,
+            "x": self.x, "K_kp": self.K_kp, "p_n": self.p_n_user,
+            "mu_0": self.mu_0, "mu_c": self.mu_c_user
+        }
+
+    def live_recalculate(self, event=None):
+        """Пересчет при вводе: без сообщений об ошибках, только для допустимых параметров"""
+        values = {}
+        for key, entry in self.input_entries.items():
+            try:
+                values[key] = float(entry.get())
+            except ValueError:
+                return
+            if values[key] < 0:
+                return
+
+        if not self.inputs_valid(values):
+            return
+
+        for key, value in values.items():
+            setattr(self, key, value)
+            self.input_frames[key].configure(fg_color="transparent")
+
+        # При быстром вводе выполняется только последний запрошенный расчет
+        self.scheduler.submit("calc", self.calc_job, self.graph_inputs(), MODE_SILENT,
+                              on_done=self.on_calc_done)
+
+    def inputs_valid(self, values):
+        """Проверка геометрии без сообщений (для пересчета при вводе)"""
+        if min(values.values()) <= 0:
+            return False
+        if geometry_violation(values["D1"], values["D2"], values["d1"], values["d2"], values["h1"],
+                              values["h2"], values["h3"], values["l0"], self.xv) > 0:
+            return False
+        return values["l0"] > self.xv
+
     def update_results_display(self):
         """Обновление отображения результатов в стиле полей ввода"""
         for w in self.results_container.winfo_children():
@@ -696,63 +1033,9 @@ class ZIPWindow(ctk.CTkToplevel):
         if not self.calculation_results:
             return
 
-        # Словарь русских названий
-        russian_names = {
-            "S_B": "Площадь сечения воздушной части магнитопровода S_B",
-            "L_cd": "Длина сечения сердечника L_cd",
-            "S_cd": "Площадь сечения сердечника S_cd",
-            "S_y": "Площадь сечения якоря S_y",
-            "L_y": "Длина якоря L_y",
-            "L_c": "Длина магнитопровода L_c",
-            "S_c": "Площадь магнитопровода S_c",
-            "S_ok": "Площадь окна катушки S_ok",
-            "R_cp": "Средний радиус катушки R_cp",
-            "N": "Коэффициент размагничивания магнитопровода N",
-            "R_mC": "Магнитное сопротивление стальной части R_mC",
-            "R_mb": "Зависимость сопротивления от перемещения якоря R_mb",
-            "k_B": "Коэффициент k_B",
-            "R_B0": "Начальное сопротивление R_B0",
-            "k_x": "Коэффициент чувствительности k_x",
-            "z_0": "Начальное электрическое сопротивление катушки z_0",
-            "Z_x": "Полное электрическое сопротивление катушки Z_x",
-            "gamma": "Максимальная приведенная погрешность gamma",
-            "q": "Параметр q",
-            "gamma_pi": "Гамма пи gamma_pi",
-            "d_z": "Максимальная приведенная погрешность d_z",
-            "w_0": "Удельное число витков катушки w_0",
-            "w": "Число витков катушки w",
-            "R_k": "Активное сопротивление катушки R_k",
-            "eta": "Доля активного сопротивления катушки eta",
-            "f_p": "Частота напряжения питания f_p",
-        }
-
-        # Единицы измерения
-        units_mapping = {
-            'S_B': 'мм²', 'S_cd': 'мм²', 'S_y': 'мм²', 'S_c': 'мм²', 'S_ok': 'мм²',
-            'L_cd': 'мм', 'L_y': 'мм', 'L_c': 'мм', 'R_cp': 'мм',
-            'z_0': 'Ом', 'Z_x': 'Ом', 'R_k': 'Ом', 'R_B0': 'Ом',
-            'f_p': 'Гц',
-            'gamma': '%', 'd_z': '%', 'eta': '%',
-            'k_x': '1/мм', 'k_B': '1/мм'
-        }
-
-        # Группируем результаты по категориям
-        categories = {
-            "Геометрические параметры": [
-                'S_B', 'L_cd', 'S_cd', 'S_y', 'L_y', 'L_c', 'S_c', 'S_ok', 'R_cp'
-            ],
-            "Магнитные параметры": [
-                'N', 'R_mC', 'R_mb', 'k_B', 'R_B0', 'k_x'
-            ],
-            "Электрические параметры": [
-                'z_0', 'Z_x', 'w_0', 'w', 'R_k', 'f_p'
-            ],
-            "Параметры точности": [
-                'gamma', 'q', 'gamma_pi', 'd_z', 'eta'
-            ]
-        }
-
         # Вывод результатов по категориям
+        categories = {**self.RESULT_CATEGORIES,
+                      f"Схема включения {self.selected_scheme}": list(self.CIRCUIT_NAMES)}
         for category_name, param_keys in categories.items():
             # Заголовок категории
             category_label = ctk.CTkLabel(
@@ -768,21 +1051,46 @@ class ZIPWindow(ctk.CTkToplevel):
                     value = self.calculation_results[key]
 
                     # Для процентных параметров умножаем на 100
-                    if key in ['gamma', 'd_z', 'eta']:
+                    if key in self.PERCENT_RESULTS + self.CIRCUIT_PERCENT:
                         display_value = self.format_percentage_value(value)
                     else:
                         display_value = self.format_value(value)
 
                     self.create_result_row(
-                        russian_names.get(key, key),
+                        {**self.RESULT_NAMES, **self.CIRCUIT_NAMES}.get(key, key),
                         display_value,
-                        units_mapping.get(key, '')
+                        self._get_units_from_param_name(key)
                     )
 
+        if self.calculation_sensitivity is not None:
+            self.create_sensitivity_table(self.calculation_sensitivity)
+
         # Разделитель
         separator = ctk.CTkFrame(self.results_container, height=2, fg_color="gray")
         separator.pack(fill="x", padx=10, pady=10)
 
+    def create_sensitivity_table(self, sensitivity):
+        """Таблица относительной чувствительности: строки - параметры, столбцы - результаты"""
+        category_label = ctk.CTkLabel(
+            self.results_container,
+            text="Относительная чувствительность (dy/y)/(dx/x)",
+            font=("Arial", 13, "bold")
+        )
+        category_label.pack(anchor="w", padx=10, pady=(15, 5))
+
+        table = ctk.CTkFrame(self.results_container)
+        table.pack(fill="x", padx=10, pady=2)
+
+        elasticity = sensitivity.elasticity()
+        for j, output in enumerate(sensitivity.outputs):
+            ctk.CTkLabel(table, text=output, font=("Arial", 11, "bold"), width=70).grid(row=0, column=j + 1, padx=2)
+        for i, name in enumerate(sensitivity.inputs):
+            ctk.CTkLabel(table, text=name, font=("Arial", 11, "bold"), width=60, anchor="w").grid(
+                row=i + 1, column=0, padx=5, sticky="w")
+            for j in range(len(sensitivity.outputs)):
+                ctk.CTkLabel(table, text=self.format_value(float(elasticity[j, i])), font=("Arial", 11),
+                             width=70).grid(row=i + 1, column=j + 1, padx=2)
+
     def create_result_row(self, label_text, value_text, units_text):
         """Создание строки результата в стиле поля ввода"""
         row = ctk.CTkFrame(self.results_container)
@@ -828,6 +1136,7 @@ class ZIPWindow(ctk.CTkToplevel):
 
     def clear_parameters(self):
         """Очистка параметров"""
+        self.scheduler.cancel("calc")
         for k, ent in self.input_entries.items():
             ent.delete(0, "end")
             self.input_frames[k].configure(fg_color="transparent")
@@ -845,6 +1154,8 @@ class ZIPWindow(ctk.CTkToplevel):
         self.initial_message.pack(pady=20)
 
         self.calculation_results = None
+        self.calculation_trace = None
+        self.calculation_sensitivity = None
         self.current_file_path = None
         self.draw_empty_scheme()
 
@@ -855,6 +1166,8 @@ class ZIPWindow(ctk.CTkToplevel):
                 "metadata": {
                     "sensor_type": self.selected_sensor,
                     "scheme_type": self.selected_scheme,
+                    "xv": self.xv,
+                    "d_zT_min": self.d_zT_min,
                     "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 },
                 "user_parameters": {
@@ -909,8 +1222,11 @@ class ZIPWindow(ctk.CTkToplevel):
                         self.input_entries[k].insert(0, str(v))
 
             # Загрузка результатов
+            self.scheduler.cancel("calc")
             if data.get("calculation_results"):
                 self.calculation_results = data["calculation_results"]
+                self.calculation_trace = None
+                self.calculation_sensitivity = None
                 self.update_results_display()
 
             self.current_file_path = path
@@ -921,7 +1237,7 @@ class ZIPWindow(ctk.CTkToplevel):
             messagebox.showinfo("Успех", f"Файл загружен:\n{path}")
 
             self.update_parameters_from_input(skip_validation=True)
-            self.draw_zip_scheme()
+            self.draw_scheme()
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось загрузить файл: {e}")
@@ -936,16 +1252,21 @@ class ZIPWindow(ctk.CTkToplevel):
             import tempfile
             import webbrowser
 
-            html_content = self._generate_printable_html()
+            def write_html(job):
+                html_content = self._generate_printable_html()
+                with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
+                    f.write(html_content)
+                    return f.name
 
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(html_content)
-                temp_file = f.name
+            def open_html(temp_file):
+                webbrowser.open(f'file://{temp_file}')
+                messagebox.showinfo("Печать",
+                                    "Файл для печати открыт в браузере. Используйте Ctrl+P для печати.")
 
-            webbrowser.open(f'file://{temp_file}')
-
-            messagebox.showinfo("Печать",
-                                "Файл для печати открыт в браузере. Используйте Ctrl+P для печати.")
+            self.scheduler.submit(
+                "html", write_html, on_done=open_html,
+                on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось создать файл для печати: {e}")
+            )
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось создать файл для печати: {str(e)}")
@@ -966,67 +1287,30 @@ class ZIPWindow(ctk.CTkToplevel):
             if not filename:
                 return
 
-            html_content = self._generate_printable_html()
+            def write_html(job):
+                html_content = self._generate_printable_html()
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(html_content)
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-
-            messagebox.showinfo("Сохранено", f"Результаты сохранены в файл:\n{filename}")
+            self.scheduler.submit(
+                "html", write_html,
+                on_done=lambda _: messagebox.showinfo("Сохранено", f"Результаты сохранены в файл:\n{filename}"),
+                on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {e}")
+            )
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {str(e)}")
 
     def _generate_printable_html(self):
         """Генерация HTML для печати"""
-        russian_names = {
-            "xv": "Диапазон измерений xv, мм",
-            "d_zT_min": "Минимальная погрешность d_zT_min, %",
-            "eta_max": "Максимальный КПД eta_max",
-            "x": "Относительная погрешность x",
-            "K_kp": "Коэффициент использования K_kp",
-            "mu_0": "Магнитная проницаемость вакуума mu_0",
-            "D1": "Внешний диаметр D1, мм",
-            "D2": "Внешний диаметр D2, мм",
-            "d1": "Диаметр отверстия d1, мм",
-            "d2": "Диаметр отверстия d2, мм",
-            "h1": "Высота катушки h1, мм",
-            "h2": "Высота сердечника h2, мм",
-            "h3": "Толщина якоря h3, мм",
-            "l0": "Начальный зазор l0, мм",
-            "d_n": "Диаметр провода d_n, мм",
-            "p_n_user": "Удельное сопротивление меди p_n, Ом·мм²/м",
-            "mu_c_user": "Магнитная проницаемость mu_c",
-            "z0_user": "Начальное сопротивление z0, Ом",
-            "S_B": "Площадь сечения воздушной части магнитопровода S_B, мм²",
-            "L_cd": "Длина сечения сердечника L_cd, мм",
-            "S_cd": "Площадь сечения сердечника S_cd, мм²",
-            "S_y": "Площадь сечения якоря S_y, мм²",
-            "L_y": "Длина якоря L_y, мм",
-            "L_c": "Длина магнитопровода L_c, мм",
-            "S_c": "Площадь магнитопровода S_c, мм²",
-            "S_ok": "Площадь окна катушки S_ok, мм²",
-            "R_cp": "Средний радиус катушки R_cp, мм",
-            "N": "Коэффициент размагничивания магнитопровода N",
-            "R_mC": "Магнитное сопротивление стальной части R_mC",
-            "R_mb": "Зависимость сопротивления от перемещения якоря R_mb",
-            "k_B": "Коэффициент k_B",
-            "w_0": "Удельное число витков катушки w_0",
-            "w": "Число витков катушки w",
-            "R_k": "Активное сопротивление катушки R_k, Ом",
-            "f_p": "Частота напряжения питания f_p, Гц",
-            "eta": "Доля активного сопротивления катушки eta",
-            "gamma": "Максимальная приведенная погрешность gamma, %",
-            "q": "Параметр q",
-            "d_z": "Максимальная приведенная погрешность d_z, %",
-            "Z_x": "Полное электрическое сопротивление катушки Z_x, Ом",
-        }
+        russian_names = {**self.RESULT_NAMES, **self.CIRCUIT_NAMES, **self.INPUT_NAMES}
 
         html = f"""
         <!DOCTYPE html>
         <html lang="ru">
         <head>
             <meta charset="UTF-8">
-            <title>Результаты расчета ДЗИП</title>
+            <title>Результаты расчета {self.SENSOR}</title>
             <style>
                 body {{
                     font-family: 'Arial', sans-serif;
@@ -1091,17 +1375,18 @@ class ZIPWindow(ctk.CTkToplevel):
         </head>
         <body>
             <div class="header">
-                <h1>РЕЗУЛЬТАТЫ РАСЧЕТА ПАРАМЕТРОВ ДАТЧИКА ДЗИП</h1>
+                <h1>РЕЗУЛЬТАТЫ РАСЧЕТА ПАРАМЕТРОВ ДАТЧИКА {self.SENSOR}</h1>
                 <p>Тип датчика: {self.selected_sensor} | Схема подключения: {self.selected_scheme}</p>
                 <p>Дата расчета: {datetime.now().strftime("%d.%m.%Y %H:%M:%S")}</p>
             </div>
 
             {self._generate_input_params_section(russian_names)}
             {self._generate_results_section(russian_names)}
+            {self._generate_trace_section()}
             {self._generate_notes_section()}
 
             <div class="metadata">
-                <p>Сгенерировано автоматически в программе расчета ДЗИП</p>
+                <p>Сгенерировано автоматически в программе расчета {self.SENSOR}</p>
             </div>
 
             <div class="no-print" style="text-align: center; margin-top: 30px;">
@@ -1161,8 +1446,7 @@ class ZIPWindow(ctk.CTkToplevel):
             """
 
         # Геометрические параметры
-        geom_params = ["D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0"]
-        for param in geom_params:
+        for param in self.GEOMETRY_FIELDS:
             value = getattr(self, param, "N/A")
             input_params_html += f"""
                 <tr>
@@ -1209,7 +1493,7 @@ class ZIPWindow(ctk.CTkToplevel):
 
         for key, value in self.calculation_results.items():
             # Для процентных параметров умножаем на 100
-            if key in ['gamma', 'd_z', 'eta']:
+            if key in self.PERCENT_RESULTS + self.CIRCUIT_PERCENT:
                 formatted_value = self.format_percentage_value(value)
             else:
                 formatted_value = self.format_value(value)
@@ -1230,16 +1514,29 @@ class ZIPWindow(ctk.CTkToplevel):
         """
         return results_html
 
+    def _generate_trace_section(self):
+        """Генерация секции хода расчета"""
+        if not self.calculation_trace:
+            return ""
+
+        steps_html = "".join(f"<li>{line}</li>" for line in self.calculation_trace.lines())
+        return f"""
+        <div class="section">
+            <div class="section-title">ХОД РАСЧЕТА</div>
+            <ol>{steps_html}</ol>
+        </div>
+        """
+
     def _generate_notes_section(self):
         """Генерация секции примечаний"""
-        return """
+        return f"""
         <div class="section">
             <div class="section-title">ПРИМЕЧАНИЯ</div>
             <ul>
                 <li>Все геометрические параметры указаны в миллиметрах (мм)</li>
                 <li>Электрические параметры рассчитаны для заданных условий</li>
                 <li>Погрешности указаны в процентах (%)</li>
-                <li>Расчет выполнен по методике для дифференциального законченного ИП</li>
+                <li>Расчет выполнен по методике для {self.SENSOR_DESCRIPTION}</li>
                 <li>Все значения округлены до 3 знаков после запятой</li>
             </ul>
         </div>
@@ -1249,12 +1546,6 @@ class ZIPWindow(ctk.CTkToplevel):
         """Определение единиц измерения по названию параметра"""
         units_mapping = {
             'xv': 'мм', 'd_zT_min': '%', 'eta_max': '', 'x': '', 'K_kp': '',
-            'mu_0': 'Гн/м',
-            'S_B': 'мм²', 'S_cd': 'мм²', 'S_y': 'мм²', 'S_c': 'мм²', 'S_ok': 'мм²',
-            'L_cd': 'мм', 'L_y': 'мм', 'L_c': 'мм', 'R_cp': 'мм',
-            'z_0': 'Ом', 'Z_x': 'Ом', 'R_k': 'Ом', 'R_B0': 'Ом',
-            'f_p': 'Гц',
-            'gamma': '%', 'd_z': '%', 'eta': '%',
-            'k_x': '1/мм', 'k_B': '1/мм'
+            'mu_0': 'Гн/м', **self.RESULT_UNITS, **self.CIRCUIT_UNITS
         }
-        return units_mapping.get(param_name, '-')
\ No newline at end of file
+        return units_mapping.get(param_name, '')
@@ -0,0 +1,98 @@
+import numpy as np
+from core import trace
+
+# Схемы включения дифференциального датчика (табл. 1.1)
+SCHEMES = ("ПРСМ", "ПОСМ")
+
+# Оптимальные относительные сопротивления схемы: k = R/z0, sigma = R_N/z0
+OPTIMAL_LOAD = {"ПРСМ": (0.5, 2/3), "ПОСМ": (1.0, 1.0)}
+
+def calc_transfer(z1,z2,z0,k,sigma,scheme): #Коэффициент передачи схемы A_Д/A_П (табл. 1.1)
+    R = k*z0
+    R_N = sigma*z0
+
+    if scheme == "ПОСМ":
+        return R_N*(z1-z2)/(2*z1*z2 + (R+2*R_N)*(z1+z2))
+    if scheme == "ПРСМ":
+        return R_N*R*(z1-z2)/(R_N*(R+z1)*(R+z2) + R*z1*(R+z2) + R*z2*(R+z1))
+    raise ValueError(f"Неизвестная схема включения: {scheme}")
+
+def calc_best_line(psi,y,iterations=30): #Наилучшая (чебышевская) прямая A + B*psi для y(psi)
+    # Погрешность E(B) = (max - min)/2 остатка y - B*psi выпукла по B, а
+    # наилучший наклон лежит между наименьшим и наибольшим наклоном хорд
+    # соседних точек: для почти линейной характеристики отрезок узкий.
+    # Наклон ищется методом золотого сечения, A - середина остатка.
+    # Точки характеристики - последняя ось y.
+    def error(B):
+        rest = y - B[..., None]*psi
+        return rest.max(-1) - rest.min(-1)
+
+    ratio = (np.sqrt(5) - 1)/2
+    slopes = np.diff(y, axis=-1)/np.diff(psi)
+    lo, hi = slopes.min(-1), slopes.max(-1)
+    B1 = hi - ratio*(hi - lo)
+    B2 = lo + ratio*(hi - lo)
+    e1, e2 = error(B1), error(B2)
+    for _ in range(iterations):
+        left = e1 < e2
+        hi = np.where(left, B2, hi)
+        lo = np.where(left, lo, B1)
+        B_new = np.where(left, hi - ratio*(hi - lo), lo + ratio*(hi - lo))
+        e_new = error(B_new)
+        B1, e1, B2, e2 = (np.where(left, B_new, B2), np.where(left, e_new, e2),
+                          np.where(left, B1, B_new), np.where(left, e1, e_new))
+
+    B = (lo + hi)/2
+    rest = y - B[..., None]*psi
+    r_max, r_min = rest.max(-1), rest.min(-1)
+    return (r_max + r_min)/2, B, (r_max - r_min)/2
+
+def calc_output(U,x,z_x1,z_x2,z_0,k,sigma,scheme): #Выходное напряжение схемы на диапазоне [-xv, xv]
+    # x, z_x1, z_x2 - характеристика датчика (последняя ось - точки);
+    # S_U - крутизна наилучшей прямой, gamma_b - приведенная погрешность
+    # от нелинейности выходного напряжения (датчик и схема вместе)
+    U, z_0, k, sigma = (np.asarray(v, dtype=float)[..., None] for v in (U, z_0, k, sigma))
+    U_out = U*calc_transfer(z_x1, z_x2, z_0, k, sigma, scheme)
+
+    xv = x[..., -1]
+    psi = np.linspace(-1, 1, U_out.shape[-1])
+    A, B, E = calc_best_line(psi, U_out)
+    S_U = B/xv
+    gamma_b = E/(2*np.abs(B))
+
+    trace.record("S_U", S_U, "Крутизна выходного напряжения схемы S_U...", digits=None)
+    trace.record("gamma_b", gamma_b, "Приведенная погрешность от нелинейности схемы gamma_b %...", scale=100)
+    return {'x': x, 'U_out': U_out, 'U_0': A, 'S_U': S_U, 'gamma_b': gamma_b}
+
+def calc_scheme_gamma(d_z,k,sigma,scheme,points=41): #Нелинейность, вносимая схемой
+    # Погрешность схемы при линейной характеристике датчика:
+    # z1 = z0*(1 + d_z*psi), z2 = z0*(1 - d_z*psi)
+    d_z, k, sigma = (np.asarray(v, dtype=float)[..., None] for v in (d_z, k, sigma))
+    psi = np.linspace(-1, 1, points)
+    ratio = calc_transfer(1 + d_z*psi, 1 - d_z*psi, 1, k, sigma, scheme)
+    A, B, E = calc_best_line(psi, ratio)
+    gamma_s = E/(2*np.abs(B))
+
+    trace.record("gamma_s", gamma_s, "Нелинейность, вносимая схемой gamma_s %...", scale=100)
+    return gamma_s
+
+def calc_I_k(U,z0,k,scheme): #Ток катушки при среднем положении якоря
+    if scheme == "ПОСМ":
+        I_k = U/(2*z0)
+    elif scheme == "ПРСМ":
+        I_k = U/(z0*(1+k))
+    else:
+        raise ValueError(f"Неизвестная схема включения: {scheme}")
+
+    trace.record("I_k", I_k, "Ток катушки I_k...", digits=None)
+    return I_k
+
+def calc_Delta_T(I_k,d_n): #Плотность тока в обмотке
+    Delta_T = 4*I_k/(np.pi*d_n**2)
+    trace.record("Delta_T", Delta_T, "Плотность тока в обмотке Delta_T...")
+    return Delta_T
+
+def calc_P_r(I_k,R_k): #Мощность, рассеиваемая катушкой
+    P_r = I_k**2*R_k
+    trace.record("P_r", P_r, "Мощность, рассеиваемая катушкой P_r...", digits=None)
+    return P_r
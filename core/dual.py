@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class Dual(np.lib.mixins.NDArrayOperatorsMixin):
+    """Дуальное число (массив): значение value и производные grad
+
+    grad имеет форму value.shape + (n,), где n - число независимых
+    переменных. Арифметика и функции numpy (np.sqrt, np.log, ...) работают
+    через __array_ufunc__, поэтому формулы core/* дают производные без
+    изменений: прямой режим автоматического дифференцирования.
+    """
+
+    __array_priority__ = 100
+
+    def __init__(self, value, grad):
+        self.value = np.asarray(value, dtype=float)
+        self.grad = np.asarray(grad, dtype=float)
+
+    @classmethod
+    def variables(cls, *values):
+        """Независимые переменные: производная каждой по себе равна 1"""
+        values = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))
+        n = len(values)
+        eye = np.eye(n)
+        return [cls(value, np.broadcast_to(eye[i], value.shape + (n,))) for i, value in enumerate(values)]
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, grad={self.grad!r})"
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or "out" in kwargs:
+            return NotImplemented
+
+        values = [x.value if isinstance(x, Dual) else np.asarray(x) for x in inputs]
+        if ufunc in _PLAIN:
+            return ufunc(*values, **kwargs)
+        rule = _RULES.get(ufunc)
+        if rule is None:
+            return NotImplemented
+
+        value = ufunc(*values, **kwargs)
+        # Частные производные по каждому аргументу, умноженные на его grad
+        grad = None
+        for x, partial in zip(inputs, rule(value, *values)):
+            if not isinstance(x, Dual):
+                continue
+            if isinstance(partial, int) and partial in (1, -1):
+                term = x.grad if partial == 1 else -x.grad
+            else:
+                term = np.asarray(partial)[..., None] * x.grad
+            grad = term if grad is None else grad + term
+        return Dual(value, np.broadcast_to(grad, np.shape(value) + grad.shape[-1:]))
+
+
+def _power(f, a, b):
+    # d(a^b) = b a^(b-1) da + a^b ln(a) db
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return b * a ** (b - 1), f * np.log(a)
+
+
+# Частные производные ufunc: rule(значение, *аргументы) -> (df/da, df/db, ...)
+_RULES = {
+    np.add: lambda f, a, b: (1, 1),
+    np.subtract: lambda f, a, b: (1, -1),
+    np.multiply: lambda f, a, b: (b, a),
+    np.true_divide: lambda f, a, b: (1 / b, -f / b),
+    np.power: _power,
+    np.negative: lambda f, a: (-1,),
+    np.positive: lambda f, a: (1,),
+    np.absolute: lambda f, a: (np.sign(a),),
+    np.square: lambda f, a: (2 * a,),
+    np.sqrt: lambda f, a: (0.5 / f,),
+    np.exp: lambda f, a: (f,),
+    np.log: lambda f, a: (1 / a,),
+    np.log10: lambda f, a: (1 / (a * np.log(10)),),
+    np.sin: lambda f, a: (np.cos(a),),
+    np.cos: lambda f, a: (-np.sin(a),),
+    np.tanh: lambda f, a: (1 - f ** 2,),
+    np.arctan: lambda f, a: (1 / (1 + a ** 2),),
+    np.maximum: lambda f, a, b: (a >= b, a < b),
+    np.minimum: lambda f, a, b: (a <= b, a > b),
+}
+
+# ufunc, результат которых не дифференцируется (сравнения, проверки)
+_PLAIN = {
+    np.less, np.less_equal, np.greater, np.greater_equal, np.equal, np.not_equal,
+    np.isfinite, np.isnan, np.isinf, np.sign, np.floor, np.ceil,
+}
+
+
+def value(x):
+    """Значение дуального числа (или само число)"""
+    return x.value if isinstance(x, Dual) else x
+
+
+def gradient(x, n):
+    """Производные дуального числа; для константы - нули"""
+    if isinstance(x, Dual):
+        return x.grad
+    return np.zeros(np.shape(x) + (n,))
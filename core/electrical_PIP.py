@@ -2,41 +2,41 @@ from math import log10
 
 import numpy as np
 import math as m
-from core import geometry_PIP,validation
+from core import geometry_PIP,validation,trace
 
-def calc_N (L_c,h2,S_c):
+def calc_N (L_c,h2,S_c): #Коэффициент размагничивания магнитопровода
     v = h2/L_c
-    alpha = 0.5*L_c*m.sqrt(np.pi/S_c)
+    alpha = 0.5*L_c*np.sqrt(np.pi/S_c)
 
     chi = 1 + 0.211*v**-1.116
     theta = 6.855 - 8.074*alpha**0.1353
 
     N = 4*np.pi*chi*np.exp(theta)
 
-    print(f"Коэффициент размагничивания магнитопровода N = {N}")
+    trace.record("N", N, "Коэффициент размагничивания магнитопровода N =", digits=None)
 
     return N
 
-def calc_R_mC(h_c,N,mu_c,mu_0,a1,a2,a3,d1,d2):
+def calc_R_mC(h_c,N,mu_c,mu_0,a1,a2,a3,d1,d2): #Полное магнитное сопротивление "стальной" части магнитопровода
 
     mu_c_otn = mu_c / mu_0
-    mu_c_full = mu_c_otn / (1 + (N / 4 * np.pi) * (mu_c_otn - 1))
+    mu_c_full = mu_c_otn / (1 + (N / (4 * np.pi)) * (mu_c_otn - 1))
 
-    R_mC = (1/mu_0*mu_c_full)*(a1+a2+a3+(4*h_c/np.pi*((d1**2)-(d2**2))))
+    R_mC = (1/(mu_0*mu_c_full))*(a1+a2+a3+(4*h_c/(np.pi*((d1**2)-(d2**2)))))
 
-    print(f"Полное магнитное сопротивление стальной части магнитопровода R_mC = {R_mC}")
+    trace.record("R_mC", R_mC, "Полное магнитное сопротивление стальной части магнитопровода R_mC =", digits=None)
 
     return R_mC
 
-def calc_R_B0(mu_0,H,l0,d,d1):
+def calc_R_B0(mu_0,H,l0,d,d1): #Начальное магнитное сопротивление воздушных зазоров
 
-    R_B0 = (1/2*np.pi*mu_0)*((H+l0)/H*l0)*np.log(d/d1)
+    R_B0 = (1/(2*np.pi*mu_0))*((H+l0)/(H*l0))*np.log(d/d1)
 
-    print(f"Начальное магнитное сопротивление воздушных зазоров R_B0 = {R_B0}")
+    trace.record("R_B0", R_B0, "Начальное магнитное сопротивление воздушных зазоров R_B0 =", digits=None)
     return R_B0
 
 
-def calc_z_x(l0,H, R_B0,R_mC,x,z0):
+def calc_z_x(l0,H, R_B0,R_mC,x,z0): #Полное электрическое сопротивление катушки ПИП
 
     beta_zx = l0/(l0+H)
     gamma = R_B0/R_mC
@@ -45,32 +45,42 @@ def calc_z_x(l0,H, R_B0,R_mC,x,z0):
 
     Z_x = z0*((1+k_x*x)/(1+alpha_zx*k_x*x))
 
-    print(f"Полное электрическое сопротивление  Z_x = {Z_x}")
+    trace.record("beta_zx", beta_zx, "Коэффициент beta =", digits=None)
+    trace.record("alpha_zx", alpha_zx, "Коэффициент alpha =", digits=None)
+    trace.record("Z_x", Z_x, "Полное электрическое сопротивление  Z_x =", digits=None)
 
-    return Z_x,alpha_zx
+    return Z_x,alpha_zx,beta_zx,k_x
 
-def calc_gamma_pip(k_x,xv,alpha_zx):
+def calc_gamma_pip(k_x,xv,alpha_zx): #Максимальная приведенная погрешность от нелинейности
 
     q = k_x*xv
-    gamma_pip = (alpha_zx*q)/2*(1+m.sqrt(1-(alpha_zx*q)**2))
+    gamma_pip = (alpha_zx*q)/(2*(1+np.sqrt(1-(alpha_zx*q)**2)))
 
-    print(f"Максимальная приведенная погрешность от нелинейности статической характеристики преобразователя gamma_pip = {gamma_pip}")
-    return gamma_pip
+    trace.record("q", q, "Коэффициент q =", digits=None)
+    trace.record("gamma_pip", gamma_pip, "Максимальная приведенная погрешность от нелинейности статической характеристики преобразователя gamma_pip =", digits=None)
+    return gamma_pip,q
 
-def calc_d_z(gamma_pip,dz):
+def calc_d_z(alpha_zx,q): #Относительная девиация сопротивления катушки ПИП
 
-    alpha_dz = (4*gamma_pip/(1+4*gamma_pip**2))*((1+(4*gamma_pip**2)+2*dz*gamma_pip*(1-4*gamma_pip**2)/(4*gamma_pip+ dz*(1-4*gamma_pip**2))))
-    q = (4*gamma_pip + dz*(1-4*gamma_pip**2))/(1+4*gamma_pip**2+2*dz*gamma_pip*(1-4*gamma_pip**2))\
+    aq = alpha_zx*q
+    dz = (1 - alpha_zx) * aq / (1 - aq ** 2 - (1 - alpha_zx) * np.sqrt(1 - aq ** 2))
 
-    dz = (1 - alpha_dz) * alpha_dz * q / (1 - (alpha_dz * q) ** 2 - (1 - alpha_dz) * m.sqrt(1 - (alpha_dz * q) ** 2))
-
-    print( f"Относительная девиация сопротивления катушки ПИП dz = {dz}")
+    trace.record("dz", dz, "Относительная девиация сопротивления катушки ПИП dz =", digits=None)
     return dz
 
+def calc_alpha_q(gamma_pip,dz): #Параметры alpha и q по требуемым gamma_pip и dz
+
+    alpha_dz = (4*gamma_pip/(1+4*gamma_pip**2))*((1+(4*gamma_pip**2)+2*dz*gamma_pip*(1-4*gamma_pip**2))/(4*gamma_pip+ dz*(1-4*gamma_pip**2)))
+    q = (4*gamma_pip + dz*(1-4*gamma_pip**2))/(1+4*gamma_pip**2+2*dz*gamma_pip*(1-4*gamma_pip**2))
+
+    trace.record("alpha_dz", alpha_dz, "Требуемый коэффициент alpha =", digits=None)
+    trace.record("q", q, "Требуемый коэффициент q =", digits=None)
+    return alpha_dz,q
+
 def calc_R_k(ro_n,R_cp,w,d_n):
 
     R_k = 8*ro_n*(R_cp*w/d_n**2)
-    print(f"Активное сопротивление катушки R_k = {R_k}")
+    trace.record("R_k", R_k, "Активное сопротивление катушки R_k =", digits=None)
 
     return R_k
 
@@ -78,17 +88,40 @@ def calc_etta(z0,d_z,R_k):
 
     etta = R_k/(z0*(1-d_z))
 
-    print(f"Доля активного сопротивления катушки etta = {etta}")
+    trace.record("etta", etta, "Доля активного сопротивления катушки etta =", digits=None)
 
     return etta
 
-def calc_f_p(R_mC, R_B0,etta,w,z0):
+def calc_f_p(R_mC, R_B0,etta,w,z0): #Частота напряжения питания
 
     R_m0 = R_mC+ R_B0
 
-    f_p = (z0*R_m0/2*np.pi*w**2)*m.sqrt(1-etta**2)
+    f_p = (z0*R_m0/(2*np.pi*w**2))*np.sqrt(1-etta**2)
 
-    print(f"Частота напряжения питания f_p = {f_p}")
+    trace.record("f_p", f_p, "Частота напряжения питания f_p =", digits=None)
 
     return f_p
 
+def calc_characteristic(z0,k_x,alpha_zx,xv,points=2001): #Статическая характеристика ПИП на [-xv, xv]
+    # z_x1 = z0*(1+k_x*x)/(1+alpha*k_x*x) - характеристика катушки,
+    # z_x2 - вторая катушка дифференциального ПИП (x -> -x);
+    # eps, delta - как в electrical_ZIP.calc_characteristic: max|delta| = gamma_pip.
+    z0, k_x, alpha_zx, xv = (np.asarray(v, dtype=float)[..., None] for v in (z0, k_x, alpha_zx, xv))
+    x = xv*np.linspace(-1, 1, points)
+
+    z_x1 = z0*(1+k_x*x)/(1+alpha_zx*k_x*x)
+    z_x2 = z0*(1-k_x*x)/(1-alpha_zx*k_x*x)
+    eps = z_x1/z0 - 1
+
+    # Для вогнутой eps(x) погрешность секущей прямой A + B*x одинакова на
+    # концах диапазона и противоположна по знаку в точке касания u_t
+    q = k_x*xv
+    aq = alpha_zx*q
+    eps_min, eps_max = -(1-alpha_zx)*q/(1-aq), (1-alpha_zx)*q/(1+aq)
+    B = (eps_max - eps_min)/2
+    u_t = (np.sqrt((1-alpha_zx)*q/B) - 1)/aq
+    eps_t = (1-alpha_zx)*q*u_t/(1+aq*u_t)
+    A = (eps_max - B + eps_t - B*u_t)/2
+    delta = (eps - (A + B*x/xv))/(eps_max - eps_min)
+
+    return {'x': x, 'z_x1': z_x1, 'z_x2': z_x2, 'eps': eps, 'delta': delta}
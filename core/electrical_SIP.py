@@ -0,0 +1,149 @@
+import numpy as np
+import math as m
+from core import geometry_SIP,validation,trace
+
+def calc_N(p_k,p_c,r): #Коэффициент размагничивания сердечника
+
+    v = p_k/p_c
+    alpha = p_c/r
+
+    chi = 1 + 0.211* v**-1.116
+    theta = 6.855-8.074*alpha**0.1353
+
+    N = 4 * np.pi * chi* np.exp(theta)
+
+    trace.record("v", v, "Коэффициент  v ...")
+    trace.record("chi", chi, "Коэффициент  chi ...")
+    trace.record("theta", theta, "Коэффициент  theta ...")
+    trace.record("N", N, "Коэффициент размагничивания сердечника N...")
+    return N
+
+def calc_mu_C(N,mu_c,mu_0): #Эффективная относительная проницаемость сердечника
+    mu_c_otn = mu_c/mu_0
+    mu_C = mu_c_otn / (1 + (N/(4*np.pi))*(mu_c_otn - 1))
+
+    trace.record("mu_c_otn", mu_c_otn, "Коэффициент  mu_c_otn ...")
+    trace.record("mu_C", mu_C, "Эффективная проницаемость сердечника mu_C...")
+    return mu_C
+
+def calc_M_N_K(s,p,q): #Безразмерные коэффициенты M_p, N_p, K_p
+    alpha = s - p + 1
+    beta = s + p + 1
+    c = s - p - 1
+    d = s + p - 1
+
+    S = lambda u: np.sqrt(u**2 + q**2)
+    M_p = alpha/S(alpha) - beta/S(beta) - c/S(c) + d/S(d)
+    N_p = S(alpha) + S(beta) - S(c) - S(d)
+    K_p = alpha/S(alpha)**5 - beta/S(beta)**5 - c/S(c)**5 + d/S(d)**5
+
+    trace.record("M_p", M_p, "Коэффициент M_p ...")
+    trace.record("N_p", N_p, "Коэффициент N_p ...")
+    trace.record("K_p", K_p, "Коэффициент K_p ...")
+    return M_p, N_p, K_p, alpha, beta, c, d
+
+def calc_L_0(mu_C,s,r,R): #Безразмерная начальная индуктивность L_0p
+    theta_r = r/R
+    L_0 = 1/(mu_C - 1) * 4*s/theta_r**2
+    trace.record("L_0", L_0, "Коэффициент L_0p ...")
+    return L_0
+
+def calc_a_b(M_p,N_p,K_p,L_0,q,p_k): #Параметры статической характеристики (3.11)
+    a = M_p/(L_0 + N_p) / p_k
+    b = q**2*K_p/(2*M_p) / p_k**2
+
+    trace.record("a", a, "Параметр статической характеристики a...")
+    trace.record("b", b, "Параметр статической характеристики b...")
+    return a, b
+
+def calc_gamma(b,xv): #Максимальная приведенная погрешность от нелинейности (3.16)
+    lam = b*xv**2
+    gamma = lam/(2*(4 - 3*lam))
+
+    trace.record("lambda", lam, "Коэффициент lambda ...")
+    trace.record("gamma", gamma, "Максимальная приведенная погрешность gamma...")
+    return gamma, lam
+
+def calc_d_z(a,xv,lam): #Относительная девиация сопротивления катушки (3.17)
+    d_z = a*xv*(1 - 0.75*lam)
+    trace.record("d_z", d_z, "Относительная девиация сопротивления d_z %...", scale=100)
+    return d_z
+
+def calc_eps_T(psi,xv,p_k,q,alpha,beta,c,d,N_p,L_0): #Точное относительное изменение сопротивления (3.15)
+    u = psi*xv/p_k
+    S = lambda t: np.sqrt(t**2 + q**2)
+    F = S(u + alpha) + S(u - beta) - S(u + c) - S(u - d)
+    return (F - N_p)/(L_0 + N_p)
+
+def calc_delta_ma(a,lam,xv,p_k,q,alpha,beta,c,d,N_p,L_0,points=20): #Погрешность приближения (3.13)
+    # Максимум по psi = x/xv на сетке из points точек с каждой стороны от
+    # нуля; расчет по точкам, чтобы не создавать массивы (пакет x точки)
+    delta_ma = 0
+    for psi in np.linspace(1/points, 1, points):
+        for sign in (-1, 1):
+            eps_T = calc_eps_T(sign*psi, xv, p_k, q, alpha, beta, c, d, N_p, L_0)
+            eps_P = a*xv*sign*psi*(1 - lam*psi**2)
+            delta_ma = np.maximum(delta_ma, np.abs((eps_T - eps_P)/eps_T))
+
+    trace.record("delta_ma", delta_ma, "Погрешность приближения характеристики delta_ma %...", scale=100)
+    return delta_ma
+
+def calc_w_0(d_n): #Удельное число витков катушки (3.18)
+    w_0 = (4/(np.pi*d_n**2))*(0.375+(3.935*d_n/(1+12.448*d_n)))
+    trace.record("w_0", w_0, "Удельное число витков катушки w_0...")
+    return w_0
+
+def calc_w(w_0,S_ok): #Число витков катушки
+    w = w_0*S_ok
+    trace.record("w", w, "Число витков катушки w...")
+    return w
+
+def calc_R_k(R,d_n,w,p_n): #Активное сопротивление катушки
+    R_k = 8*p_n*((R*w)/d_n**2)
+    trace.record("R_k", R_k, "Активное сопротивление катушки R_k...")
+    return R_k
+
+def calc_eta(R_k,z0,d_z): #Доля активного сопротивление катушки
+    eta = R_k/(z0*(1-d_z))
+    trace.record("eta", eta, "Доля активного сопротивление катушки eta...")
+    return eta
+
+def calc_L_x(w,R,r,l_k,p_c,p_k,mu_0,mu_C,x_c): #Индуктивность соленоида при среднем положении якоря (3.19)
+    L_k = np.pi*mu_0*w**2*R**2/l_k
+    A_L = np.pi*r**2/8 * mu_0*(mu_C - 1) * w**2/(p_c*p_k)
+
+    m1 = p_c + p_k
+    m2 = p_c - p_k
+    L_x = L_k + A_L*(np.sqrt((x_c+m1)**2 + R**2) + np.sqrt((x_c-m1)**2 + R**2)
+                     - np.sqrt((x_c+m2)**2 + R**2) - np.sqrt((x_c-m2)**2 + R**2))
+
+    trace.record("L_k", L_k, "Собственная индуктивность катушки L_k...")
+    trace.record("A_L", A_L, "Коэффициент A_L ...")
+    trace.record("L_x", L_x, "Индуктивность соленоида L_x...")
+    return L_x, L_k, A_L
+
+def calc_f_p(z0,L_x,eta): #Частота напряжения питания
+    f_p = z0/(2*np.pi*L_x)*np.sqrt(1-eta**2)
+    trace.record("f_p", f_p, "Частота напряжения питания f_p...")
+    return f_p
+
+def calc_Z_x(x,z0,a,b): #Приближенная статическая характеристика (3.11)
+    Z_x = z0*(1 + a*x*(1 - b*x**2))
+    trace.record("Z_x", Z_x, "Полное электрическое сопротивление катушки СИП Z_x...")
+    return Z_x
+
+def calc_characteristic(z0,d_z,xv,p_k,q,alpha,beta,c,d,N_p,L_0,points=2001): #Статическая характеристика ДСИП на [-xv, xv]
+    # z_x1, z_x2 - катушки ДСИП по точной характеристике (3.15);
+    # для нечетной кубической характеристики (3.11) наилучшая прямая
+    # проходит через ноль с наклоном d_z/xv, а max|delta| = gamma (3.16)
+    z0, d_z, xv, p_k, q, alpha, beta, c, d, N_p, L_0 = (
+        np.asarray(v, dtype=float)[..., None] for v in (z0, d_z, xv, p_k, q, alpha, beta, c, d, N_p, L_0))
+    psi = np.linspace(-1, 1, points)
+    x = xv*psi
+
+    eps = calc_eps_T(psi, xv, p_k, q, alpha, beta, c, d, N_p, L_0)
+    z_x1 = z0*(1 + eps)
+    z_x2 = z0*(1 + calc_eps_T(-psi, xv, p_k, q, alpha, beta, c, d, N_p, L_0))
+    delta = (eps - d_z*psi)/(2*d_z)
+
+    return {'x': x, 'z_x1': z_x1, 'z_x2': z_x2, 'eps': eps, 'delta': delta}
@@ -1,6 +1,6 @@
 import numpy as np
 import math as m
-from core import geometry_ZIP,validation
+from core import geometry_ZIP,validation,trace
 
 def calc_R_B(l0,x,mu_0,S_B):
     l_b5 = l0 - x
@@ -8,11 +8,11 @@ def calc_R_B(l0,x,mu_0,S_B):
     L_b = l_b5+l_b6
     R_B = L_b/(mu_0*S_B)
 
-    print(f"Коэффициент  l_b5 ... {round(l_b5,3)}")
-    print(f"Коэффициент  l_b6 ... {round(l_b6,3)}")
-    print(f"Коэффициент  L_b ... {round(L_b,3)}")
+    trace.record("l_b5", l_b5, "Коэффициент  l_b5 ...")
+    trace.record("l_b6", l_b6, "Коэффициент  l_b6 ...")
+    trace.record("L_b", L_b, "Коэффициент  L_b ...")
 
-    print(f"Сопротивление воздушной части магнитопровода  R_B... {round(R_B,3)}")
+    trace.record("R_B", R_B, "Сопротивление воздушной части магнитопровода  R_B...")
 
     return R_B
 
@@ -20,19 +20,19 @@ def calc_R_B(l0,x,mu_0,S_B):
 def calc_N (h1,L_c,S_c): #Коэффициент размагничивания магнитопровода
 
     v = h1/L_c
-    alpha = 0.5* L_c * m.sqrt(np.pi/S_c)
+    alpha = 0.5* L_c * np.sqrt(np.pi/S_c)
 
     chi = 1 + 0.211* v**-1.116
     theta = 6.855-8.074*alpha**0.1353
 
     N = 4 * np.pi * chi* np.exp(theta)
 
-    print(f"Коэффициент  v ... {round(v,3)}")
-    print(f"Коэффициент  alpha ... {round(alpha,3)}")
-    print(f"Коэффициент  chi ... {round(chi,3)}")
-    print(f"Коэффициент  theta ... {round(theta,3)}")
+    trace.record("v", v, "Коэффициент  v ...")
+    trace.record("alpha", alpha, "Коэффициент  alpha ...")
+    trace.record("chi", chi, "Коэффициент  chi ...")
+    trace.record("theta", theta, "Коэффициент  theta ...")
 
-    print(f"Коэффициент размагничивания магнитопровода N... {round(N,3)}")
+    trace.record("N", N, "Коэффициент размагничивания магнитопровода N...")
 
     return N
 
@@ -43,10 +43,10 @@ def calc_R_mC(L_c,S_c,N,mu_c,mu_0): #Полное магнитное сопро
 
     R_mC = L_c/(mu_0*mu_c_full*S_c)
 
-    print(f"Коэффициент  mu_c_otn ... {round(mu_c_otn,3)}")
-    print(f"Коэффициент  mu_c_full ... {round(mu_c_full,3)}")
+    trace.record("mu_c_otn", mu_c_otn, "Коэффициент  mu_c_otn ...")
+    trace.record("mu_c_full", mu_c_full, "Коэффициент  mu_c_full ...")
 
-    print(f"Полное магнитное сопротивление стальной части магнитопровода R_mC... {round(R_mC,3)}")
+    trace.record("R_mC", R_mC, "Полное магнитное сопротивление стальной части магнитопровода R_mC...")
 
     return R_mC
 
@@ -57,8 +57,9 @@ def calc_R_mb(l0,mu_0,S_B,x): #Завимисомть сопротивления
 
     R_mb = R_B0*(1-k_B*x)
 
-    print(f"Коэффициент  R_B0 ... {round(R_B0,3)}")
-    print(f"Завиcимость сопротивления магнитопровода и перемещение якоря R_mb, k_B... {round(R_mb,3), round(k_B,3)}")
+    trace.record("R_B0", R_B0, "Коэффициент  R_B0 ...")
+    trace.record("k_B", k_B, "Коэффициент зависимости сопротивления зазора от перемещения якоря k_B...")
+    trace.record("R_mb", R_mb, "Магнитное сопротивление зазора при перемещении якоря R_mb...")
 
     return R_mb, k_B,R_B0
 
@@ -66,15 +67,15 @@ def calc_k_x(R_mC, R_B0, k_B): #Относительный коэффициен
 
     k_x = k_B*(R_B0/(R_mC+R_B0))
 
-    print(f"Относительный коэффициент чувствительности k_x... {round(k_x,3)}")
+    trace.record("k_x", k_x, "Относительный коэффициент чувствительности k_x...")
 
     return k_x
 
 def calc_z_0(f_p,R_mC, R_B0, w,eta): #Начальное электрическое сопротивление катушки
 
-    z_0 = 2*np.pi*f_p/m.sqrt(1-eta**2) * (w**2/(R_mC+R_B0))
+    z_0 = 2*np.pi*f_p/np.sqrt(1-eta**2) * (w**2/(R_mC+R_B0))
 
-    print(f"Начальное электрическое сопротивление катушки z_0... {round(z_0,3)}")
+    trace.record("z_0", z_0, "Начальное электрическое сопротивление катушки z_0...")
 
     return z_0
 
@@ -82,53 +83,79 @@ def calc_Z_x(x,z_0,k_x): #Полное электрическое сопроти
 
     Z_x = z_0/(1-k_x*x)
 
-    print(f"Полное электрическое сопротивление катушки ЗИП Z_x... {round(Z_x,3)}")
+    trace.record("Z_x", Z_x, "Полное электрическое сопротивление катушки ЗИП Z_x...")
 
     return Z_x
 
 def calc_gamma (k_x,xv): #Максимальная приведенная погрешность
     q = k_x*xv
-    gamma = q/2*(1+m.sqrt((1-q**2)))
+    gamma = q/(2*(1+np.sqrt(1-q**2)))
 
-    print(f"Коэффициент q ... {round(q,3)}")
-    print(f"Максимальная приведенная погрешность gamma... {round(gamma,3)}")
+    trace.record("q", q, "Коэффициент q ...")
+    trace.record("gamma", gamma, "Максимальная приведенная погрешность gamma...")
 
     return gamma,q
 
 def calc_gamma_pi (gamma):
-    gamma_pi = 4*gamma**2/((1+4*gamma**2)**4) * (3 + m.sqrt( 144*gamma**4 + 64* gamma **2 + 9/ (1+4*gamma**2)**2))
-    print (f"Коэффициент gamma_pi ... {round(gamma_pi,3)}")
+    gamma_pi = 4*gamma**2/((1+4*gamma**2)**4) * (3 + np.sqrt( 144*gamma**4 + 64* gamma **2 + 9/ (1+4*gamma**2)**2))
+    trace.record("gamma_pi", gamma_pi, "Коэффициент gamma_pi ...")
     return gamma_pi
 
 def calc_d_z (q):
-    d_z = q/m.sqrt(1-q**2)
-    print(f"Максимальная приведенная погрешность d_z %... {round(d_z*100,3)}")
+    d_z = q/np.sqrt(1-q**2)
+    trace.record("d_z", d_z, "Максимальная приведенная погрешность d_z %...", scale=100)
     return d_z
 
 def calc_w_0(d_n): #Удельное число витков катушки
     w_0 = (4/(np.pi*d_n**2))*(0.375+(3.935*d_n/(1+12.448*d_n)))
-    print(f"Удельное число витков катушки w_0... {round(w_0,3)}")
+    trace.record("w_0", w_0, "Удельное число витков катушки w_0...")
     return w_0
 
 def calc_w(w_0,S_ok): #Число витков катушки
     w = w_0*S_ok
-    print(f"Число витков катушки w... {round(w,3)}")
+    trace.record("w", w, "Число витков катушки w...")
     return w
 
 def calc_R_k(R_cp,d_n,w, p_n): #Активное сопротивление катушки (Ошибка в коде? Разные формулы у разных людей)
     R_k = 8*p_n*((R_cp*w)/d_n**2)
-    print(f"Число витков катушки R_k... {round(R_k,3)}")
+    trace.record("R_k", R_k, "Число витков катушки R_k...")
     return R_k
 
 def calc_eta(R_k,z0,d_z): #Доля активного сопротивление катушки
     eta = R_k/(z0*(1-d_z))
-    print(f"Д____ {round(z0, 3)}")
-    print(f"Доля активного сопротивление катушки eta... {round(eta,3)}")
+    trace.record("eta", eta, "Доля активного сопротивление катушки eta...")
     return eta
 
 def calc_f_p(z_0,w,eta,R_mC,R_B0): #Частота напряжения питания
     R_m0 = R_mC+R_B0
-    f_p = ((z_0*R_m0)/(2*np.pi*w**2))*m.sqrt(1-eta**2)
-    print(f"Частота напряжения питания f_p... {round(f_p,3)}")
+    f_p = ((z_0*R_m0)/(2*np.pi*w**2))*np.sqrt(1-eta**2)
+    trace.record("f_p", f_p, "Частота напряжения питания f_p...")
     return f_p
 
+def f_p_hz(f_p): #Частота питания в Гц
+    # Магнитные сопротивления - в 1/(Гн·мм), поэтому calc_f_p дает f_p в кГц
+    return np.asarray(f_p) * 1e3
+
+def calc_characteristic(z_0,k_x,xv,points=2001): #Статическая характеристика ЗИП на [-xv, xv]
+    # z_x1 = z_0/(1-k_x*x), z_x2 = z_0/(1+k_x*x) - половины ДЗИП (2.2), (2.3);
+    # eps - относительная девиация сопротивления z_x1/z_0 - 1;
+    # delta - отклонение eps от наилучшей (чебышевской) прямой, отнесенное
+    # к полному изменению eps на диапазоне; max|delta| = gamma (табл. 2.2).
+    # Для массивов z_0, k_x, xv точки характеристики - последняя ось.
+    z_0, k_x, xv = (np.asarray(v, dtype=float)[..., None] for v in (z_0, k_x, xv))
+    x = xv*np.linspace(-1, 1, points)
+
+    z_x1 = z_0/(1-k_x*x)
+    z_x2 = z_0/(1+k_x*x)
+    eps = z_x1/z_0 - 1
+
+    # Для выпуклой eps(x) погрешность прямой A + B*x равна +E на концах
+    # диапазона и -E в точке касания x_t, где eps'(x_t) = B
+    q = k_x*xv
+    eps_min, eps_max = -q/(1+q), q/(1-q)
+    B = (eps_max - eps_min)/2
+    t = (1 - np.sqrt(q/B))/q
+    A = (eps_max - B + q*t/(1-q*t) - B*t)/2
+    delta = (eps - (A + B*x/xv))/(eps_max - eps_min)
+
+    return {'x': x, 'z_x1': z_x1, 'z_x2': z_x2, 'eps': eps, 'delta': delta}
@@ -0,0 +1,60 @@
+import numpy as np
+import math as m
+from core import electrical_SIP,validation,trace
+
+def calc_p_k_p_c(l_k,l_c): #Половины длины катушки и сердечника
+    p_k = l_k/2
+    p_c = l_c/2
+
+    trace.note("Производим расчет:")
+    trace.record("p_k", p_k, "Половина длины катушки p_k...")
+    trace.record("p_c", p_c, "Половина длины сердечника p_c...")
+    return p_k, p_c
+
+def calc_s_q(p_c,p_k,R): #Безразмерные геометрические параметры
+    s = p_c/p_k
+    q = R/p_k
+
+    trace.record("s", s, "Коэффициент s ...")
+    trace.record("q", q, "Коэффициент q ...")
+    return s, q
+
+def calc_p(s,q,iterations=60): #Корень уравнения (3.9) - точка перегиба характеристики
+    # Левая часть (3.9) отрицательна при p = 0 и, как правило, положительна
+    # при p = s + 1; корень ищется делением отрезка пополам сразу для всех
+    # вариантов пакета. Если знак на концах одинаков - nan.
+    def f(p):
+        t = lambda u: (u**2 + q**2)**-1.5
+        return t(p+s+1) + t(p-s-1) - t(p+s-1) - t(p-s+1)
+
+    lo = np.zeros(np.broadcast(s, q).shape)
+    hi = lo + s + 1
+    f_lo = f(lo)
+    bracket = np.sign(f_lo) != np.sign(f(hi))
+    for _ in range(iterations):
+        mid = (lo + hi)/2
+        f_mid = f(mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+    p = np.where(bracket, (lo + hi)/2, np.nan)
+    if p.ndim == 0:
+        p = float(p)
+
+    trace.record("p", p, "Безразмерный параметр точки перегиба p ...")
+    return p
+
+def calc_x_P(p,p_k): #Точка перегиба, расстояние между торцами катушек и средняя точка
+    x_P = p*p_k
+    l_T = 2*(x_P - p_k)
+    x_c = -x_P
+
+    trace.record("x_P", x_P, "Точка перегиба x_P...")
+    trace.record("l_T", l_T, "Расстояние между торцами катушек l_T...")
+    return x_P, l_T, x_c
+
+def calc_S_ok(R,r,t_B,l_k,K_kp): #Площадь окна катушки
+    S_ok = 2*(R-r-t_B)*l_k*K_kp
+    trace.record("S_ok", S_ok, "Площадь окна катушки S_ok...")
+    return S_ok
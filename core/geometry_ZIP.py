@@ -1,16 +1,16 @@
 import numpy as np
 import math as m
-from core import electrical_ZIP,validation
+from core import electrical_ZIP,validation,trace
 
 def calc_S_B(D1,D2,d2,d1): #Площадь сечения воздушной части магнитопровода
     S_e5 = np.pi/4 * (D1**2 - D2**2) #Площадь сечения на участке 5
     S_e6 = np.pi/4 * (d2**2 - d1**2) #Площадь сечения на участке 6
 
-    print(f"Производим расчет:")
-    print(f"Коэффициент S_e5 ... {round(S_e5,3)}")
-    print(f"Коэффициент S_e6 ... {round(S_e6,3)}")
+    trace.note("Производим расчет:")
+    trace.record("S_e5", S_e5, "Коэффициент S_e5 ...")
+    trace.record("S_e6", S_e6, "Коэффициент S_e6 ...")
     S_B = 2*(S_e5*S_e6/(S_e5 + S_e6)) #Площадь сечения воздушной части магнитопровода
-    print(f"Площади сечения воздушной части магнитопровода S_B... {round(S_B,3)}" )
+    trace.record("S_B", S_B, "Площади сечения воздушной части магнитопровода S_B...")
     return S_B
 
 def calc_L_cd(h1,h2,D1,D2,d1,d2): #Длина сечения сердечника
@@ -21,10 +21,10 @@ def calc_L_cd(h1,h2,D1,D2,d1,d2): #Длина сечения сердечник
 
     L_cd = l_c1+l_c2+l_c3
 
-    print(f"Коэффициент l_c1 ... {round(l_c1,3)}")
-    print(f"Коэффициент l_c2 ... {round(l_c2,3)}")
-    print(f"Коэффициент l_c3 ... {round(l_c3,3)}")
-    print(f"Длины сечения сердечника L_cd... {round(L_cd,3)}")
+    trace.record("l_c1", l_c1, "Коэффициент l_c1 ...")
+    trace.record("l_c2", l_c2, "Коэффициент l_c2 ...")
+    trace.record("l_c3", l_c3, "Коэффициент l_c3 ...")
+    trace.record("L_cd", L_cd, "Длины сечения сердечника L_cd...")
     return L_cd, l_c3, l_c2, l_c1
 
 def calc_S_cd(L_cd,h1,h2,D1,D2,d1,d2): #Площадь сечения сердечника
@@ -35,10 +35,10 @@ def calc_S_cd(L_cd,h1,h2,D1,D2,d1,d2): #Площадь сечения серде
 
     S_cd = L_cd / (a1 + a2 + a3)
 
-    print(f"Коэффициент a1 ... {round(a1,3)}")
-    print(f"Коэффициент a2 ... {round(a2,3)}")
-    print(f"Коэффициент a3 ... {round(a3,3)}")
-    print(f"Площади сечения сердечника S_cd... {round(S_cd,3)}")
+    trace.record("a1", a1, "Коэффициент a1 ...")
+    trace.record("a2", a2, "Коэффициент a2 ...")
+    trace.record("a3", a3, "Коэффициент a3 ...")
+    trace.record("S_cd", S_cd, "Площади сечения сердечника S_cd...")
     return S_cd, a1, a2, a3
 
 def calc_S_yakor(l_c3,h3, D1, D2, d1, d2): #Площадь сечения и длина якоря
@@ -46,8 +46,8 @@ def calc_S_yakor(l_c3,h3, D1, D2, d1, d2): #Площадь сечения и д
     L_y = l_c3
     S_y = 2*np.pi*h3*L_y/(np.log((D1+D2)/(d1+d2)))
 
-    print(f"Площади сечения якоря S_y... {round(S_y,3)}")
-    print(f"Длина якоря L_y... {round(L_y,3)}")
+    trace.record("S_y", S_y, "Площади сечения якоря S_y...")
+    trace.record("L_y", L_y, "Длина якоря L_y...")
     return S_y,L_y
 
 def calc_L_S_magnit(L_y,L_cd,S_cd,S_y): #Длина и площадь магнитопровода
@@ -55,18 +55,18 @@ def calc_L_S_magnit(L_y,L_cd,S_cd,S_y): #Длина и площадь магни
     L_c = L_cd + L_y
     S_c = L_c/((L_cd/S_cd)+(L_y/S_y))
 
-    print(f"Длина магнитопровода L_c.. {round(L_c,3)}")
-    print(f"Площадь магнитопровода S_c... {round(S_c,3)}")
+    trace.record("L_c", L_c, "Длина магнитопровода L_c..")
+    trace.record("S_c", S_c, "Площадь магнитопровода S_c...")
     return L_c, S_c
 
 def calc_S_ok(D2,d2,h1,K_kp): #Площадь окна катушки
     S_ok = 0.5*(D2-d2)*h1*K_kp
-    print(f"Площади окна катушки S_ok... {round(S_ok,3)}")
+    trace.record("S_ok", S_ok, "Площади окна катушки S_ok...")
     return S_ok
 
 def calc_R_cp(D2,d1): #Средний радиус катушки ВЕЗДЕ РАЗНЫЕ ФОРМУЛЫ
     R_cp = 0.25*(D2-d1)
-    print(f"Среднего радиуса катушки R_cp... {R_cp}")
+    trace.record("R_cp", R_cp, "Среднего радиуса катушки R_cp...", digits=None)
     return R_cp
 
 
@@ -0,0 +1,118 @@
+import numpy as np
+
+from core.trace import calc_mode, replay, CalcTrace, MODE_SILENT
+
+
+class CalcNode:
+    """Узел графа расчета: func(*inputs) -> значение или кортеж значений outputs"""
+
+    def __init__(self, name, func, inputs, outputs):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.records = []  # промежуточные значения последнего расчета узла
+
+
+class CalcGraph:
+    """Граф зависимостей расчетных величин с пересчетом только изменившегося
+
+    Узлы добавляются в порядке расчета. Входные данные графа - величины,
+    которые не вычисляет ни один узел. После set() при evaluate()
+    пересчитываются только узлы, зависящие от изменившихся величин;
+    если узел получил прежние значения, дальше изменение не распространяется.
+    """
+
+    def __init__(self):
+        self.nodes = []
+        self.values = {}
+        self._producers = {}   # величина -> узел
+        self._consumers = {}   # величина -> узлы, использующие ее
+        self._dirty = set()
+        self._inputs = []
+        self.recomputed = []   # имена узлов, пересчитанных последним evaluate()
+
+    def add(self, name, func, inputs, outputs=None):
+        outputs = tuple(outputs or (name,))
+        for output in outputs:
+            if output in self._producers:
+                raise ValueError(f"Величина {output} уже вычисляется узлом {self._producers[output].name}")
+            if output in self._consumers:
+                raise ValueError(f"Величина {output} используется раньше, чем вычисляется")
+        node = CalcNode(name, func, inputs, outputs)
+        self.nodes.append(node)
+        for output in outputs:
+            self._producers[output] = node
+        for value in node.inputs:
+            self._consumers.setdefault(value, []).append(node)
+            if value not in self._producers and value not in self._inputs:
+                self._inputs.append(value)
+        self._dirty.add(node.name)
+        return node
+
+    @property
+    def inputs(self):
+        """Входные величины графа"""
+        return list(self._inputs)
+
+    def set(self, **values):
+        """Задание входных величин; возвращает имена изменившихся"""
+        changed = []
+        for name, value in values.items():
+            if name in self._producers:
+                raise ValueError(f"Величина {name} вычисляется и не может быть задана")
+            if name in self.values and _same(self.values[name], value):
+                continue
+            self.values[name] = value
+            changed.append(name)
+            self._dirty.update(node.name for node in self._consumers.get(name, ()))
+        return changed
+
+    def invalidate(self):
+        """Полный пересчет при следующем evaluate()"""
+        self._dirty.update(node.name for node in self.nodes)
+
+    def evaluate(self):
+        """Пересчет изменившихся узлов; возвращает все вычисленные величины
+
+        Промежуточные значения узлов сохраняются и выводятся (в журнал и в
+        режиме печати - в stdout) в полном порядке расчета, как при расчете
+        с нуля.
+        """
+        missing = [name for name in self._inputs if name not in self.values]
+        if missing:
+            raise KeyError(f"Не заданы параметры: {', '.join(missing)}")
+
+        self.recomputed = []
+        for node in self.nodes:
+            if node.name in self._dirty:
+                self._compute(node)
+            replay(node.records)
+
+        return {output: self.values[output] for node in self.nodes for output in node.outputs}
+
+    def _compute(self, node):
+        log = CalcTrace()
+        with calc_mode(MODE_SILENT, log):
+            result = node.func(*(self.values[name] for name in node.inputs))
+        if len(node.outputs) == 1:
+            result = (result,)
+
+        node.records = list(log)
+        self._dirty.discard(node.name)
+        self.recomputed.append(node.name)
+
+        for output, value in zip(node.outputs, result):
+            if output in self.values and _same(self.values[output], value):
+                continue
+            self.values[output] = value
+            self._dirty.update(consumer.name for consumer in self._consumers.get(output, ()))
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (a != a and b != b)
+    try:
+        return bool(np.array_equal(a, b, equal_nan=True))
+    except TypeError:
+        return a is b
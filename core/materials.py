@@ -0,0 +1,87 @@
+import csv
+
+import numpy as np
+
+
+MU_0 = 4 * np.pi * 1e-7
+
+# Типовые (ориентировочные) кривые намагничивания: H, А/м -> B, Тл
+MATERIALS = {
+    "Сталь 10": (
+        (0, 100, 200, 300, 400, 500, 700, 1000, 1500, 2000, 3000, 5000, 10000, 20000, 50000, 100000),
+        (0, 0.30, 0.70, 0.95, 1.10, 1.20, 1.33, 1.43, 1.53, 1.60, 1.68, 1.78, 1.90, 2.02, 2.15, 2.25),
+    ),
+    "Сталь 2013": (
+        (0, 20, 40, 60, 100, 150, 200, 300, 500, 1000, 2500, 5000, 10000, 30000, 100000),
+        (0, 0.20, 0.60, 0.90, 1.15, 1.25, 1.32, 1.40, 1.48, 1.58, 1.70, 1.78, 1.87, 2.00, 2.15),
+    ),
+    "Пермаллой 79НМ": (
+        (0, 0.5, 1, 2, 4, 8, 16, 40, 100, 1000, 10000),
+        (0, 0.10, 0.25, 0.45, 0.62, 0.70, 0.74, 0.77, 0.78, 0.80, 0.82),
+    ),
+}
+
+
+# Удельное электрическое сопротивление материалов, Ом·м
+RESISTIVITY = {
+    "Сталь 10": 1.4e-7,
+    "Сталь 2013": 4.0e-7,
+    "Пермаллой 79НМ": 5.5e-7,
+}
+
+
+class BHCurve:
+    """Кривая намагничивания B(H) с таблицей поиска mu_r(B)
+
+    Относительная проницаемость mu_r = B/(mu_0*H) табулируется один раз на
+    равномерной сетке по B (points узлов), поэтому интерполяция сводится к
+    арифметике индексов без поиска и работает для массивов любой формы.
+    Выше последней точки кривой сталь считается насыщенной: dB/dH = mu_0.
+    """
+
+    def __init__(self, H, B, points=4096, name=""):
+        H = np.asarray(H, dtype=float)
+        B = np.asarray(B, dtype=float)
+        if H[0] != 0 or B[0] != 0 or np.any(np.diff(H) <= 0) or np.any(np.diff(B) <= 0):
+            raise ValueError("Кривая B(H) должна начинаться с (0, 0) и монотонно возрастать")
+        self.H, self.B, self.name = H, B, name
+        self.B_max, self.H_max = B[-1], H[-1]
+
+        self.step = self.B_max / (points - 1)
+        grid = np.linspace(0, self.B_max, points)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mu = grid / (MU_0 * np.interp(grid, B, H))
+        mu[0] = B[1] / (MU_0 * H[1])  # начальная проницаемость
+        self.table = mu
+
+    @classmethod
+    def from_name(cls, name, points=4096):
+        H, B = MATERIALS[name]
+        return cls(H, B, points, name)
+
+    @classmethod
+    def from_csv(cls, path, points=4096):
+        """Кривая из файла CSV со столбцами H (А/м) и B (Тл)"""
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [(float(row["H"]), float(row["B"])) for row in csv.DictReader(f)]
+        H, B = zip(*rows)
+        return cls(H, B, points, path)
+
+    @property
+    def mu_initial(self):
+        return float(self.table[0])
+
+    def mu_r(self, B):
+        """Относительная проницаемость при индукции B, Тл (массив)"""
+        B = np.abs(np.asarray(B, dtype=float))
+        position = B / self.step
+        i = np.minimum(position.astype(np.int64), len(self.table) - 2)
+        fraction = position - i
+        mu = self.table[i] * (1 - fraction) + self.table[i + 1] * fraction
+        # Насыщение: H = H_max + (B - B_max)/mu_0
+        saturated = B / (MU_0 * self.H_max + (B - self.B_max))
+        return np.where(B > self.B_max, saturated, mu)
+
+    def field(self, B):
+        """Напряженность H, А/м, при индукции B, Тл"""
+        return np.asarray(B) / (MU_0 * self.mu_r(B))
@@ -0,0 +1,112 @@
+import sys
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# Режимы вывода промежуточных значений расчета
+MODE_PRINT = "print"    # печать каждого шага в stdout
+MODE_SILENT = "silent"  # расчет без ввода-вывода
+MODES = (MODE_PRINT, MODE_SILENT)
+
+_default_mode = MODE_PRINT
+_local = threading.local()
+
+
+class CalcTrace:
+    """Журнал промежуточных значений расчета"""
+
+    def __init__(self):
+        self.records = []  # (имя, значение, подпись, множитель, знаков)
+
+    def add(self, name, value, label, scale=1, digits=3):
+        self.records.append((name, value, label, scale, digits))
+
+    def values(self):
+        """Последние значения по именам величин"""
+        return {name: value for name, value, *_ in self.records if name is not None}
+
+    def lines(self):
+        return [format_record(label, value, scale, digits)
+                for _, value, label, scale, digits in self.records]
+
+    def dump(self, file=None):
+        """Вывод журнала в виде пошагового расчета"""
+        file = file or sys.stdout
+        for line in self.lines():
+            print(line, file=file)
+
+    def clear(self):
+        self.records.clear()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def format_record(label, value, scale=1, digits=3):
+    if value is None:
+        return label
+    if scale != 1:
+        value = value * scale
+    if digits is not None:
+        value = np.round(value, digits)
+    return f"{label} {value}"
+
+
+def set_mode(mode):
+    """Глобальный режим вывода для всех последующих расчетов"""
+    global _default_mode
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим расчета: {mode}")
+    _default_mode = mode
+
+
+def get_mode():
+    return getattr(_local, "mode", None) or _default_mode
+
+
+def get_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def calc_mode(mode=None, trace=None):
+    """Режим вывода и журнал для расчетов внутри блока with (в текущем потоке)"""
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"Неизвестный режим расчета: {mode}")
+
+    previous = (getattr(_local, "mode", None), getattr(_local, "trace", None))
+    if mode is not None:
+        _local.mode = mode
+    if trace is not None:
+        _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.mode, _local.trace = previous
+
+
+def record(name, value, label, scale=1, digits=3):
+    """Промежуточное значение: в журнал (если задан) и в stdout в режиме печати"""
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace.add(name, value, label, scale, digits)
+    if (getattr(_local, "mode", None) or _default_mode) == MODE_PRINT:
+        print(format_record(label, value, scale, digits))
+
+
+def note(label):
+    """Текстовое сообщение хода расчета"""
+    record(None, None, label)
+
+
+def replay(records):
+    """Повторный вывод записей журнала (например, взятых из кэша)"""
+    if get_trace() is None and get_mode() == MODE_SILENT:
+        return
+    for name, value, label, scale, digits in records:
+        record(name, value, label, scale, digits)
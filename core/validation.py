@@ -11,4 +11,47 @@ def valid_start_values(d_zT_min,eta_max,l0,xv):
     else:
         print("Начальный воздушный зазор меньше максимума диапозона измерений ")
         stop = 1
-    return stop
\ No newline at end of file
+    return stop
+
+# Наименьший запас по каждому условию геометрии, мм: условия ZIPWindow,
+# PIPWindow и SIPWindow._validate_geometry строгие (D1 > D2, l0 > xv ...)
+MARGIN = 1e-3
+
+def shortfall(larger, smaller): #Нарушение строгого условия larger > smaller (с запасом MARGIN)
+    return np.maximum(0, np.subtract(smaller, larger) + MARGIN)
+
+def geometry_violation(D1, D2, d1, d2, h1, h2, h3, l0, xv): #Суммарное нарушение условий ZIPWindow._validate_geometry
+    # 0 - геометрия допустима; работает и для массивов вариантов
+    violation = 0
+    for value in (D1, D2, d1, d2, h1, h2, h3, l0):
+        violation = violation + shortfall(value, 0)
+
+    violation = violation + shortfall(D1, D2)
+    violation = violation + shortfall(D2, d2)
+    violation = violation + shortfall(d2, d1)
+    violation = violation + shortfall(h2, h1)
+    violation = violation + shortfall(l0, xv)
+    return violation
+
+def pip_geometry_violation(D1, D2, d1, d2, h2, h3, l0, t_B, xv): #Суммарное нарушение условий PIPWindow._validate_geometry
+    # d = d1 + 2*t_B - диаметр отверстия сердечника
+    violation = 0
+    for value in (D1, D2, d1, d2, h2, h3, l0, t_B):
+        violation = violation + shortfall(value, 0)
+
+    d = np.add(d1, np.multiply(2, t_B))
+    violation = violation + shortfall(D1, D2)
+    violation = violation + shortfall(D2, d)
+    violation = violation + shortfall(d1, d2)
+    violation = violation + shortfall(h3, h2)
+    violation = violation + shortfall(l0, xv)
+    return violation
+
+def sip_geometry_violation(R, r, l_k, l_c, t_B, xv): #Суммарное нарушение условий SIPWindow._validate_geometry
+    violation = 0
+    for value in (R, r, l_k, l_c, t_B):
+        violation = violation + shortfall(value, 0)
+
+    violation = violation + shortfall(R, np.add(r, t_B))
+    violation = violation + shortfall(np.divide(l_k, 2), xv)
+    return violation
@@ -49,12 +49,11 @@ def main():
             #sensor = ZIPSensor(D1, D2, d1, d2, h1, h2, h3, l0, z0, d_n, xv, d_zT_min, eta_max, x, K_kp, p_n, mu_0, mu_c)
         elif selected_sensor == "ДПИП":
             print("Создаем модель датчика ПИП...")
-            result_window = SIPWindow(input_app, params)
+            result_window = PIPWindow(input_app, params)
             #sensor = PIPSensor(D1, D2, d1, d2, h1, h2, h3, l0, z0, d_n, xv, d_zT_min, eta_max, x, K_kp, p_n, mu_0, mu_c)
         else:
-            print("Выбран ДСИП - функционал в разработке")
-            result_window = PIPWindow(input_app, params)
-            return
+            print("Создаем модель датчика СИП...")
+            result_window = SIPWindow(input_app, params)
 
         # Запуск расчета
         print("Запускаем расчет параметров...")
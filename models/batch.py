@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def table_fields(table):
+    """Имена столбцов таблицы параметров"""
+    if table is None:
+        return ()
+    names = getattr(getattr(table, "dtype", None), "names", None)
+    if names:
+        return tuple(names)
+    return tuple(table.keys())
+
+
+def table_columns(table, names, defaults=None, **common):
+    """Столбцы параметров в виде согласованных по форме массивов numpy
+
+    table - словарь массивов, структурированный массив numpy или таблица
+    с доступом к столбцам по имени (например, pandas.DataFrame).
+    Значения, переданные через common, имеют приоритет над столбцами таблицы,
+    значения из defaults используются для отсутствующих столбцов.
+    """
+    fields = table_fields(table)
+    defaults = defaults or {}
+
+    columns = {}
+    missing = []
+    for name in names:
+        if name in common:
+            value = common[name]
+        elif name in fields:
+            value = table[name]
+        elif name in defaults:
+            value = defaults[name]
+        else:
+            missing.append(name)
+            continue
+        columns[name] = np.asarray(value, dtype=float)
+
+    if missing:
+        raise KeyError(f"Не заданы параметры: {', '.join(missing)}")
+
+    arrays = np.broadcast_arrays(*columns.values())
+    return dict(zip(columns, arrays))
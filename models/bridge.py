@@ -0,0 +1,62 @@
+import numpy as np
+
+from core import bridge
+from core.trace import calc_mode, MODE_SILENT
+from models import sensor_zip, sensor_pip, sensor_sip
+from models.batch import table_columns
+
+
+# Модели датчиков: PARAMETERS, DEFAULTS, calc_batch и calc_characteristic
+SENSORS = {
+    "ДЗИП": sensor_zip,
+    "ДПИП": sensor_pip,
+    "ДСИП": sensor_sip,
+}
+
+# Параметры измерительной схемы: напряжение питания U, k = R/z0, sigma = R_N/z0
+PARAMETERS = ("U", "k", "sigma")
+
+# Напряжение питания по умолчанию, В
+DEFAULT_U = 1.0
+
+
+def calc_circuit(results, params, circuit, model, scheme, points=41):
+    """Расчет схемы включения по результатам расчета датчика
+
+    circuit - словарь U, k, sigma; points - число точек характеристики
+    (в пакетном расчете массив имеет форму (вариантов, points)).
+    """
+    characteristic = model.calc_characteristic(results, params, points)
+    output = bridge.calc_output(circuit["U"], characteristic["x"], characteristic["z_x1"],
+                                characteristic["z_x2"], characteristic["z_0"],
+                                circuit["k"], circuit["sigma"], scheme)
+    gamma_s = bridge.calc_scheme_gamma(results["d_z"], circuit["k"], circuit["sigma"], scheme, points)
+    I_k = bridge.calc_I_k(circuit["U"], params["z0"], circuit["k"], scheme)
+    Delta_T = bridge.calc_Delta_T(I_k, params["d_n"])
+    P_r = bridge.calc_P_r(I_k, results["R_k"])
+
+    return {
+        'U_0': output['U_0'], 'S_U': output['S_U'], 'gamma_b': output['gamma_b'],
+        'gamma_s': gamma_s, 'I_k': I_k, 'Delta_T': Delta_T, 'P_r': P_r
+    }
+
+
+def calc_batch(sensor, table=None, scheme="ПРСМ", points=41, mode=MODE_SILENT, trace=None, **common):
+    """Пакетный расчет датчика вместе со схемой включения
+
+    Параметры датчика - как в models.sensor_*.calc_batch, параметры схемы -
+    PARAMETERS (k и sigma по умолчанию - оптимальные для схемы,
+    bridge.OPTIMAL_LOAD). Результат - результаты датчика и calc_circuit.
+    """
+    if scheme not in bridge.SCHEMES:
+        raise ValueError(f"Неизвестная схема включения: {scheme}")
+    model = SENSORS[sensor]
+    k, sigma = bridge.OPTIMAL_LOAD[scheme]
+
+    params = table_columns(table, model.PARAMETERS, model.DEFAULTS, **common)
+    circuit = table_columns(table, PARAMETERS, {"U": DEFAULT_U, "k": k, "sigma": sigma}, **common)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        with calc_mode(mode, trace):
+            results = model.calc_batch(params, mode=None)
+            results.update(calc_circuit(results, params, circuit, model, scheme, points))
+    return results
@@ -0,0 +1,183 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+from core.trace import calc_mode, get_mode, get_trace, replay, CalcTrace, MODE_SILENT
+
+
+# Объем кэша этапа расчета по умолчанию, байт: записи пакетных расчетов -
+# массивы по всем вариантам, поэтому число записей само по себе не ограничивает память
+STAGE_CACHE_BYTES = 64 * 2 ** 20
+
+CacheInfo = namedtuple("CacheInfo", "hits misses maxsize currsize maxbytes currbytes")
+
+# Флаг расчета без кэша этапов (в текущем потоке, см. uncached)
+_local = threading.local()
+
+
+@contextmanager
+def uncached():
+    """Расчет внутри блока with без кэшей этапов (в текущем потоке)
+
+    Для потоков заведомо неповторяющихся вариантов (Монте-Карло, выборки
+    Соболя): их записи в кэше только занимали бы память.
+    """
+    previous = getattr(_local, "disabled", False)
+    _local.disabled = True
+    try:
+        yield
+    finally:
+        _local.disabled = previous
+
+
+class LRUCache:
+    """Ограниченный кэш с вытеснением давно не использованных значений
+
+    maxsize=0 отключает кэширование. maxbytes - ограничение суммарного
+    объема значений (размер значения передается в put); значение больше
+    maxbytes не сохраняется. Статистика попаданий - info().
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.currbytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size=0):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._remove(key)
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self.currbytes += size
+            self._evict()
+
+    def clear(self):
+        """Очистка кэша и статистики"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.currbytes = 0
+            self.hits = self.misses = 0
+
+    def resize(self, maxsize, maxbytes=None):
+        with self._lock:
+            self.maxsize = maxsize
+            self.maxbytes = maxbytes
+            self._evict()
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data), self.maxbytes, self.currbytes)
+
+    def _remove(self, key):
+        if key in self._data:
+            del self._data[key]
+            self.currbytes -= self._sizes.pop(key)
+
+    def _evict(self):
+        while self._data and (len(self._data) > max(self.maxsize, 0) or
+                              (self.maxbytes is not None and self.currbytes > self.maxbytes)):
+            key, _ = self._data.popitem(last=False)
+            self.currbytes -= self._sizes.pop(key)
+
+    def __len__(self):
+        return len(self._data)
+
+
+def array_key(*values):
+    """Ключ кэша по значениям параметров (чисел или массивов numpy)
+
+    Скаляры входят в ключ как есть, массивы - формой и хэшем содержимого,
+    чтобы ключ пакетного расчета не занимал память наравне с самими данными.
+    """
+    key = []
+    for value in values:
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 0:
+            key.append(float(value))
+        else:
+            digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).digest()
+            key.append((value.shape, digest))
+    return tuple(key)
+
+
+def cached_stage(cache, func, values):
+    """Этап расчета func(*values) -> dict через кэш cache
+
+    Промежуточные значения этапа сохраняются вместе с результатом
+    и выводятся повторно при попадании в кэш, так что журнал расчета
+    не зависит от состояния кэша. В режиме без вывода и журнала
+    промежуточные значения не собираются; если затем они понадобятся,
+    этап рассчитывается заново. Если в пакете все варианты имеют
+    одинаковые значения параметра, этап получает одно значение, а
+    результаты приводятся к форме пакета. Размер записи в кэше - объем
+    результатов и промежуточных значений, байт.
+    """
+    shape = np.broadcast_shapes(*(np.shape(v) for v in values))
+    values = [_collapse(v) for v in values]
+    if getattr(_local, "disabled", False):
+        entry = (func(*values), None)
+    else:
+        entry = _cached(cache, func, values)
+
+    result, records = entry
+    if records is not None:
+        replay(records)
+    if shape:
+        return {name: np.broadcast_to(value, shape) for name, value in result.items()}
+    return dict(result)
+
+
+def _cached(cache, func, values):
+    key = array_key(*values)
+    silent = get_trace() is None and get_mode() == MODE_SILENT
+    entry = cache.get(key)
+    if entry is None or (entry[1] is None and not silent):
+        if silent:
+            with calc_mode(MODE_SILENT):
+                result = func(*values)
+            entry = (result, None)
+        else:
+            log = CalcTrace()
+            with calc_mode(MODE_SILENT, log):
+                result = func(*values)
+            entry = (result, list(log))
+        cache.put(key, entry, _nbytes(result) + sum(_nbytes(record[1]) for record in entry[1] or ()))
+    return entry
+
+
+def _nbytes(value):
+    """Объем массивов numpy в значении (словаре или числе), байт"""
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    return np.asarray(value).nbytes if value is not None else 0
+
+
+def _collapse(value):
+    """Массив из одинаковых значений -> одно значение"""
+    if np.ndim(value) == 0:
+        return value
+    value = np.asarray(value, dtype=float)
+    if value.size and np.all(value == value.flat[0]):
+        return value.flat[0]
+    return value
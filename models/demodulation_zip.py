@@ -0,0 +1,135 @@
+import time
+
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+from core import bridge, electrical_ZIP
+
+
+# Отсчетов в одном блоке обработки
+BLOCK = 65536
+
+# Порядок фильтра нижних частот (Баттерворт)
+ORDER = 4
+
+
+class Demodulator:
+    """Синтез выходного сигнала мостовой схемы и синхронное детектирование
+
+    Сопротивления половин ДЗИП - комплексные: Z = z_0*(eta + j*sqrt(1 - eta²)/(1 -+ k_x*x)),
+    модуль совпадает с calc_Z_x. Мост питается напряжением U*sin(2*pi*f*t),
+    выходной сигнал - U*|T(x)|*sin(2*pi*f*t + arg T(x)), T - calc_transfer
+    схемы scheme. Опорный сигнал 2*sin(2*pi*f*t + phi) синфазен с
+    приращением T при x = 0, после умножения сигнал проходит фильтр
+    нижних частот sos; перемещение восстанавливается по наилучшей прямой
+    градуировочной характеристики на [-xv, xv].
+
+    Блоки обрабатываются по порядку: состояние фильтра zi и номер первого
+    отсчета переходят от блока к блоку, поэтому результат не зависит от
+    размера блока.
+    """
+
+    def __init__(self, results, params, fs, scheme="ПРСМ", U=1.0, f=None, k=None, sigma=None,
+                 cutoff=None, order=ORDER, points=41):
+        value = lambda name: float(np.asarray(results[name]))
+        if scheme not in bridge.SCHEMES:
+            raise ValueError(f"Неизвестная схема включения: {scheme}")
+        optimal_k, optimal_sigma = bridge.OPTIMAL_LOAD[scheme]
+        self.scheme = scheme
+        self.k = optimal_k if k is None else k
+        self.sigma = optimal_sigma if sigma is None else sigma
+        self.z_0, self.k_x, self.eta = value("z_0"), value("k_x"), value("eta")
+        self.xv = float(np.asarray(params["xv"]))
+        self.U = U
+        self.f = f or float(electrical_ZIP.f_p_hz(value("f_p")))
+        self.fs = fs
+        self.cutoff = cutoff or self.f / 10
+        if not self.cutoff < fs / 2 or not self.f < fs / 2:
+            raise ValueError("Частота дискретизации должна быть больше удвоенной частоты питания")
+
+        slope = self.transfer(np.array([1e-6 * self.xv])) - self.transfer(np.array([-1e-6 * self.xv]))
+        self.phi = float(np.angle(slope[0]))
+        self.sos = butter(order, self.cutoff, fs=fs, output="sos")
+
+        # Градуировка: синфазная составляющая на [-xv, xv] и ее наилучшая прямая
+        psi = np.linspace(-1, 1, points)
+        y = self.level(psi * self.xv)
+        self.A, self.B, self.E = (float(v) for v in bridge.calc_best_line(psi, y))
+        self.reset()
+
+    def reset(self):
+        """Начальное состояние: установившийся режим фильтра при x = 0"""
+        self.zi = sosfilt_zi(self.sos) * self.level(np.zeros(1))[0]
+        self.position = 0
+
+    def impedance(self, x):
+        ratio = np.sqrt(1 - self.eta ** 2)
+        return (self.z_0 * (self.eta + 1j * ratio / (1 - self.k_x * x)),
+                self.z_0 * (self.eta + 1j * ratio / (1 + self.k_x * x)))
+
+    def transfer(self, x):
+        return bridge.calc_transfer(*self.impedance(x), self.z_0, self.k, self.sigma, self.scheme)
+
+    def level(self, x):
+        """Уровень на выходе детектора при неподвижном якоре: U*Re(T*exp(-j*phi))"""
+        return self.U * np.real(self.transfer(x) * np.exp(-1j * self.phi))
+
+    def phase(self, start, count):
+        return 2 * np.pi * self.f * (np.arange(start, start + count) / self.fs)
+
+    def signal(self, x, start=0):
+        """Выходной сигнал моста для отсчетов x, мм, начиная с отсчета start"""
+        T = self.U * self.transfer(x)
+        return np.imag(T * np.exp(1j * self.phase(start, len(x))))
+
+    def process(self, u):
+        """Восстановленное перемещение, мм, по следующему блоку сигнала u
+
+        Буфер u используется для промежуточных значений и изменяется.
+        """
+        phase = self.phase(self.position, len(u))
+        phase += self.phi
+        np.sin(phase, out=phase)
+        u *= phase
+        u *= 2
+        y, self.zi = sosfilt(self.sos, u, zi=self.zi)
+        self.position += len(u)
+        y -= self.A
+        y *= self.xv / self.B
+        return y
+
+
+def calc_demodulation(results, params, x, fs, block=BLOCK, noise=0.0, seed=None, **options):
+    """Погрешность восстановления перемещения после синхронного детектора
+
+    x - отсчеты перемещения якоря, мм, с частотой дискретизации fs, Гц;
+    noise - СКО аддитивного шума на выходе моста, В. Остальные аргументы -
+    как в Demodulator. Сигнал синтезируется и обрабатывается блоками по
+    block отсчетов.
+
+    error - погрешность относительно x, пропущенного через тот же фильтр
+    (без запаздывания фильтра), lag_error - относительно самого x; gamma -
+    наибольшая |error|/xv после установления фильтра (settle отсчетов).
+    """
+    start = time.perf_counter()
+    demodulator = Demodulator(results, params, fs, **options)
+    x = np.asarray(x, dtype=float)
+    rng = np.random.default_rng(seed)
+    x_hat = np.empty_like(x)
+    for first in range(0, len(x), block):
+        u = demodulator.signal(x[first:first + block], first)
+        if noise:
+            u += rng.normal(0.0, noise, len(u))
+        x_hat[first:first + block] = demodulator.process(u)
+
+    zi = sosfilt_zi(demodulator.sos) * x[0]
+    x_filtered = sosfilt(demodulator.sos, x, zi=zi)[0]
+    error = x_hat - x_filtered
+    settle = min(len(x) - 1, int(np.ceil(5 * fs / demodulator.cutoff)))
+    return {
+        'x_hat': x_hat, 'x_filtered': x_filtered, 'error': error, 'lag_error': x_hat - x,
+        'gamma': float(np.max(np.abs(error[settle:])) / demodulator.xv),
+        'gamma_b': demodulator.E / (2 * abs(demodulator.B)), 'settle': settle,
+        'f': demodulator.f, 'cutoff': demodulator.cutoff, 'phi': demodulator.phi,
+        'rate': len(x) / (time.perf_counter() - start),
+    }
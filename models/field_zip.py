@@ -0,0 +1,258 @@
+import time
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import splu
+
+from core.materials import BHCurve
+from models.frequency_zip import DEFAULT_MATERIAL, MU_R_MAX
+from models.sensor_zip import calc_batch, DEFAULTS
+
+
+# Размер расчетной области: расстояние до границы (psi = 0) в габаритах датчика
+FAR = 4.0
+
+# Рост ячеек от датчика к границе области
+GROWTH = 1.3
+
+
+def interval(length, step, cells=None):
+    """Доли [0, 1] узлов равномерного отрезка: ячейки не больше step"""
+    cells = cells or max(2, int(np.ceil(length / step)))
+    return np.linspace(0.0, 1.0, cells + 1)
+
+
+def graded(length, step, growth=GROWTH, reverse=False):
+    """Доли узлов отрезка с ячейками, растущими от step в growth раз"""
+    sizes = [step]
+    while sum(sizes) < length:
+        sizes.append(sizes[-1] * growth)
+    t = np.concatenate([[0.0], np.cumsum(sizes)]) / sum(sizes)
+    return 1 - t[::-1] if reverse else t
+
+
+class ZIPField:
+    """Осесимметричный численный расчет магнитного поля половины ДЗИП
+
+    Неизвестная - функция потока psi = r*A_phi в узлах прямоугольной сетки
+    (r, z), уравнение -div(nu/r grad psi) = J дискретизировано методом
+    конечных объемов; на оси и на границе области psi = 0. Ось z направлена
+    от якоря к сердечнику, торец сердечника - z = 0. Сердечник с отверстием
+    d1 и окном катушки (d2..D2, высота h1, открыто к зазору), якорь - диск
+    диаметром D1 толщиной h3.
+
+    Число ячеек на каждом участке не зависит от перемещения якоря x: якорь
+    и область под ним смещаются целиком, меняется только высота ячеек
+    зазора. Сетка, материалы и разложение неизменной части матрицы (factor)
+    общие для всех x, поэтому характеристика L(x) стоит немногим дороже
+    одного решения. Размеры - в мм, как в ZIPSensor.
+    """
+
+    def __init__(self, D1, D2, d1, d2, h1, h2, h3, l0, w, mu_r, mu_0=DEFAULTS["mu_0"],
+                 step=None, gap_cells=2, far=FAR):
+        self.D1, self.D2, self.d1, self.d2 = D1, D2, d1, d2
+        self.h1, self.h2, self.h3, self.l0 = h1, h2, h3, l0
+        self.w = w
+        self.mu_0 = mu_0
+        step = step or D1 / 80
+        size = max(D1, h2 + l0 + h3)
+
+        # Радиальные узлы (не зависят от x)
+        edges = [0.0, d1 / 2, d2 / 2, D2 / 2, D1 / 2]
+        r = [0.0]
+        for a, b in zip(edges[:-1], edges[1:]):
+            r.extend(a + (b - a) * interval(b - a, step)[1:])
+        r.extend(D1 / 2 + far * size * graded(far * size, step)[1:])
+        self.r = np.array(r) * 1e-3
+
+        # Осевые участки: доли узлов; координаты зависят от x (self.z_nodes)
+        self._far = far * size
+        self._t_bottom = graded(self._far, step, reverse=True)
+        self._t_anchor = interval(h3, step)
+        self._t_gap = interval(l0, step, gap_cells)
+        self._t_coil = interval(h1, step)
+        self._t_core = interval(h2 - h1, step) if h2 > h1 else np.zeros(1)
+        self._t_top = graded(self._far, step)
+
+        # Материалы ячеек по центрам при x = 0
+        z = self.z_nodes(0.0) * 1e3
+        rc = (self.r[1:] + self.r[:-1]) / 2 * 1e3
+        zc = (z[1:] + z[:-1]) / 2
+        R, Z = np.meshgrid(rc, zc, indexing="ij")
+        anchor = (R < D1 / 2) & (Z > -l0 - h3) & (Z < -l0)
+        core = (R > d1 / 2) & (R < D1 / 2) & (Z > 0) & (Z < h2)
+        self.coil = (R > d2 / 2) & (R < D2 / 2) & (Z > 0) & (Z < h1)
+        core &= ~self.coil
+        self.nu = np.where(anchor | core, 1 / (mu_0 * mu_r), 1 / mu_0)
+
+        self._pattern()
+        self.lu = None
+
+    def z_nodes(self, x):
+        """Осевые координаты узлов, м, при перемещении якоря x к сердечнику, мм"""
+        gap = self.l0 - x
+        top = -gap
+        bottom = top - self.h3
+        # Якорь и область под ним смещаются целиком: меняются только ячейки зазора
+        parts = [
+            bottom - self._far + self._far * self._t_bottom,
+            bottom + self.h3 * self._t_anchor[1:],
+            top + gap * self._t_gap[1:],
+            self.h1 * self._t_coil[1:],
+            self.h1 + (self.h2 - self.h1) * self._t_core[1:],
+            self.h2 + self._far * self._t_top[1:],
+        ]
+        return np.concatenate(parts) * 1e-3
+
+    def _pattern(self):
+        """Ребра сетки и номера неизвестных (внутренние узлы)"""
+        nr, nz = self.nu.shape
+        index = np.arange((nr + 1) * (nz + 1)).reshape(nr + 1, nz + 1)
+        free = np.zeros((nr + 1, nz + 1), dtype=bool)
+        free[1:-1, 1:-1] = True
+        self.unknown = -np.ones(free.shape, dtype=np.int64)
+        self.unknown[free] = np.arange(np.count_nonzero(free))
+        self.size = int(np.count_nonzero(free))
+
+        # Ребра вдоль r: (i, j) - (i + 1, j); вдоль z: (i, j) - (i, j + 1)
+        a = np.concatenate([index[:-1, :].ravel(), index[:, :-1].ravel()])
+        b = np.concatenate([index[1:, :].ravel(), index[:, 1:].ravel()])
+        a, b = self.unknown.ravel()[a], self.unknown.ravel()[b]
+        self._rows = np.concatenate([a, b, a, b])
+        self._cols = np.concatenate([a, b, b, a])
+        self._keep = (self._rows >= 0) & (self._cols >= 0)
+
+        # Ребра, коэффициенты которых зависят от x (ячейки зазора), и их узлы
+        c0 = self.conductances(self.z_nodes(0.0))
+        changing = ~np.isclose(self.conductances(self.z_nodes(self.l0 / 2)), c0, rtol=1e-12, atol=0)
+        nodes = np.concatenate([a[changing], b[changing]])
+        gap = np.zeros(self.size, dtype=bool)
+        gap[nodes[nodes >= 0]] = True
+        self.gap_nodes = np.flatnonzero(gap)
+        self.rest_nodes = np.flatnonzero(~gap)
+
+    def conductances(self, z):
+        """Коэффициенты ребер: сначала вдоль r, затем вдоль z"""
+        r = self.r
+        dr, dz = np.diff(r), np.diff(z)
+        nu = np.pad(self.nu, 1)  # ячейки вне области - с nu = 0
+        rm = (r[1:] + r[:-1]) / 2
+
+        # Ребро вдоль r: половины ячеек снизу и сверху
+        h_low = np.concatenate([[0.0], dz]) / 2
+        h_high = np.concatenate([dz, [0.0]]) / 2
+        c_r = (nu[1:-1, :-1] * h_low + nu[1:-1, 1:] * h_high) / (rm * dr)[:, None]
+
+        # Ребро вдоль z: половины ячеек слева и справа (1/r - в центре половины)
+        w_left = np.concatenate([[0.0], dr / 2 / (r[1:] - dr / 4)])
+        w_right = np.concatenate([dr / 2 / (r[:-1] + dr / 4), [0.0]])
+        c_z = (nu[:-1, 1:-1] * w_left[:, None] + nu[1:, 1:-1] * w_right[:, None]) / dz
+        return np.concatenate([c_r.ravel(), c_z.ravel()])
+
+    def matrix(self, x):
+        """Матрица системы (CSC) при перемещении якоря x, мм"""
+        c = self.conductances(self.z_nodes(x))
+        values = np.concatenate([c, c, -c, -c])
+        return coo_matrix((values[self._keep], (self._rows[self._keep], self._cols[self._keep])),
+                          shape=(self.size, self.size)).tocsc()
+
+    def source(self, x, current=1.0):
+        """Правая часть: ток катушки, распределенный по окну, в узлах"""
+        z = self.z_nodes(x)
+        area = np.diff(self.r)[:, None] * np.diff(z)[None, :] * self.coil
+        J = self.w * current / area.sum()
+        nodes = np.zeros((len(self.r), len(z)))
+        for di in (0, 1):
+            for dj in (0, 1):
+                nodes[di:di + area.shape[0], dj:dj + area.shape[1]] += J * area / 4
+        return nodes[self.unknown >= 0]
+
+    def factor(self):
+        """Разложение неизменной части системы (выполняется один раз)
+
+        Неизвестные делятся на узлы ребер зазора G, коэффициенты которых
+        зависят от x, и остальные R. Блоки K_RR и K_RG от x не зависят:
+        K_RR раскладывается (splu), дополнение Шура K_GR K_RR^-1 K_RG
+        вычисляется один раз, после чего каждое x - плотная система
+        размером |G| (несколько сотен узлов вместо всей сетки).
+        """
+        K = self.matrix(0.0)
+        b = self.source(0.0)
+        G, R = self.gap_nodes, self.rest_nodes
+        self.lu = splu(K[R][:, R].tocsc())
+        K_RG = K[R][:, G]
+        self._Z = self.lu.solve(K_RG.toarray())
+        self._S = (K_RG.T @ self._Z)
+        self._y = self.lu.solve(b[R])
+        self._b_G = b[G] - K_RG.T @ self._y
+        self._yb = float(self._y @ b[R])
+
+    def solve(self, x):
+        """Функция потока psi во всех неизвестных при перемещении x, мм"""
+        psi_G = self._solve_gap(x)
+        psi = np.empty(self.size)
+        psi[self.gap_nodes] = psi_G
+        psi[self.rest_nodes] = self._y - self._Z @ psi_G
+        return psi
+
+    def _solve_gap(self, x):
+        if self.lu is None:
+            self.factor()
+        G = self.gap_nodes
+        K_GG = self.matrix(x)[G][:, G].toarray()
+        return np.linalg.solve(K_GG - self._S, self._b_G)
+
+    def inductance(self, x):
+        """Индуктивность катушки, Гн, при перемещении якоря x, мм
+
+        L = 2*pi*(psi, b) при токе 1 А (энергия поля W = L/2).
+        """
+        psi_G = self._solve_gap(x)
+        return 2 * np.pi * (self._yb + float(psi_G @ self._b_G))
+
+    def curve(self, xs):
+        """Индуктивность L(0) и L(x) для перемещений xs, мм"""
+        return self.inductance(0.0), np.array([self.inductance(x) for x in np.asarray(xs, dtype=float)])
+
+
+def lumped_inductance(results, params, x):
+    """Индуктивность по схеме замещения: w²/(R_mC + R_mb(x)), Гн"""
+    # Магнитные сопротивления ZIPSensor - в единицах 1/(Гн·мм)
+    R_mb = results["R_B0"] * (1 - results["k_B"] * np.asarray(x))
+    return results["w"] ** 2 / ((results["R_mC"] + R_mb) * 1e3)
+
+
+def compare(params, points=21, mu_r=None, step=None, gap_cells=2, far=FAR, material=DEFAULT_MATERIAL):
+    """Сравнение индуктивности L(x) численного расчета поля и схемы замещения
+
+    params - параметры ZIPSensor (один вариант). mu_r - относительная
+    проницаемость стали, по умолчанию - начальная проницаемость (BHCurve)
+    материала material; mu_r больше MU_R_MAX - ошибка (ValueError), как в
+    frequency_zip.calc_impedance. Схема замещения рассчитывается с той же
+    проницаемостью (mu_c = mu_r*mu_0); при mu_r >> 1 сопротивление ее стали
+    ограничено коэффициентом N (calc_R_mC), поэтому L схемы меньше.
+    k_x численного расчета - наклон прямой L(0)/L(x) = 1 - k_x*x, L_rel -
+    относительная характеристика L(x)/L(0) (для схемы замещения равна Z_x/z_0).
+    """
+    mu_r = BHCurve.from_name(material).mu_initial if mu_r is None else mu_r
+    if mu_r > MU_R_MAX:
+        raise ValueError(f"Относительная проницаемость стали больше {MU_R_MAX:g}: задайте mu_r, а не mu_c/mu_0")
+    params = {**DEFAULTS, **params}
+    params["mu_c"] = mu_r * params["mu_0"]
+    results = {name: float(value) for name, value in calc_batch(params).items()}
+
+    start = time.perf_counter()
+    field = ZIPField(*(params[name] for name in ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0")),
+                     results["w"], mu_r, params["mu_0"], step, gap_cells, far)
+    x = params["xv"] * np.linspace(-1, 1, points)
+    L0, L = field.curve(x)
+    elapsed = time.perf_counter() - start
+
+    L_lumped = lumped_inductance(results, params, x)
+    k_x = -np.sum(x * (L0 / L - 1)) / np.sum(x ** 2)
+    return {
+        "x": x, "L": L, "L_lumped": L_lumped, "L_error": L_lumped / L - 1,
+        "k_x": k_x, "k_x_lumped": results["k_x"],
+        "L_rel": L / L0, "L_rel_lumped": 1 / (1 - results["k_x"] * x),
+        "unknowns": field.size, "gap_unknowns": len(field.gap_nodes), "elapsed": elapsed,
+    }
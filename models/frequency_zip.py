@@ -0,0 +1,114 @@
+import numpy as np
+
+from core.materials import BHCurve, RESISTIVITY
+
+
+# Материал магнитопровода по умолчанию (core.materials)
+DEFAULT_MATERIAL = "Сталь 10"
+
+# Наибольшая правдоподобная относительная проницаемость (у пермаллоев - до ~1e6)
+MU_R_MAX = 1e6
+
+
+def calc_mu_eddy(mu_r, rho, f, t, mu_0): #Комплексная проницаемость пластины толщиной t (мм) с вихревыми токами
+    # mu = mu_r*th(u)/u, u = (1 + j)*t/(2*delta), delta = sqrt(2*rho/(omega*mu_0*mu_r))
+    k = np.sqrt(2j * np.pi * f * mu_0 * mu_r / rho)
+    u = k * np.asarray(t) * 1e-3 / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return mu_r * np.where(u == 0, 1.0, np.tanh(u) / np.where(u == 0, 1.0, u))
+
+
+def calc_mu_steel(mu_r, rho, f, results, params, tan_h=0.0): #Эквивалентная комплексная проницаемость стальной части
+    # Вихревые токи - отдельно в сердечнике (наименьшая толщина стенки или
+    # дна) и в якоре (толщина h3); гистерезис - постоянный угол потерь tan_h.
+    # Участки соединены последовательно: L_c/S_c = L_cd/S_cd + L_y/S_y.
+    t_core = np.minimum(np.minimum((params["D1"] - params["D2"]) / 2, (params["d2"] - params["d1"]) / 2),
+                        params["h2"] - params["h1"])
+    mu_hyst = mu_r * (1 - 1j * tan_h)
+    mu_core = calc_mu_eddy(mu_hyst, rho, f, t_core, params["mu_0"])
+    mu_anchor = calc_mu_eddy(mu_hyst, rho, f, params["h3"], params["mu_0"])
+    a_core = results["L_cd"] / results["S_cd"]
+    a_anchor = results["L_y"] / results["S_y"]
+    return (a_core + a_anchor) / (a_core / mu_core + a_anchor / mu_anchor)
+
+
+def calc_impedance(results, params, f, x=None, points=21, material=DEFAULT_MATERIAL, rho=None, tan_h=0.0,
+                   mu_r=None):
+    """Комплексное сопротивление половин ДЗИП Z(x, f) с потерями в стали
+
+    results, params - результаты и параметры расчета ZIPSensor (можно пакет
+    вариантов формы S), f - частоты, Гц (F значений), x - перемещения, мм
+    (по умолчанию points точек на [-xv, xv]). Результаты имеют форму
+    S + (X, F). mu_r - относительная проницаемость стали, rho - удельное
+    сопротивление, Ом·м; по умолчанию - начальная проницаемость (BHCurve)
+    и удельное сопротивление материала material. Параметр mu_c ZIPSensor
+    не используется: mu_c/mu_0 при mu_c = 3000 (~2.4e9) делает магнитное
+    сопротивление стали пренебрежимо малым, и потери в ней не сказываются
+    на Z, поэтому mu_r больше MU_R_MAX - ошибка (ValueError).
+
+    Z = R_k + j*omega*w²/(R_mC(f) + R_mb(x)): R_mC - по формуле calc_R_mC
+    с комплексной проницаемостью calc_mu_steel. Магнитные сопротивления
+    ZIPSensor (1/(Гн·мм)) переводятся в СИ, как в field_zip.lumped_inductance.
+    """
+    col = lambda v: np.asarray(v, dtype=float)[..., None, None]
+    results = {name: col(results[name]) for name in ("L_cd", "S_cd", "L_y", "S_y", "L_c", "S_c", "N",
+                                                      "R_B0", "k_B", "w", "R_k")}
+    params = {name: col(params[name]) for name in ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "mu_0", "xv")}
+    f = np.asarray(f, dtype=float)
+    x = params["xv"] * np.linspace(-1, 1, points)[:, None] if x is None else np.asarray(x, dtype=float)[:, None]
+    mu_r = BHCurve.from_name(material).mu_initial if mu_r is None else col(mu_r)
+    rho = RESISTIVITY[material] if rho is None else rho
+    if np.any(np.asarray(mu_r) > MU_R_MAX):
+        raise ValueError(f"Относительная проницаемость стали больше {MU_R_MAX:g}: задайте mu_r, а не mu_c/mu_0")
+
+    mu = calc_mu_steel(mu_r, rho, f, results, params, tan_h)
+    N = results["N"]
+    mu_full = mu / (1 + (N / (4 * np.pi)) * (mu - 1))
+    R_mC = results["L_c"] / (params["mu_0"] * mu_full * results["S_c"])
+
+    omega = 2 * np.pi * f
+    w2 = results["w"] ** 2
+    R_B0, k_B, R_k = results["R_B0"], results["k_B"], results["R_k"]
+    Z_1 = R_k + 1j * omega * w2 / ((R_mC + R_B0 * (1 - k_B * x)) * 1e3)
+    Z_2 = R_k + 1j * omega * w2 / ((R_mC + R_B0 * (1 + k_B * x)) * 1e3)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            'f': f, 'x': np.broadcast_to(x, Z_1.shape[:-1] + (1,))[..., 0], 'Z_1': Z_1, 'Z_2': Z_2,
+            'mu': mu[..., 0, :], 'eta': Z_1.real / np.abs(Z_1), 'Q': Z_1.imag / Z_1.real,
+            # Относительное дифференциальное изменение сопротивления
+            'S': np.abs(Z_1 - Z_2) / np.abs(Z_1 + Z_2),
+        }
+
+
+def calc_frequency(results, params, f, z0=None, **kwargs):
+    """Частота питания по сетке частот f, при которой |Z(0, f)| = z0
+
+    Для каждого варианта ищется первое пересечение |Z(0, f)| с z0 (по
+    умолчанию - заданное начальное сопротивление params["z0"]) с
+    интерполяцией по log f; nan - если на сетке z0 не достигается.
+    Возвращает f_p и значения eta, Q (при x = 0) и S (при x = xv) на этой
+    частоте.
+    Остальные аргументы - как в calc_impedance.
+    """
+    f = np.asarray(f, dtype=float)
+    grid = calc_impedance(results, params, f, points=3, **kwargs)  # x = -xv, 0, xv
+    z = np.abs(grid["Z_1"][..., 1, :])
+    z0 = np.asarray(params["z0"] if z0 is None else z0, dtype=float)[..., None]
+
+    above = z >= z0
+    found = np.any(above, axis=-1) & ~above[..., 0]
+    i = np.clip(np.argmax(above, axis=-1), 1, len(f) - 1)[..., None]
+    z_low = np.take_along_axis(z, i - 1, -1)
+    t = (z0 - z_low) / (np.take_along_axis(z, i, -1) - z_low)
+
+    def interpolate(values):
+        low = np.take_along_axis(values, i - 1, -1)
+        value = low + t * (np.take_along_axis(values, i, -1) - low)
+        return np.where(found, value[..., 0], np.nan)
+
+    return {
+        'f_p': np.exp(interpolate(np.broadcast_to(np.log(f), z.shape))),
+        'eta': interpolate(grid["eta"][..., 1, :]), 'Q': interpolate(grid["Q"][..., 1, :]),
+        'S': interpolate(grid["S"][..., 2, :]),
+    }
@@ -0,0 +1,224 @@
+import struct
+
+import numpy as np
+
+from core import bridge, electrical_ZIP
+from core.trace import calc_mode, MODE_SILENT
+
+
+# Величины, по которым восстанавливается перемещение: Z - сопротивление
+# половины ДЗИП calc_Z_x, U - выходное напряжение схемы включения
+QUANTITIES = ("Z", "U")
+
+# Разрядность кодов перемещения в таблице (int16_t или int32_t)
+BITS = (16, 32)
+
+# Заголовок двоичного файла: сигнатура, версия, разрядности, число точек,
+# q_min, q_max (единицы величины) и цена единицы кода перемещения, мм
+BLOB_HEADER = struct.Struct("<4sHHHI3d")
+BLOB_MAGIC = b"ZLUT"
+BLOB_VERSION = 1
+
+
+class Characteristic:
+    """Статическая характеристика ДЗИП q(x) на [-xv, xv] и обратная к ней x(q)
+
+    quantity - "Z" (z_0/(1 - k_x*x), calc_Z_x) или "U" (выходное напряжение
+    схемы scheme при питании U, как в core.bridge.calc_output). Обе
+    функции векторизованы; обращение Z - по формуле, U - интерполяцией по
+    таблице q(x) с уточнением методом Ньютона.
+    """
+
+    def __init__(self, results, params, quantity="Z", scheme="ПРСМ", U=1.0, k=None, sigma=None):
+        if quantity not in QUANTITIES:
+            raise ValueError(f"Неизвестная величина: {quantity}")
+        if scheme not in bridge.SCHEMES:
+            raise ValueError(f"Неизвестная схема включения: {scheme}")
+        optimal_k, optimal_sigma = bridge.OPTIMAL_LOAD[scheme]
+        self.quantity, self.scheme, self.U = quantity, scheme, U
+        self.k = optimal_k if k is None else k
+        self.sigma = optimal_sigma if sigma is None else sigma
+        self.z_0 = float(np.asarray(results["z_0"]))
+        self.k_x = float(np.asarray(results["k_x"]))
+        self.xv = float(np.asarray(params["xv"]))
+
+        ends = self.forward(np.array([-self.xv, self.xv]))
+        self.increasing = bool(ends[1] > ends[0])
+        self.q_min, self.q_max = float(ends.min()), float(ends.max())
+        self._x = np.linspace(-self.xv, self.xv, 4097)
+        self._q = self.forward(self._x)
+        steps = np.diff(self._q)
+        if not (np.all(steps > 0) or np.all(steps < 0)):
+            raise ValueError("Характеристика на [-xv, xv] немонотонна и не может быть обращена")
+
+    def forward(self, x):
+        with calc_mode(MODE_SILENT):
+            z_x1 = electrical_ZIP.calc_Z_x(x, self.z_0, self.k_x)
+            if self.quantity == "Z":
+                return z_x1
+            z_x2 = electrical_ZIP.calc_Z_x(-np.asarray(x), self.z_0, self.k_x)
+        return self.U * bridge.calc_transfer(z_x1, z_x2, self.z_0, self.k, self.sigma, self.scheme)
+
+    def inverse(self, q, iterations=3):
+        """Перемещение x, мм, по значениям q (вне [q_min, q_max] - ближайший конец)"""
+        q = np.clip(np.asarray(q, dtype=float), self.q_min, self.q_max)
+        if self.quantity == "Z":
+            return np.clip((1 - self.z_0 / q) / self.k_x, -self.xv, self.xv)
+        order = slice(None) if self.increasing else slice(None, None, -1)
+        x = np.interp(q, self._q[order], self._x[order])
+        h = 1e-6 * self.xv
+        for _ in range(iterations):
+            slope = (self.forward(x + h) - self.forward(x - h)) / (2 * h)
+            x = x - (self.forward(x) - q) / slope
+        return np.clip(x, -self.xv, self.xv)
+
+
+class LookupTable:
+    """Таблица обратной характеристики для линеаризации во встроенном ПО
+
+    Вход - код АЦП code = round((q - q_min)/(q_max - q_min)*2**input_bits),
+    узлы таблицы - равномерно по коду через 2**shift, поэтому номер отрезка
+    и доля внутри него получаются сдвигом и маской. codes - перемещения в
+    узлах в единицах x_lsb, мм (целые со знаком разрядности bits).
+    lookup повторяет целочисленную арифметику функции из to_header.
+    """
+
+    def __init__(self, q_min, q_max, codes, x_lsb, input_bits, bits, quantity="Z"):
+        self.q_min, self.q_max = float(q_min), float(q_max)
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.x_lsb = float(x_lsb)
+        self.input_bits, self.bits, self.quantity = int(input_bits), int(bits), quantity
+        segments = len(self.codes) - 1
+        if segments < 1 or segments & (segments - 1):
+            raise ValueError("Число точек таблицы должно быть равно 2**n + 1")
+        self.shift = self.input_bits - (segments.bit_length() - 1)
+        if self.shift < 1:
+            raise ValueError("Разрядность входного кода должна быть больше log2 числа отрезков")
+
+    @property
+    def points(self):
+        return len(self.codes)
+
+    def encode(self, q):
+        """Код АЦП для значений q"""
+        code = np.rint((np.asarray(q, dtype=float) - self.q_min) / (self.q_max - self.q_min) * 2 ** self.input_bits)
+        return np.clip(code, 0, 2 ** self.input_bits).astype(np.int64)
+
+    def lookup(self, code):
+        """Код перемещения по коду АЦП (целочисленная интерполяция)"""
+        code = np.asarray(code, dtype=np.int64)
+        i = np.minimum(code >> self.shift, self.points - 2)
+        fraction = code - (i << self.shift)
+        c = self.codes[i]
+        return c + (((self.codes[i + 1] - c) * fraction + (1 << (self.shift - 1))) >> self.shift)
+
+    def evaluate(self, q):
+        """Перемещение, мм, по значениям q так, как его вычислит встроенное ПО"""
+        return self.lookup(self.encode(q)) * self.x_lsb
+
+    def to_header(self, name="zip_lut"):
+        """Заголовочный файл C: таблица и функция интерполяции"""
+        upper = name.upper()
+        ctype = f"int{self.bits}_t"
+        rows = [", ".join(str(int(c)) for c in self.codes[i:i + 12]) for i in range(0, self.points, 12)]
+        units = "Ом" if self.quantity == "Z" else "В"
+        return "\n".join([
+            f"/* Обратная характеристика ДЗИП x({self.quantity}): models/lookup_zip.py */",
+            f"#ifndef {upper}_H",
+            f"#define {upper}_H",
+            "",
+            "#include <stdint.h>",
+            "",
+            f"#define {upper}_POINTS {self.points}",
+            f"#define {upper}_SHIFT {self.shift}",
+            f"#define {upper}_INPUT_BITS {self.input_bits}",
+            f"#define {upper}_Q_MIN {self.q_min!r}  /* {units}, код 0 */",
+            f"#define {upper}_Q_MAX {self.q_max!r}  /* {units}, код 2^{self.input_bits} */",
+            f"#define {upper}_X_LSB {self.x_lsb!r}  /* мм на единицу кода перемещения */",
+            "",
+            f"static const {ctype} {name}[{upper}_POINTS] = {{",
+            *(f"    {row}," for row in rows),
+            "};",
+            "",
+            f"/* Код перемещения по коду АЦП 0..2^{upper}_INPUT_BITS (сдвиг вправо - арифметический) */",
+            f"static inline int32_t {name}_lookup(uint32_t code)",
+            "{",
+            f"    uint32_t i = code >> {upper}_SHIFT;",
+            f"    if (i > {upper}_POINTS - 2) i = {upper}_POINTS - 2;",
+            f"    int64_t fraction = (int64_t)code - ((int64_t)i << {upper}_SHIFT);",
+            f"    int64_t delta = (int64_t){name}[i + 1] - {name}[i];",
+            f"    return (int32_t)({name}[i] + ((delta * fraction + (1 << ({upper}_SHIFT - 1))) >> {upper}_SHIFT));",
+            "}",
+            "",
+            f"#endif /* {upper}_H */",
+            "",
+        ])
+
+    def to_bytes(self):
+        """Двоичное представление: BLOB_HEADER и коды (little-endian)"""
+        header = BLOB_HEADER.pack(BLOB_MAGIC, BLOB_VERSION, self.bits, self.input_bits, self.points,
+                                  self.q_min, self.q_max, self.x_lsb)
+        return header + self.codes.astype(f"<i{self.bits // 8}").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, quantity="Z"):
+        magic, version, bits, input_bits, points, q_min, q_max, x_lsb = BLOB_HEADER.unpack_from(data)
+        if magic != BLOB_MAGIC or version != BLOB_VERSION:
+            raise ValueError("Неверный формат таблицы")
+        codes = np.frombuffer(data, dtype=f"<i{bits // 8}", count=points, offset=BLOB_HEADER.size)
+        return cls(q_min, q_max, codes, x_lsb, input_bits, bits, quantity)
+
+    def save(self, path, name="zip_lut"):
+        """Запись в заголовочный файл C (.h) или двоичный файл (иначе)"""
+        if path.lower().endswith(".h"):
+            with open(path, "w", encoding="utf-8", newline="\n") as f:
+                f.write(self.to_header(name))
+        else:
+            with open(path, "wb") as f:
+                f.write(self.to_bytes())
+
+
+def make_table(characteristic, points, bits=16, input_bits=16):
+    """Таблица с узлами на точной обратной характеристике"""
+    if bits not in BITS:
+        raise ValueError(f"Разрядность таблицы должна быть одной из {BITS}")
+    q = np.linspace(characteristic.q_min, characteristic.q_max, points)
+    x_lsb = characteristic.xv / (2 ** (bits - 1) - 1)
+    codes = np.rint(characteristic.inverse(q) / x_lsb)
+    return LookupTable(characteristic.q_min, characteristic.q_max, codes, x_lsb, input_bits, bits,
+                       characteristic.quantity)
+
+
+def validate(table, characteristic, samples=1_000_001):
+    """Наибольшие погрешности таблицы, отнесенные к xv
+
+    interpolation - линейная интерполяция по узлам без округления,
+    total - с округлением кодов АЦП и перемещения (как во встроенном ПО).
+    """
+    q = np.linspace(table.q_min, table.q_max, samples)
+    exact = characteristic.inverse(q)
+    nodes = np.linspace(table.q_min, table.q_max, table.points)
+    interpolated = np.interp(q, nodes, characteristic.inverse(nodes))
+    return {
+        'interpolation': float(np.max(np.abs(interpolated - exact)) / characteristic.xv),
+        'total': float(np.max(np.abs(table.evaluate(q) - exact)) / characteristic.xv),
+    }
+
+
+def build(characteristic, points=None, bits=16, input_bits=16, max_error=None, samples=1_000_001):
+    """Таблица обратной характеристики: заданное число точек или наименьшее для max_error
+
+    points - 2**n + 1 (по умолчанию 257); при заданной max_error (доля xv)
+    число точек удваивается, пока полная погрешность validate не станет
+    не больше max_error. Возвращает таблицу и ее погрешности.
+    """
+    if points is not None or max_error is None:
+        table = make_table(characteristic, points or 257, bits, input_bits)
+        return table, validate(table, characteristic, samples)
+
+    for n in range(2, input_bits):
+        table = make_table(characteristic, 2 ** n + 1, bits, input_bits)
+        errors = validate(table, characteristic, samples)
+        if errors["total"] <= max_error:
+            return table, errors
+    raise ValueError(f"Погрешность {max_error} не достигается при разрядности {bits}/{input_bits}")
@@ -0,0 +1,175 @@
+import time
+
+import numpy as np
+
+from core.validation import geometry_violation
+from models.sensor_zip import calc_batch, DEFAULTS
+
+
+# Варьируемые параметры ДЗИП (поля геометрии и провода ZIPWindow)
+VARIABLES = ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0", "d_n")
+
+
+def default_bounds(xv):
+    """Границы поиска по умолчанию, мм (зазор - в долях диапазона измерений)"""
+    return {
+        "D1": (4.0, 40.0), "D2": (3.0, 38.0),
+        "d1": (0.5, 20.0), "d2": (1.0, 30.0),
+        "h1": (1.0, 30.0), "h2": (1.5, 35.0), "h3": (0.5, 15.0),
+        "l0": (1.01 * xv, 10.0 * xv),
+        "d_n": (0.01, 0.3),
+    }
+
+
+def size_objective(params, results):
+    """Габаритный объем датчика: цилиндр D1 x (h2 + l0 + h3), мм³"""
+    return np.pi / 4 * params["D1"] ** 2 * (params["h2"] + params["l0"] + params["h3"])
+
+
+def frequency_objective(params, results):
+    """Частота напряжения питания f_p, кГц"""
+    return results["f_p"]
+
+
+OBJECTIVES = {"size": size_objective, "f_p": frequency_objective}
+
+
+class OptimizationResult:
+    """Результат подбора параметров ДЗИП"""
+
+    def __init__(self, params, results, objective, violation, evaluations, elapsed, history):
+        self.params = params            # лучший вариант: имя -> значение
+        self.results = results          # результаты ZIPSensor.calc для него
+        self.objective = objective
+        self.violation = violation      # 0 - все требования выполнены
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+        self.history = history          # (поколение, лучшая цель, нарушение)
+
+    @property
+    def feasible(self):
+        return self.violation == 0
+
+    @property
+    def rate(self):
+        """Расчетов вариантов в секунду"""
+        return self.evaluations / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def violation(params, results, xv, d_zT_min, eta_max):
+    """Суммарное нарушение требований (0 - вариант допустим)
+
+    Требования методики: d_z >= d_zT_min и eta <= eta_max (оба в %),
+    а также геометрические условия ZIPWindow._validate_geometry.
+    """
+    with np.errstate(invalid="ignore"):
+        total = geometry_violation(params["D1"], params["D2"], params["d1"], params["d2"],
+                                   params["h1"], params["h2"], params["h3"], params["l0"], xv)
+        total = total / xv
+        total = total + np.maximum(0, d_zT_min - results["d_z"] * 100) / max(d_zT_min, 1e-12)
+        total = total + np.maximum(0, results["eta"] * 100 - eta_max) / max(eta_max, 1e-12)
+    return np.where(np.isfinite(total), total, np.inf)
+
+
+def evaluate(params, xv, d_zT_min, eta_max, objective, common):
+    """Цель и суммарное нарушение требований для популяции вариантов"""
+    results = calc_batch({**common, **params}, xv=xv)
+    total = violation(params, results, xv, d_zT_min, eta_max)
+    with np.errstate(invalid="ignore"):
+        cost = np.asarray(OBJECTIVES[objective](params, results), dtype=float)
+
+    invalid = ~np.isfinite(cost) | ~np.isfinite(total)
+    return np.where(invalid, np.inf, cost), np.where(invalid, np.inf, total), results
+
+
+def better(cost_a, violation_a, cost_b, violation_b):
+    """Правила Деба: допустимый лучше недопустимого, затем меньшее нарушение, затем цель"""
+    return np.where((violation_a == 0) & (violation_b == 0), cost_a <= cost_b,
+                    np.where(violation_a == violation_b, cost_a <= cost_b, violation_a < violation_b))
+
+
+def optimize(xv, d_zT_min, bounds=None, eta_max=DEFAULTS["eta_max"], objective="size",
+             common=None, population=60, generations=300, mutation=0.7, crossover=0.9,
+             tol=1e-6, patience=30, seed=None, callback=None):
+    """Подбор геометрии ДЗИП по требованиям xv, d_zT_min, eta_max
+
+    Дифференциальная эволюция (DE/rand/1/bin): каждое поколение рассчитывается
+    одним вызовом пакетного расчета. common - неварьируемые параметры
+    (z0, p_n, mu_c, ...). Поиск останавливается, если лучшая допустимая цель
+    не улучшилась более чем на tol (относительно) за patience поколений.
+    callback(поколение, лучшая цель, нарушение) может вернуть True для остановки.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Неизвестная цель оптимизации: {objective}")
+
+    bounds = {**default_bounds(xv), **(bounds or {})}
+    common = {**DEFAULTS, **(common or {}), "d_zT_min": d_zT_min, "eta_max": eta_max}
+    names = [name for name in VARIABLES if name not in common]
+    low = np.array([bounds[name][0] for name in names], dtype=float)
+    high = np.array([bounds[name][1] for name in names], dtype=float)
+
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+
+    def run(points):
+        params = dict(zip(names, points.T))
+        return evaluate(params, xv, d_zT_min, eta_max, objective, common)
+
+    pop = low + rng.random((population, len(names))) * (high - low)
+    cost, violation, _ = run(pop)
+    evaluations = population
+    history = []
+    stall = 0
+
+    for generation in range(generations):
+        # Мутация: три различных случайных варианта для каждого члена популяции
+        idx = np.argsort(rng.random((population, population)), axis=1)[:, :3]
+        a, b, c = pop[idx[:, 0]], pop[idx[:, 1]], pop[idx[:, 2]]
+        mutant = a + mutation * (b - c)
+        # Отражение от границ вместо обрезки, чтобы не скапливаться на краях
+        mutant = np.where(mutant < low, 2 * low - mutant, mutant)
+        mutant = np.where(mutant > high, 2 * high - mutant, mutant)
+        mutant = np.clip(mutant, low, high)
+
+        cross = rng.random(pop.shape) < crossover
+        cross[np.arange(population), rng.integers(0, len(names), population)] = True
+        trial = np.where(cross, mutant, pop)
+
+        trial_cost, trial_violation, _ = run(trial)
+        evaluations += population
+
+        replace = better(trial_cost, trial_violation, cost, violation)
+        pop[replace] = trial[replace]
+        cost[replace] = trial_cost[replace]
+        violation[replace] = trial_violation[replace]
+
+        best = _best_index(cost, violation)
+        history.append((generation, float(cost[best]), float(violation[best])))
+
+        if callback is not None and callback(*history[-1]):
+            break
+
+        if len(history) > 1 and violation[best] == 0:
+            previous = history[-2]
+            improved = previous[2] > 0 or previous[1] - cost[best] > tol * abs(previous[1])
+            stall = 0 if improved else stall + 1
+            if stall >= patience:
+                break
+
+    best = _best_index(cost, violation)
+    params = {**common, **dict(zip(names, pop[best]))}
+    results = calc_batch({name: np.array([value]) for name, value in params.items()}, xv=xv)
+    results = {key: float(value[0]) for key, value in results.items()}
+
+    return OptimizationResult(
+        {name: float(value) for name, value in params.items()}, results,
+        float(cost[best]), float(violation[best]),
+        evaluations, time.perf_counter() - start, history
+    )
+
+
+def _best_index(cost, violation):
+    feasible = violation == 0
+    if feasible.any():
+        return int(np.flatnonzero(feasible)[np.argmin(cost[feasible])])
+    return int(np.argmin(violation))
@@ -0,0 +1,206 @@
+import time
+
+import numpy as np
+
+from models.sensor_zip import calc_batch, DEFAULTS
+from models.optimize_zip import VARIABLES, OBJECTIVES, default_bounds, violation
+
+
+# Критерии по умолчанию: имя -> направление (1 - минимизировать, -1 - максимизировать)
+# gamma - нелинейность, d_z - относительное изменение сопротивления,
+# eta - доля активного сопротивления обмотки, size - габаритный объем
+DEFAULT_CRITERIA = {"gamma": 1, "d_z": -1, "eta": 1, "f_p": 1, "size": 1}
+
+
+def criteria_values(params, results, criteria):
+    """Матрица критериев (вариант x критерий), приведенных к минимизации"""
+    columns = []
+    for name, sign in criteria.items():
+        if name in OBJECTIVES:
+            value = OBJECTIVES[name](params, results)
+        elif name in results:
+            value = results[name]
+        else:
+            raise ValueError(f"Неизвестный критерий: {name}")
+        columns.append(sign * np.asarray(value, dtype=float))
+    return np.column_stack(columns)
+
+
+def non_dominated(F):
+    """Маска недоминируемых строк матрицы критериев (все критерии минимизируются)"""
+    n = len(F)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    keep = np.ones(n, dtype=bool)
+    # Построчно, чтобы память росла как n, а не n^2 * число критериев
+    for i in range(n):
+        if not keep[i]:
+            continue
+        dominated = np.all(F[i] <= F, axis=1) & np.any(F[i] < F, axis=1)
+        keep &= ~dominated
+    # Повторяющиеся варианты оставляем в одном экземпляре
+    _, first = np.unique(F[keep], axis=0, return_index=True)
+    mask = np.zeros(n, dtype=bool)
+    mask[np.flatnonzero(keep)[first]] = True
+    return mask
+
+
+def crowding_distance(F):
+    """Расстояние скученности NSGA-II: крайние точки - бесконечность"""
+    n, m = F.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        return np.full(n, np.inf)
+    for j in range(m):
+        order = np.argsort(F[:, j])
+        span = F[order[-1], j] - F[order[0], j]
+        distance[order[0]] = distance[order[-1]] = np.inf
+        if span > 0:
+            distance[order[1:-1]] += (F[order[2:], j] - F[order[:-2], j]) / span
+    return distance
+
+
+class ParetoArchive:
+    """Архив недоминируемых вариантов ДЗИП в виде массивов numpy
+
+    X - подбираемые параметры (вариант x параметр), F - критерии,
+    приведенные к минимизации. Архив сохраняется в .npz и продолжается
+    при изменении границ или требований без повторного поиска с нуля.
+    """
+
+    def __init__(self, names, criteria, capacity=500):
+        self.names = tuple(names)
+        self.criteria = dict(criteria)
+        self.capacity = capacity
+        self.X = np.empty((0, len(self.names)))
+        self.F = np.empty((0, len(self.criteria)))
+        self.settings = {}  # xv, d_zT_min, eta_max и фиксированные параметры расчета
+
+    def __len__(self):
+        return len(self.X)
+
+    def add(self, X, F):
+        """Добавление вариантов; возвращает число вошедших в архив"""
+        finite = np.all(np.isfinite(F), axis=1)
+        X = np.vstack([self.X, X[finite]])
+        F = np.vstack([self.F, F[finite]])
+        keep = non_dominated(F)
+        X, F = X[keep], F[keep]
+
+        # Переполнение: отбрасываем самые скученные варианты по одному
+        while len(X) > self.capacity:
+            worst = np.argmin(crowding_distance(F))
+            X, F = np.delete(X, worst, axis=0), np.delete(F, worst, axis=0)
+
+        added = int(np.count_nonzero(keep[len(self.X):]))
+        self.X, self.F = X, F
+        return added
+
+    def params(self):
+        return dict(zip(self.names, self.X.T))
+
+    def objectives(self):
+        """Критерии в исходных единицах и направлении"""
+        signs = np.array(list(self.criteria.values()), dtype=float)
+        return dict(zip(self.criteria, (self.F * signs).T))
+
+    def save(self, path):
+        np.savez_compressed(
+            path, X=self.X, F=self.F, names=np.array(self.names),
+            criteria=np.array(list(self.criteria)), signs=np.array(list(self.criteria.values())),
+            settings_keys=np.array(list(self.settings)),
+            settings_values=np.array(list(self.settings.values()), dtype=float),
+            capacity=self.capacity
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            archive = cls([str(n) for n in data["names"]],
+                          dict(zip([str(c) for c in data["criteria"]], data["signs"].tolist())),
+                          int(data["capacity"]))
+            archive.X, archive.F = data["X"], data["F"]
+            archive.settings = dict(zip([str(k) for k in data["settings_keys"]],
+                                        data["settings_values"].tolist()))
+        return archive
+
+
+def _evaluate(points, names, settings, criteria):
+    params = dict(zip(names, points.T))
+    common = {k: v for k, v in settings.items() if k not in ("xv", "d_zT_min", "eta_max")}
+    xv = settings["xv"]
+    results = calc_batch({**common, **params}, xv=xv)
+    F = criteria_values(params, results, criteria)
+    total = violation(params, results, xv, settings["d_zT_min"], settings["eta_max"])
+    F[total > 0] = np.inf  # недопустимые варианты в архив не попадают
+    return F, total
+
+
+def explore(xv, d_zT_min=0.0, bounds=None, eta_max=DEFAULTS["eta_max"], criteria=None,
+            common=None, archive=None, population=100, generations=200, mutation=0.6,
+            crossover=0.9, capacity=500, seed=None, callback=None):
+    """Поиск множества Парето для ДЗИП
+
+    Потомки строятся дифференциальной эволюцией от членов архива (и случайных
+    вариантов, пока архив мал), каждое поколение рассчитывается одним пакетом.
+    Переданный archive продолжается: его варианты вне новых границ
+    отбрасываются, а при изменении xv, требований или фиксированных параметров
+    оставшиеся пересчитываются. callback(поколение, archive) может вернуть
+    True для остановки. Возвращает (archive, вариантов рассчитано, секунд).
+    """
+    bounds = {**default_bounds(xv), **(bounds or {})}
+    settings = {**DEFAULTS, **(common or {}), "xv": xv, "d_zT_min": d_zT_min, "eta_max": eta_max}
+    names = [name for name in VARIABLES if name not in settings]
+    criteria = dict(criteria or DEFAULT_CRITERIA)
+    low = np.array([bounds[name][0] for name in names], dtype=float)
+    high = np.array([bounds[name][1] for name in names], dtype=float)
+
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    evaluations = 0
+
+    if archive is None or list(archive.names) != names or archive.criteria != criteria:
+        archive = ParetoArchive(names, criteria, capacity)
+    else:
+        archive.capacity = capacity
+        inside = np.all((archive.X >= low) & (archive.X <= high), axis=1)
+        X = archive.X[inside]
+        F = archive.F[inside]
+        if archive.settings != settings and len(X):
+            F, _ = _evaluate(X, names, settings, criteria)
+            evaluations += len(X)
+        archive.X, archive.F = np.empty((0, len(names))), np.empty((0, len(criteria)))
+        archive.add(X, F)
+    archive.settings = settings
+
+    F_pop = None
+    for generation in range(generations):
+        # Родители: архив, дополненный случайными вариантами до размера популяции
+        parents = archive.X
+        if len(parents) < population:
+            extra = low + rng.random((population - len(parents), len(names))) * (high - low)
+            parents = np.vstack([parents, extra])
+
+        if F_pop is None and not len(archive):
+            trial = parents[:population]
+        else:
+            base = parents[rng.integers(0, len(parents), population)]
+            b = parents[rng.integers(0, len(parents), population)]
+            c = parents[rng.integers(0, len(parents), population)]
+            mutant = base + mutation * (b - c)
+            mutant = np.where(mutant < low, 2 * low - mutant, mutant)
+            mutant = np.where(mutant > high, 2 * high - mutant, mutant)
+            mutant = np.clip(mutant, low, high)
+            cross = rng.random(mutant.shape) < crossover
+            cross[np.arange(population), rng.integers(0, len(names), population)] = True
+            trial = np.where(cross, mutant, base)
+
+        F_pop, _ = _evaluate(trial, names, settings, criteria)
+        evaluations += population
+        archive.add(trial, F_pop)
+
+        if callback is not None and callback(generation, archive):
+            break
+
+    return archive, evaluations, time.perf_counter() - start
+
@@ -0,0 +1,94 @@
+import numpy as np
+
+from core.bridge import calc_best_line
+from core.materials import BHCurve
+
+
+def calc_mu_full(mu_r, N): #Проницаемость магнитопровода с учетом размагничивания (как в calc_R_mC)
+    return mu_r / (1 + (N / (4 * np.pi)) * (mu_r - 1))
+
+
+def solve_circuit(F, L_c, S_c, N, R_g, curve, mu_0, tol=1e-9, max_iter=100):
+    """Индукция в стали B, Тл, для магнитной цепи с нелинейной сталью
+
+    F = Phi*(R_mC(B) + R_g), где F - МДС w*I, А; R_mC(B) - сопротивление
+    стальной части (формула calc_R_mC с mu_c = mu_0*mu_r(B)), R_g -
+    сопротивление зазора. Сопротивления - в единицах ZIPSensor (1/(Гн·мм)),
+    L_c, S_c - в мм, мм². Все аргументы - массивы одной или согласованной
+    формы (варианты и точки перемещения).
+
+    Итерация B <- B + a*(g(B) - B), где g(B) - индукция при проницаемости
+    mu_r(B). Коэффициент релаксации a = 1/(1 - g') по наклону g между двумя
+    последними приближениями. Корень лежит между 0 и индукцией при
+    бесконечной проницаемости стали; отрезок сужается по знаку невязки,
+    шаг за его пределы заменяется делением отрезка пополам.
+    Возвращает B, mu_r, R_mC и число итераций.
+    """
+    F, L_c, S_c, N, R_g = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (F, L_c, S_c, N, R_g)))
+
+    def update(B):
+        mu_r = curve.mu_r(B)
+        R_mC = L_c / (mu_0 * calc_mu_full(mu_r, N) * S_c)
+        return F / ((R_mC + R_g) * 1e3 * S_c * 1e-6), mu_r, R_mC
+
+    B_prev = np.zeros(F.shape)
+    g_prev = update(B_prev)[0]  # индукция при начальной проницаемости
+    low, high = B_prev, F / (R_g * 1e3 * S_c * 1e-6)  # high - сталь с бесконечной проницаемостью
+    B = g_prev
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for iteration in range(1, max_iter + 1):
+            g, mu_r, R_mC = update(B)
+            residual = B - g
+            done = np.abs(residual) <= tol * np.abs(g)
+            if np.all(done):
+                return B, mu_r, R_mC, iteration
+
+            low = np.where(residual < 0, B, low)
+            high = np.where(residual > 0, B, high)
+            a = 1 / (1 - (g - g_prev) / (B - B_prev))
+            step = B + a * (g - B)
+            B_prev, g_prev = B, g
+            # Сошедшиеся элементы не меняются
+            B = np.where(done, B, np.where((step > low) & (step < high), step, (low + high) / 2))
+    raise ValueError(f"Расчет магнитной цепи не сошелся за {max_iter} итераций")
+
+
+def calc_characteristic(results, params, curve, current, points=201, tol=1e-9):
+    """Характеристика Z(x) ДЗИП с насыщением стали
+
+    results, params - результаты и параметры расчета ZIPSensor (можно пакет
+    вариантов), curve - BHCurve или название из core.materials.MATERIALS,
+    current - амплитуда тока катушки, А. Сопротивление половины датчика
+    z = 2*pi*f_p*w²/(R_mC(B) + R_mb(x))/sqrt(1 - eta²), как в calc_z_0, но
+    R_mC зависит от индукции, а значит, и от x. Точки - последняя ось.
+    """
+    if not isinstance(curve, BHCurve):
+        curve = BHCurve.from_name(curve)
+    col = lambda v: np.asarray(v, dtype=float)[..., None]
+    L_c, S_c, N, w = col(results["L_c"]), col(results["S_c"]), col(results["N"]), col(results["w"])
+    R_B0, k_B, f_p, eta = col(results["R_B0"]), col(results["k_B"]), col(results["f_p"]), col(results["eta"])
+    xv = col(params["xv"])
+    mu_0 = col(params["mu_0"])
+
+    psi = np.linspace(-1, 1, points)
+    x = xv * psi
+    F = w * col(current)
+    # Половины датчика: зазоры l0 - x и l0 + x
+    B1, mu_r1, R_mC1, n1 = solve_circuit(F, L_c, S_c, N, R_B0 * (1 - k_B * x), curve, mu_0, tol)
+    B2, mu_r2, R_mC2, n2 = solve_circuit(F, L_c, S_c, N, R_B0 * (1 + k_B * x), curve, mu_0, tol)
+
+    scale = 2 * np.pi * f_p * w ** 2 / np.sqrt(1 - eta ** 2)
+    z_x1 = scale / (R_mC1 + R_B0 * (1 - k_B * x))
+    z_x2 = scale / (R_mC2 + R_B0 * (1 + k_B * x))
+    z_0 = z_x1[..., points // 2]
+    eps = z_x1 / z_0[..., None] - 1
+
+    # Отклонение от наилучшей прямой, отнесенное к полному изменению eps
+    A, B, E = calc_best_line(psi, eps)
+    delta = (eps - (A[..., None] + B[..., None] * psi)) / (eps[..., -1] - eps[..., 0])[..., None]
+
+    return {
+        'x': x, 'z_x1': z_x1, 'z_x2': z_x2, 'eps': eps, 'delta': delta, 'z_0': z_0,
+        'gamma': np.max(np.abs(delta), axis=-1), 'B_1': B1, 'B_2': B2,
+        'mu_r1': mu_r1, 'mu_r2': mu_r2, 'iterations': max(n1, n2),
+    }
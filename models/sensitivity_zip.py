@@ -0,0 +1,64 @@
+import numpy as np
+
+from core.dual import Dual, value, gradient
+from core.trace import calc_mode, MODE_SILENT
+from models.batch import table_columns
+from models.sensor_zip import build_graph, PARAMETERS, DEFAULTS
+
+
+# Параметры, по которым вычисляются производные (геометрия, провод, материалы, питание)
+INPUTS = ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0", "d_n", "mu_c", "p_n", "z0")
+
+# Результаты, производные которых вычисляются по умолчанию
+OUTPUTS = ("d_z", "eta", "f_p", "Z_x", "k_x", "gamma")
+
+
+class Sensitivity:
+    """Матрица Якоби результатов ДЗИП по параметрам
+
+    jacobian имеет форму (..., результат, параметр); для пакета вариантов
+    первые оси - оси пакета.
+    """
+
+    def __init__(self, inputs, outputs, params, values, jacobian):
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.params = params      # параметр -> значение
+        self.values = values      # результат -> значение
+        self.jacobian = jacobian
+
+    def derivative(self, output, name):
+        """Производная результата output по параметру name"""
+        return self.jacobian[..., self.outputs.index(output), self.inputs.index(name)]
+
+    def elasticity(self):
+        """Относительная чувствительность (d y / y) / (d x / x), той же формы, что jacobian"""
+        x = np.stack([self.params[name] for name in self.inputs], axis=-1)[..., None, :]
+        y = np.stack([self.values[name] for name in self.outputs], axis=-1)[..., :, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.jacobian * x / y
+
+
+def jacobian(table=None, inputs=INPUTS, outputs=OUTPUTS, **common):
+    """Результаты ДЗИП и их производные по inputs за один пакетный расчет
+
+    Параметры задаются как в models.sensor_zip.calc_batch. Производные
+    вычисляются прямым режимом автоматического дифференцирования
+    (core.dual.Dual) по тем же формулам, что и сами результаты, через
+    граф расчета (без кэша геометрии, который хранит только значения).
+    """
+    params = table_columns(table, PARAMETERS, DEFAULTS, **common)
+    unknown = set(inputs) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры: {', '.join(sorted(unknown))}")
+
+    graph = build_graph()
+    graph.set(**{**params, **dict(zip(inputs, Dual.variables(*(params[name] for name in inputs))))})
+    with np.errstate(divide="ignore", invalid="ignore"), calc_mode(MODE_SILENT):
+        results = graph.evaluate()
+
+    shape = np.broadcast_shapes(*(np.shape(v) for v in params.values()))
+    n = len(inputs)
+    values = {name: np.broadcast_to(value(results[name]), shape) for name in outputs}
+    J = np.stack([np.broadcast_to(gradient(results[name], n), shape + (n,)) for name in outputs], axis=-2)
+    return Sensitivity(inputs, outputs, {name: params[name] for name in inputs}, values, J)
@@ -1,17 +1,38 @@
+import numpy as np
+
 from core import geometry_PIP, electrical_PIP
+from core.graph import CalcGraph
+from core.trace import calc_mode, MODE_SILENT
+from models.batch import table_columns
+from models.cache import LRUCache, cached_stage, STAGE_CACHE_BYTES
+
+
+# Порядок параметров конструктора PIPSensor
+PARAMETERS = ("D1", "D2", "d1", "d2", "h2", "h3", "l0", "t_B", "z0", "d_n", "xv",
+              "d_zT_min", "eta_max", "x", "K_kp", "p_n", "mu_0", "mu_c")
+
+# Значения общих параметров по умолчанию (как в PIPWindow.init_parameters)
+DEFAULTS = {"d_zT_min": 0.0, "eta_max": 5.0, "x": 0.003, "K_kp": 1.0,
+            "mu_0": 4 * np.pi * 1e-7}
+
+# Параметры, от которых зависит геометрический этап расчета
+GEOMETRY_PARAMETERS = ("D1", "D2", "d1", "d2", "h2", "h3", "l0", "t_B", "K_kp")
+
+# Кэш геометрического этапа (см. models.sensor_zip.GEOMETRY_CACHE)
+GEOMETRY_CACHE = LRUCache(maxsize=256, maxbytes=STAGE_CACHE_BYTES)
 
 
 class PIPSensor:
-    def __init__(self, D1, D2, d1, d2, h1, h2, h3, l0, z0, d_n, xv, d_zT_min, eta_max, x, K_kp, p_n, mu_0, mu_c,z_0_eta):
+    def __init__(self, D1, D2, d1, d2, h2, h3, l0, t_B, z0, d_n, xv, d_zT_min, eta_max, x, K_kp, p_n, mu_0, mu_c):
         # Геометрические параметры
         self.D1 = D1  # внешний диаметр сердечника
         self.D2 = D2  # внешний диаметр катушки
-        self.d1 = d1  # диаметр технического отверстия
-        self.d2 = d2  # внутренний диаметр катушки
-        self.h1 = h1  # высота катушки
-        self.h2 = h2  # высота сердечника
-        self.h3 = h3  # толщина якоря
-        self.l0 = l0  # начальный воздушный зазор
+        self.d1 = d1  # внешний диаметр якоря
+        self.d2 = d2  # внутренний диаметр якоря
+        self.h2 = h2  # высота катушки
+        self.h3 = h3  # высота сердечника
+        self.l0 = l0  # начальное перекрытие якоря и сердечника
+        self.t_B = t_B  # радиальный воздушный зазор
 
         # Диапозон измерения
         self.xv = xv    # Максимальный диапозон измерения
@@ -29,51 +50,109 @@ class PIPSensor:
         self.p_n = p_n
         self.mu_0 = mu_0
         self.mu_c = mu_c
-        self.z_0_eta = z_0_eta
 
-        if self.l0 < self.xv:
+        if np.any(np.less(self.l0, self.xv)):
             print("Верхняя граница диапозона измерений меньше")
 
-    def calc(self):
-        S_B = geometry_PIP.calc_S_B(self.D1, self.D2, self.d2, self.d1)
-        L_cd, l_c3, l_c2, l_c1 = geometry_PIP.calc_L_cd(self.h1, self.h2, self.D1, self.D2, self.d1, self.d2)
-        S_cd, a1, a2, a3 = geometry_PIP.calc_S_cd(L_cd, self.h1, self.h2, self.D1, self.D2, self.d1, self.d2)
-        S_y, L_y = geometry_PIP.calс_S_yakor(l_c3, self.h3, self.D1, self.D2, self.d1, self.d2)
-        L_c, S_c = geometry_PIP.calc_L_S_magnit(L_y, L_cd, S_cd, S_y)
-        S_ok = geometry_PIP.calc_S_ok(self.D2, self.d2, self.h1, self.K_kp)
-        R_cp = geometry_PIP.calc_R_cp(self.D2, self.d2)
+    @classmethod
+    def from_table(cls, table=None, **common):
+        """Датчик с параметрами-массивами для пакетного расчета"""
+        return cls(**table_columns(table, PARAMETERS, DEFAULTS, **common))
 
-        # 2. Электрические расчеты
-        N = electrical_PIP.calc_N(self.h1, L_c, S_c)
-        R_mC = electrical_PIP.calc_R_mC(L_c, S_c, N, self.mu_c, self.mu_0)
-        R_mb, k_B , R_B0 = electrical_PIP.calc_R_mb(self.l0, self.mu_0, S_B, 0)  # x=0 для начального положения
-        w_0 = electrical_PIP.calc_w_0(self.d_n)
-        w = electrical_PIP.calc_w(w_0, S_ok)
-        R_k = electrical_PIP.calc_R_k(R_cp,self.d_n, self.p_n,w)
+    def calc(self, mode=None, trace=None):
+        """Расчет датчика (режимы вывода - как в ZIPSensor.calc)"""
+        with calc_mode(mode, trace):
+            return self._calc()
+
+    def calc_geometry(self):
+        """Геометрический этап расчета через GEOMETRY_CACHE"""
+        return cached_stage(GEOMETRY_CACHE, calc_geometry,
+                            [getattr(self, name) for name in GEOMETRY_PARAMETERS])
 
-        R_B = electrical_PIP.calc_R_B(self.l0, self.mu_0, S_B, self.x)
+    def _calc(self):
 
-        k_x = electrical_PIP.calc_k_x(R_mC, R_B0, k_B)
-        gamma, q = electrical_PIP.calc_gamma(k_x, self.xv)
-        d_z = electrical_PIP.calc_d_z(q)
+        geometry = self.calc_geometry()
+        H, d, h_c = geometry['H'], geometry['d'], geometry['h_c']
+        L_c, S_c, S_ok, R_cp = geometry['L_c'], geometry['S_c'], geometry['S_ok'], geometry['R_cp']
+        a1, a2, a3 = geometry['a1'], geometry['a2'], geometry['a3']
+
+        # 2. Электрические расчеты
+        N = electrical_PIP.calc_N(L_c, self.h2, S_c)
+        R_mC = electrical_PIP.calc_R_mC(h_c, N, self.mu_c, self.mu_0, a1, a2, a3, self.d1, self.d2)
+        R_B0 = electrical_PIP.calc_R_B0(self.mu_0, H, self.l0, d, self.d1)
+        w_0 = geometry_PIP.calc_w0(self.d_n)
+        w = geometry_PIP.calc_w(w_0, S_ok)
+        R_k = electrical_PIP.calc_R_k(self.p_n, R_cp, w, self.d_n)
 
-        eta = electrical_PIP.calc_eta(R_k, self.z_0_eta, d_z)
+        Z_x, alpha, beta, k_x = electrical_PIP.calc_z_x(self.l0, H, R_B0, R_mC, self.x, self.z0)
+        gamma, q = electrical_PIP.calc_gamma_pip(k_x, self.xv, alpha)
+        d_z = electrical_PIP.calc_d_z(alpha, q)
 
-        f_p = electrical_PIP.calc_f_p(self.z_0_eta,w,eta,R_mC,R_B0)
+        eta = electrical_PIP.calc_etta(self.z0, d_z, R_k)
 
-        z_0 = electrical_PIP.calc_z_0(f_p, R_mC, R_B0, w, eta)
-        x = 0
-        gamma_pi = electrical_PIP.calc_gamma_pi(gamma)
-        Z_x= electrical_PIP.calc_Z_x(z_0,k_x,x)
+        f_p = electrical_PIP.calc_f_p(R_mC, R_B0, eta, w, self.z0)
 
         # Сохраняем результаты
         results = {
-            'S_B': S_B, 'L_cd': L_cd, 'l_c3': l_c3, 'S_cd': S_cd,
-            'S_y': S_y, 'L_y': L_y, 'L_c': L_c, 'S_c': S_c,
-            'S_ok': S_ok, 'R_cp': R_cp, 'N': N, 'R_mC': R_mC,
-            'R_mb': R_mb, 'k_B': k_B, 'w_0': w_0, 'w': w,
+            **geometry, 'N': N, 'R_mC': R_mC, 'R_B0': R_B0,
+            'k_x': k_x, 'alpha': alpha, 'beta': beta, 'w_0': w_0, 'w': w,
             'R_k': R_k, 'f_p': f_p, 'eta': eta, 'gamma': gamma,
             'q': q, 'd_z': d_z, 'Z_x': Z_x
         }
 
         return results
+
+
+def calc_geometry(D1, D2, d1, d2, h2, h3, l0, t_B, K_kp):
+    """Геометрический этап расчета ДПИП (параметры - GEOMETRY_PARAMETERS)"""
+    S_B, H, d = geometry_PIP.calc_S_B(h3, h2, t_B, d1, l0)
+    L_cd, D, h_c = geometry_PIP.calc_L_cd(D1, D2, H, h2, l0, d)
+    S_cd, a1, a2, a3 = geometry_PIP.calc_S_cd(h_c, D1, D2, H, D, d, l0, L_cd)
+    S_y, L_y = geometry_PIP.calc_S_ya(h_c, d1, d2)
+    S_c, L_c = geometry_PIP.calc_S_c(L_cd, L_y, S_cd, S_y)
+    S_ok, R_cp = geometry_PIP.calc_S_ok(D2, d, h2, K_kp)
+
+    return {
+        'S_B': S_B, 'H': H, 'd': d, 'L_cd': L_cd, 'h_c': h_c, 'S_cd': S_cd,
+        'a1': a1, 'a2': a2, 'a3': a3, 'S_y': S_y, 'L_y': L_y, 'L_c': L_c,
+        'S_c': S_c, 'S_ok': S_ok, 'R_cp': R_cp
+    }
+
+
+def build_graph():
+    """Граф расчета ДПИП (те же формулы, что в PIPSensor.calc)"""
+    graph = CalcGraph()
+    graph.add("geometry", lambda *values: tuple(calc_geometry(*values).values()),
+              GEOMETRY_PARAMETERS, ("S_B", "H", "d", "L_cd", "h_c", "S_cd", "a1", "a2", "a3",
+                                    "S_y", "L_y", "L_c", "S_c", "S_ok", "R_cp"))
+    graph.add("N", electrical_PIP.calc_N, ("L_c", "h2", "S_c"))
+    graph.add("R_mC", electrical_PIP.calc_R_mC, ("h_c", "N", "mu_c", "mu_0", "a1", "a2", "a3", "d1", "d2"))
+    graph.add("R_B0", electrical_PIP.calc_R_B0, ("mu_0", "H", "l0", "d", "d1"))
+    graph.add("w_0", geometry_PIP.calc_w0, ("d_n",))
+    graph.add("w", geometry_PIP.calc_w, ("w_0", "S_ok"))
+    graph.add("R_k", electrical_PIP.calc_R_k, ("p_n", "R_cp", "w", "d_n"))
+    graph.add("Z_x", electrical_PIP.calc_z_x, ("l0", "H", "R_B0", "R_mC", "x", "z0"),
+              ("Z_x", "alpha", "beta", "k_x"))
+    graph.add("gamma", electrical_PIP.calc_gamma_pip, ("k_x", "xv", "alpha"), ("gamma", "q"))
+    graph.add("d_z", electrical_PIP.calc_d_z, ("alpha", "q"))
+    graph.add("eta", electrical_PIP.calc_etta, ("z0", "d_z", "R_k"))
+    graph.add("f_p", electrical_PIP.calc_f_p, ("R_mC", "R_B0", "eta", "w", "z0"))
+    return graph
+
+
+def calc_batch(table=None, mode=MODE_SILENT, trace=None, **common):
+    """Пакетный расчет ДПИП: параметры и результаты - массивы numpy
+
+    См. models.sensor_zip.calc_batch; недопустимые варианты дают nan.
+    """
+    sensor = PIPSensor.from_table(table, **common)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sensor.calc(mode, trace)
+
+
+def calc_characteristic(results, params, points=2001):
+    """Статическая характеристика Z(x) по результатам и параметрам расчета"""
+    characteristic = electrical_PIP.calc_characteristic(params["z0"], results["k_x"], results["alpha"],
+                                                        params["xv"], points)
+    characteristic["z_0"] = params["z0"]
+    return characteristic
@@ -0,0 +1,162 @@
+import numpy as np
+
+from core import geometry_SIP, electrical_SIP
+from core.graph import CalcGraph
+from core.trace import calc_mode, MODE_SILENT
+from models.batch import table_columns
+from models.cache import LRUCache, cached_stage, STAGE_CACHE_BYTES
+
+
+# Порядок параметров конструктора SIPSensor
+PARAMETERS = ("R", "r", "l_k", "l_c", "t_B", "z0", "d_n", "xv",
+              "d_zT_min", "eta_max", "x", "K_kp", "p_n", "mu_0", "mu_c")
+
+# Значения общих параметров по умолчанию (как в SIPWindow.init_parameters)
+DEFAULTS = {"d_zT_min": 0.0, "eta_max": 5.0, "x": 0.003, "K_kp": 1.0,
+            "mu_0": 4 * np.pi * 1e-7}
+
+# Параметры, от которых зависит геометрический этап расчета
+# (включает поиск точки перегиба - самую затратную часть расчета)
+GEOMETRY_PARAMETERS = ("R", "r", "l_k", "l_c", "t_B", "K_kp")
+
+# Кэш геометрического этапа (см. models.sensor_zip.GEOMETRY_CACHE)
+GEOMETRY_CACHE = LRUCache(maxsize=256, maxbytes=STAGE_CACHE_BYTES)
+
+
+class SIPSensor:
+    def __init__(self, R, r, l_k, l_c, t_B, z0, d_n, xv, d_zT_min, eta_max, x, K_kp, p_n, mu_0, mu_c):
+        # Геометрические параметры
+        self.R = R  # внешний радиус катушки
+        self.r = r  # радиус сердечника
+        self.l_k = l_k  # длина катушки
+        self.l_c = l_c  # длина сердечника
+        self.t_B = t_B  # толщина каркаса (зазор между сердечником и обмоткой)
+
+        # Диапозон измерения
+        self.xv = xv    # Максимальный диапозон измерения
+
+        # Электрические параметры
+        self.z0 = z0  # начальное сопротивление
+        self.d_n = d_n  # диаметр провода
+        self.results = {}
+
+        # Общие параметры
+        self.d_zT_min = d_zT_min
+        self.eta_max = eta_max
+        self.x = x
+        self.K_kp = K_kp
+        self.p_n = p_n
+        self.mu_0 = mu_0
+        self.mu_c = mu_c
+
+    @classmethod
+    def from_table(cls, table=None, **common):
+        """Датчик с параметрами-массивами для пакетного расчета"""
+        return cls(**table_columns(table, PARAMETERS, DEFAULTS, **common))
+
+    def calc(self, mode=None, trace=None):
+        """Расчет датчика (режимы вывода - как в ZIPSensor.calc)"""
+        with calc_mode(mode, trace):
+            return self._calc()
+
+    def calc_geometry(self):
+        """Геометрический этап расчета через GEOMETRY_CACHE"""
+        return cached_stage(GEOMETRY_CACHE, calc_geometry,
+                            [getattr(self, name) for name in GEOMETRY_PARAMETERS])
+
+    def _calc(self):
+
+        geometry = self.calc_geometry()
+        p_k, p_c, s, q, p = geometry['p_k'], geometry['p_c'], geometry['s'], geometry['q'], geometry['p']
+        x_c, S_ok = geometry['x_c'], geometry['S_ok']
+
+        # 2. Магнитные расчеты
+        N = electrical_SIP.calc_N(p_k, p_c, self.r)
+        mu_C = electrical_SIP.calc_mu_C(N, self.mu_c, self.mu_0)
+        M_p, N_p, K_p, alpha, beta, c, d = electrical_SIP.calc_M_N_K(s, p, q)
+        L_0 = electrical_SIP.calc_L_0(mu_C, s, self.r, self.R)
+        a, b = electrical_SIP.calc_a_b(M_p, N_p, K_p, L_0, q, p_k)
+
+        # 3. Точность
+        gamma, lam = electrical_SIP.calc_gamma(b, self.xv)
+        d_z = electrical_SIP.calc_d_z(a, self.xv, lam)
+        delta_ma = electrical_SIP.calc_delta_ma(a, lam, self.xv, p_k, q, alpha, beta, c, d, N_p, L_0)
+
+        # 4. Электрические расчеты
+        w_0 = electrical_SIP.calc_w_0(self.d_n)
+        w = electrical_SIP.calc_w(w_0, S_ok)
+        R_k = electrical_SIP.calc_R_k(self.R, self.d_n, w, self.p_n)
+        eta = electrical_SIP.calc_eta(R_k, self.z0, d_z)
+        L_x, L_k, A_L = electrical_SIP.calc_L_x(w, self.R, self.r, self.l_k, p_c, p_k, self.mu_0, mu_C, x_c)
+        f_p = electrical_SIP.calc_f_p(self.z0, L_x, eta)
+        Z_x = electrical_SIP.calc_Z_x(self.x, self.z0, a, b)
+
+        # Сохраняем результаты
+        results = {
+            **geometry, 'N': N, 'mu_C': mu_C, 'M_p': M_p, 'N_p': N_p, 'K_p': K_p,
+            'alpha': alpha, 'beta': beta, 'c': c, 'd': d, 'L_0': L_0, 'a': a, 'b': b,
+            'gamma': gamma, 'lambda': lam, 'd_z': d_z, 'delta_ma': delta_ma,
+            'w_0': w_0, 'w': w, 'R_k': R_k, 'eta': eta,
+            'L_x': L_x, 'L_k': L_k, 'A_L': A_L, 'f_p': f_p, 'Z_x': Z_x
+        }
+
+        return results
+
+
+def calc_geometry(R, r, l_k, l_c, t_B, K_kp):
+    """Геометрический этап расчета ДСИП (параметры - GEOMETRY_PARAMETERS)"""
+    p_k, p_c = geometry_SIP.calc_p_k_p_c(l_k, l_c)
+    s, q = geometry_SIP.calc_s_q(p_c, p_k, R)
+    p = geometry_SIP.calc_p(s, q)
+    x_P, l_T, x_c = geometry_SIP.calc_x_P(p, p_k)
+    S_ok = geometry_SIP.calc_S_ok(R, r, t_B, l_k, K_kp)
+
+    return {
+        'p_k': p_k, 'p_c': p_c, 's': s, 'q': q, 'p': p,
+        'x_P': x_P, 'l_T': l_T, 'x_c': x_c, 'S_ok': S_ok
+    }
+
+
+def build_graph():
+    """Граф расчета ДСИП (те же формулы, что в SIPSensor.calc)"""
+    graph = CalcGraph()
+    graph.add("geometry", lambda *values: tuple(calc_geometry(*values).values()),
+              GEOMETRY_PARAMETERS, ("p_k", "p_c", "s", "q", "p", "x_P", "l_T", "x_c", "S_ok"))
+    graph.add("N", electrical_SIP.calc_N, ("p_k", "p_c", "r"))
+    graph.add("mu_C", electrical_SIP.calc_mu_C, ("N", "mu_c", "mu_0"))
+    graph.add("M_p", electrical_SIP.calc_M_N_K, ("s", "p", "q"),
+              ("M_p", "N_p", "K_p", "alpha", "beta", "c", "d"))
+    graph.add("L_0", electrical_SIP.calc_L_0, ("mu_C", "s", "r", "R"))
+    graph.add("a", electrical_SIP.calc_a_b, ("M_p", "N_p", "K_p", "L_0", "q", "p_k"), ("a", "b"))
+    graph.add("gamma", electrical_SIP.calc_gamma, ("b", "xv"), ("gamma", "lambda"))
+    graph.add("d_z", electrical_SIP.calc_d_z, ("a", "xv", "lambda"))
+    graph.add("delta_ma", electrical_SIP.calc_delta_ma,
+              ("a", "lambda", "xv", "p_k", "q", "alpha", "beta", "c", "d", "N_p", "L_0"))
+    graph.add("w_0", electrical_SIP.calc_w_0, ("d_n",))
+    graph.add("w", electrical_SIP.calc_w, ("w_0", "S_ok"))
+    graph.add("R_k", electrical_SIP.calc_R_k, ("R", "d_n", "w", "p_n"))
+    graph.add("eta", electrical_SIP.calc_eta, ("R_k", "z0", "d_z"))
+    graph.add("L_x", electrical_SIP.calc_L_x, ("w", "R", "r", "l_k", "p_c", "p_k", "mu_0", "mu_C", "x_c"),
+              ("L_x", "L_k", "A_L"))
+    graph.add("f_p", electrical_SIP.calc_f_p, ("z0", "L_x", "eta"))
+    graph.add("Z_x", electrical_SIP.calc_Z_x, ("x", "z0", "a", "b"))
+    return graph
+
+
+def calc_batch(table=None, mode=MODE_SILENT, trace=None, **common):
+    """Пакетный расчет ДСИП: параметры и результаты - массивы numpy
+
+    См. models.sensor_zip.calc_batch; недопустимые варианты дают nan.
+    """
+    sensor = SIPSensor.from_table(table, **common)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sensor.calc(mode, trace)
+
+
+def calc_characteristic(results, params, points=2001):
+    """Статическая характеристика Z(x) по результатам и параметрам расчета"""
+    characteristic = electrical_SIP.calc_characteristic(params["z0"], results["d_z"], params["xv"], results["p_k"],
+                                                        results["q"], results["alpha"], results["beta"], results["c"],
+                                                        results["d"], results["N_p"], results["L_0"], points)
+    characteristic["z_0"] = params["z0"]
+    return characteristic
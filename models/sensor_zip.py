@@ -1,4 +1,26 @@
+import numpy as np
+
 from core import geometry_ZIP, electrical_ZIP
+from core.graph import CalcGraph
+from core.trace import calc_mode, MODE_SILENT
+from models.batch import table_columns
+from models.cache import LRUCache, cached_stage, STAGE_CACHE_BYTES
+
+
+# Порядок параметров конструктора ZIPSensor
+PARAMETERS = ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0", "z0", "d_n", "xv",
+              "d_zT_min", "eta_max", "x", "K_kp", "p_n", "mu_0", "mu_c")
+
+# Значения общих параметров по умолчанию (как в ZIPWindow.init_parameters)
+DEFAULTS = {"d_zT_min": 0.0, "eta_max": 5.0, "x": 0.003, "K_kp": 1.0,
+            "mu_0": 4 * np.pi * 1e-7}
+
+# Параметры, от которых зависит геометрический этап расчета
+GEOMETRY_PARAMETERS = ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "K_kp")
+
+# Кэш геометрического этапа: при переборе материалов и электрических
+# параметров геометрия не пересчитывается (GEOMETRY_CACHE.info() - статистика)
+GEOMETRY_CACHE = LRUCache(maxsize=256, maxbytes=STAGE_CACHE_BYTES)
 
 
 class ZIPSensor:
@@ -30,18 +52,40 @@ class ZIPSensor:
         self.mu_0 = mu_0
         self.mu_c = mu_c
 
-        if self.l0 < self.xv:
+        if np.any(np.less(self.l0, self.xv)):
             print("Верхняя граница диапозона измерений меньше")
 
-    def calc(self):
+    @classmethod
+    def from_table(cls, table=None, **common):
+        """Датчик с параметрами-массивами для пакетного расчета"""
+        return cls(**table_columns(table, PARAMETERS, DEFAULTS, **common))
 
-        S_B = geometry_ZIP.calc_S_B(self.D1, self.D2, self.d2, self.d1)
-        L_cd, l_c3, l_c2, l_c1 = geometry_ZIP.calc_L_cd(self.h1, self.h2, self.D1, self.D2, self.d1, self.d2)
-        S_cd, a1, a2, a3 = geometry_ZIP.calc_S_cd(L_cd, self.h1, self.h2, self.D1, self.D2, self.d1, self.d2)
-        S_y, L_y = geometry_ZIP.calc_S_yakor(l_c3, self.h3, self.D1, self.D2, self.d1, self.d2)
-        L_c, S_c = geometry_ZIP.calc_L_S_magnit(L_y, L_cd, S_cd, S_y)
-        S_ok = geometry_ZIP.calc_S_ok(self.D2, self.d2, self.h1, self.K_kp)
-        R_cp = geometry_ZIP.calc_R_cp(self.D2, self.d1)
+    def calc(self, mode=None, trace=None):
+        """Расчет датчика
+
+        mode - режим вывода промежуточных значений (core.trace.MODE_PRINT или
+        MODE_SILENT), по умолчанию глобальный; trace - журнал CalcTrace,
+        в который собираются промежуточные значения.
+        """
+        with calc_mode(mode, trace):
+            return self._calc()
+
+    def calc_geometry(self):
+        """Геометрический этап расчета через GEOMETRY_CACHE
+
+        Промежуточные значения геометрии сохраняются вместе с результатом
+        и выводятся повторно при попадании в кэш, так что журнал расчета
+        не зависит от состояния кэша. Если в пакете все варианты имеют
+        одинаковую геометрию, она рассчитывается один раз.
+        """
+        return cached_stage(GEOMETRY_CACHE, calc_geometry,
+                            [getattr(self, name) for name in GEOMETRY_PARAMETERS])
+
+    def _calc(self):
+
+        geometry = self.calc_geometry()
+        S_B, l_c3, L_c, S_c = geometry['S_B'], geometry['l_c3'], geometry['L_c'], geometry['S_c']
+        S_ok, R_cp = geometry['S_ok'], geometry['R_cp']
 
         # 2. Электрические расчеты
         N = electrical_ZIP.calc_N(self.h1, L_c, S_c)
@@ -64,19 +108,82 @@ class ZIPSensor:
         z_0 = electrical_ZIP.calc_z_0(f_p, R_mC, R_B0, w, eta)
         x = 0
         gamma_pi = electrical_ZIP.calc_gamma_pi(gamma)
-        Z_x= electrical_ZIP.calc_Z_x(z_0,k_x,x)
+        Z_x= electrical_ZIP.calc_Z_x(x,z_0,k_x)
 
         # Сохраняем результаты
         results = {
-            'S_B': S_B, 'L_cd': L_cd, 'l_c3': l_c3, 'S_cd': S_cd,
-            'S_y': S_y, 'L_y': L_y, 'L_c': L_c, 'S_c': S_c,
-            'S_ok': S_ok, 'R_cp': R_cp, 'N': N, 'R_mC': R_mC,
-            'R_mb': R_mb, 'k_B': k_B, 'w_0': w_0, 'w': w,
+            **geometry, 'N': N, 'R_mC': R_mC,
+            'R_mb': R_mb, 'k_B': k_B, 'R_B0': R_B0, 'R_B': R_B,
+            'k_x': k_x, 'w_0': w_0, 'w': w,
             'R_k': R_k, 'f_p': f_p, 'eta': eta, 'gamma': gamma,
-            'q': q, 'd_z': d_z, 'Z_x': Z_x
+            'q': q, 'gamma_pi': gamma_pi, 'd_z': d_z, 'z_0': z_0, 'Z_x': Z_x
         }
 
         return results
 
 
-
+def calc_geometry(D1, D2, d1, d2, h1, h2, h3, K_kp):
+    """Геометрический этап расчета ДЗИП (параметры - GEOMETRY_PARAMETERS)"""
+    S_B = geometry_ZIP.calc_S_B(D1, D2, d2, d1)
+    L_cd, l_c3, l_c2, l_c1 = geometry_ZIP.calc_L_cd(h1, h2, D1, D2, d1, d2)
+    S_cd, a1, a2, a3 = geometry_ZIP.calc_S_cd(L_cd, h1, h2, D1, D2, d1, d2)
+    S_y, L_y = geometry_ZIP.calc_S_yakor(l_c3, h3, D1, D2, d1, d2)
+    L_c, S_c = geometry_ZIP.calc_L_S_magnit(L_y, L_cd, S_cd, S_y)
+    S_ok = geometry_ZIP.calc_S_ok(D2, d2, h1, K_kp)
+    R_cp = geometry_ZIP.calc_R_cp(D2, d1)
+
+    return {
+        'S_B': S_B, 'L_cd': L_cd, 'l_c3': l_c3, 'S_cd': S_cd,
+        'S_y': S_y, 'L_y': L_y, 'L_c': L_c, 'S_c': S_c,
+        'S_ok': S_ok, 'R_cp': R_cp
+    }
+
+
+def build_graph():
+    """Граф расчета ДЗИП (те же формулы, что в ZIPSensor.calc)
+
+    Входные величины - PARAMETERS без d_zT_min и eta_max, которые в расчет
+    не входят. При изменении одного поля пересчитываются только зависящие
+    от него величины: например, mu_c -> R_mC -> k_x -> gamma -> d_z -> eta
+    -> f_p -> z_0 -> Z_x, без геометрии и числа витков.
+    """
+    graph = CalcGraph()
+    graph.add("geometry", lambda *values: tuple(calc_geometry(*values).values()),
+              GEOMETRY_PARAMETERS, ("S_B", "L_cd", "l_c3", "S_cd", "S_y", "L_y", "L_c", "S_c", "S_ok", "R_cp"))
+    graph.add("N", electrical_ZIP.calc_N, ("h1", "L_c", "S_c"))
+    graph.add("R_mC", electrical_ZIP.calc_R_mC, ("L_c", "S_c", "N", "mu_c", "mu_0"))
+    graph.add("R_mb", lambda l0, mu_0, S_B: electrical_ZIP.calc_R_mb(l0, mu_0, S_B, x=0),
+              ("l0", "mu_0", "S_B"), ("R_mb", "k_B", "R_B0"))
+    graph.add("w_0", electrical_ZIP.calc_w_0, ("d_n",))
+    graph.add("w", electrical_ZIP.calc_w, ("w_0", "S_ok"))
+    graph.add("R_k", electrical_ZIP.calc_R_k, ("R_cp", "d_n", "w", "p_n"))
+    graph.add("R_B", electrical_ZIP.calc_R_B, ("l0", "x", "mu_0", "S_B"))
+    graph.add("k_x", electrical_ZIP.calc_k_x, ("R_mC", "R_B0", "k_B"))
+    graph.add("gamma", electrical_ZIP.calc_gamma, ("k_x", "xv"), ("gamma", "q"))
+    graph.add("d_z", electrical_ZIP.calc_d_z, ("q",))
+    graph.add("eta", electrical_ZIP.calc_eta, ("R_k", "z0", "d_z"))
+    graph.add("f_p", electrical_ZIP.calc_f_p, ("z0", "w", "eta", "R_mC", "R_B0"))
+    graph.add("z_0", electrical_ZIP.calc_z_0, ("f_p", "R_mC", "R_B0", "w", "eta"))
+    graph.add("gamma_pi", electrical_ZIP.calc_gamma_pi, ("gamma",))
+    graph.add("Z_x", lambda z_0, k_x: electrical_ZIP.calc_Z_x(0, z_0, k_x), ("z_0", "k_x"))
+    return graph
+
+
+def calc_batch(table=None, mode=MODE_SILENT, trace=None, **common):
+    """Пакетный расчет ДЗИП: параметры и результаты - массивы numpy
+
+    Параметры берутся из столбцов table (см. models.batch.table_columns),
+    общие для всех вариантов значения можно передать именованными аргументами.
+    Недопустимые варианты геометрии дают nan в соответствующих позициях.
+    По умолчанию расчет выполняется без вывода промежуточных значений.
+    """
+    sensor = ZIPSensor.from_table(table, **common)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sensor.calc(mode, trace)
+
+
+def calc_characteristic(results, params, points=2001):
+    """Статическая характеристика Z(x) по результатам и параметрам расчета"""
+    characteristic = electrical_ZIP.calc_characteristic(results["z_0"], results["k_x"], params["xv"], points)
+    characteristic["z_0"] = results["z_0"]
+    return characteristic
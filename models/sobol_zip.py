@@ -0,0 +1,192 @@
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from scipy.stats import qmc
+
+from core.validation import geometry_violation
+from models.cache import uncached
+from models.sensor_zip import calc_batch, DEFAULTS
+from models.sensitivity_zip import INPUTS
+
+
+# Результаты, для которых вычисляются индексы по умолчанию
+OUTPUTS = ("d_z", "f_p")
+
+# Границы по умолчанию: номинал +- SPREAD (в долях номинала)
+SPREAD = 0.1
+
+# Наименьшая доля вариантов с допустимой геометрией, при которой индексы оцениваются
+MIN_VALID = 0.5
+
+
+class SobolResult:
+    """Индексы Соболя результатов ДЗИП
+
+    first, total - результат -> массив индексов по inputs;
+    first_conf, total_conf - результат -> массив (inputs, 2) границ
+    доверительного интервала.
+    """
+
+    def __init__(self, inputs, bounds, first, total, first_conf, total_conf, valid, samples, evaluations, elapsed):
+        self.inputs = tuple(inputs)
+        self.bounds = bounds
+        self.first = first
+        self.total = total
+        self.first_conf = first_conf
+        self.total_conf = total_conf
+        self.valid = valid            # результат -> доля вариантов, вошедших в оценку
+        self.samples = samples
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+
+    @property
+    def rate(self):
+        """Расчетов вариантов в секунду"""
+        return self.evaluations / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def summary(self):
+        """Индексы и доверительные интервалы: результат -> параметр -> значения"""
+        return {output: {name: {"S1": float(self.first[output][i]), "ST": float(self.total[output][i]),
+                                "S1_conf": tuple(self.first_conf[output][i].tolist()),
+                                "ST_conf": tuple(self.total_conf[output][i].tolist())}
+                         for i, name in enumerate(self.inputs)}
+                for output in self.first}
+
+
+def default_bounds(nominal, inputs=INPUTS, spread=SPREAD):
+    """Границы параметров: номинал +- spread (в долях номинала)"""
+    return {name: (nominal[name] * (1 - spread), nominal[name] * (1 + spread)) for name in inputs}
+
+
+def sample(bounds, samples, seed=None):
+    """Матрицы A, B и AB (A с i-м столбцом из B) схемы Сальтелли
+
+    Точки квазислучайной последовательности Соболя размерности 2k, число
+    точек округляется вверх до степени двойки. Результат: names, A, B, AB,
+    где AB имеет форму (k, N, k).
+    """
+    names = tuple(bounds)
+    k = len(names)
+    low = np.array([bounds[name][0] for name in names], dtype=float)
+    high = np.array([bounds[name][1] for name in names], dtype=float)
+
+    points = qmc.Sobol(2 * k, scramble=True, seed=seed).random_base2(int(np.ceil(np.log2(max(samples, 2)))))
+    A = low + points[:, :k] * (high - low)
+    B = low + points[:, k:] * (high - low)
+    AB = np.repeat(A[None], k, axis=0)
+    for i in range(k):
+        AB[i, :, i] = B[:, i]
+    return names, A, B, AB
+
+
+def calc_chunk(names, rows, common, outputs):
+    """Результаты для части вариантов (выполняется в процессе-исполнителе)
+
+    Варианты с недопустимой геометрией дают nan: они вне допустимой области.
+    """
+    params = {**common, **dict(zip(names, rows.T))}
+    with uncached():  # строки Сэлтелли не повторяются
+        results = calc_batch(params)
+    feasible = geometry_violation(params["D1"], params["D2"], params["d1"], params["d2"],
+                                  params["h1"], params["h2"], params["h3"], params["l0"], params["xv"]) == 0
+    return np.stack([np.where(feasible, results[name], np.nan) for name in outputs], axis=-1)
+
+
+def evaluate(names, rows, common, outputs, chunk_size=100_000, workers=1):
+    """Результаты для всех строк rows частями, на workers процессах"""
+    chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+    run = partial(calc_chunk, names, common=common, outputs=outputs)
+    if workers == 1:
+        return np.concatenate([run(chunk) for chunk in chunks])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return np.concatenate(list(executor.map(run, chunks)))
+
+
+def estimate(fA, fB, fAB):
+    """Индексы первого (Сальтелли, 2010) и полного (Янсен) порядка
+
+    fA, fB - (..., N), fAB - (..., k, N); nan - вариант исключен. В оценку
+    индекса i входят строки, где конечны fA, fB и fAB[i]. Для устойчивости
+    результат центрируется по среднему.
+    """
+    valid = np.isfinite(fA) & np.isfinite(fB)
+    fA = np.where(valid, fA, np.nan)
+    fB = np.where(valid, fB, np.nan)
+    # Пустые строки (все варианты исключены) дают nan без предупреждений
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        f = np.concatenate([fA, fB], axis=-1)
+        mean = np.nanmean(f, axis=-1, keepdims=True)
+        V = np.nanvar(f, axis=-1)[..., None]
+        fA, fB, fAB = fA - mean, fB - mean, fAB - mean[..., None]
+        fA, fB = fA[..., None, :], fB[..., None, :]
+        first = np.nanmean(fB * (fAB - fA), axis=-1) / V
+        total = 0.5 * np.nanmean((fA - fAB) ** 2, axis=-1) / V
+    return first, total
+
+
+def bootstrap(fA, fB, fAB, resamples, confidence, rng, batch=None):
+    """Доверительные интервалы индексов (процентильный бутстреп по строкам)"""
+    N = fA.shape[-1]
+    k = fAB.shape[0]
+    batch = batch or max(1, 4_000_000 // (N * (k + 2)))
+    first, total = [], []
+    for start in range(0, resamples, batch):
+        index = rng.integers(0, N, (min(batch, resamples - start), N))
+        s1, st = estimate(fA[index], fB[index], np.moveaxis(fAB[:, index], 0, 1))
+        first.append(s1)
+        total.append(st)
+
+    levels = [(1 - confidence) / 2, (1 + confidence) / 2]
+    first = np.nanquantile(np.concatenate(first), levels, axis=0).T
+    total = np.nanquantile(np.concatenate(total), levels, axis=0).T
+    return first, total
+
+
+def analyze(nominal, bounds=None, samples=4096, outputs=OUTPUTS, chunk_size=100_000, workers=None,
+            resamples=200, confidence=0.95, seed=None):
+    """Глобальный анализ чувствительности ДЗИП: индексы Соболя
+
+    nominal - параметры ZIPSensor (xv обязателен), bounds - имя -> (мин, макс)
+    варьируемых параметров (по умолчанию все INPUTS в пределах +-10 % от
+    номинала). Параметры равномерно распределены в границах; варианты с
+    недопустимой геометрией исключаются из оценки. Требуется samples*(k+2)
+    расчетов, они выполняются частями по chunk_size на workers процессах
+    (по умолчанию - по числу ядер, 1 - в текущем процессе). Если в оценку
+    входит меньше MIN_VALID вариантов, возбуждается ValueError.
+    """
+    nominal = {**DEFAULTS, **nominal}
+    bounds = bounds or default_bounds(nominal)
+    unknown = set(bounds) - set(INPUTS)
+    if unknown:
+        raise ValueError(f"Параметры не поддерживаются: {', '.join(sorted(unknown))}")
+    if any(not low < high for low, high in bounds.values()):
+        raise ValueError("Нижняя граница параметра должна быть меньше верхней")
+
+    start = time.perf_counter()
+    names, A, B, AB = sample(bounds, samples, seed)
+    N, k = A.shape
+    common = {name: value for name, value in nominal.items() if name not in names}
+    f = evaluate(names, np.concatenate([A, B, AB.reshape(-1, k)]), common, outputs,
+                 chunk_size, workers or os.cpu_count() or 1)
+
+    valid = {name: float(np.mean(np.isfinite(f[:N, j]) & np.isfinite(f[N:2 * N, j])))
+             for j, name in enumerate(outputs)}
+    for name, share in valid.items():
+        if share < MIN_VALID:
+            raise ValueError(f"{name}: в оценку входит {share * 100:.1f} % вариантов (нужно не меньше "
+                             f"{MIN_VALID * 100:.0f} %) - границы параметров выходят из допустимой области")
+
+    rng = np.random.default_rng(seed)
+    first, total, first_conf, total_conf = {}, {}, {}, {}
+    for j, name in enumerate(outputs):
+        fA, fB, fAB = f[:N, j], f[N:2 * N, j], f[2 * N:, j].reshape(k, N)
+        first[name], total[name] = estimate(fA, fB, fAB)
+        first_conf[name], total_conf[name] = bootstrap(fA, fB, fAB, resamples, confidence, rng)
+
+    return SobolResult(names, bounds, first, total, first_conf, total_conf, valid,
+                       N, len(f), time.perf_counter() - start)
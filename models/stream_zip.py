@@ -0,0 +1,201 @@
+import asyncio
+import inspect
+import time
+from collections import namedtuple
+
+import numpy as np
+
+
+# Отсчетов в одном блоке
+BLOCK = 4096
+
+# Наибольшее число блоков, ожидающих преобразования (ограничивает задержку)
+QUEUE_SIZE = 8
+
+# Блок измерений: номер первого отсчета, значения q, момент поступления
+# (time.perf_counter) и истинное перемещение, если оно известно (имитация)
+Block = namedtuple("Block", "start values received truth", defaults=(None,))
+
+
+class GeneratorSource:
+    """Имитация измерений: q(x(t)) с шумом при гармоническом движении якоря
+
+    characteristic - lookup_zip.Characteristic (q = characteristic.forward),
+    rate - частота отсчетов, Гц; realtime - выдавать блоки не раньше, чем
+    они были бы измерены.
+    """
+
+    def __init__(self, characteristic, rate=100_000, duration=1.0, amplitude=None, frequency=20.0,
+                 noise=0.0, block=BLOCK, realtime=True, seed=None):
+        self.characteristic = characteristic
+        self.rate, self.duration, self.block = rate, duration, block
+        self.amplitude = characteristic.xv if amplitude is None else amplitude
+        self.frequency, self.noise = frequency, noise
+        self.realtime, self.seed = realtime, seed
+
+    async def blocks(self):
+        rng = np.random.default_rng(self.seed)
+        count = int(round(self.duration * self.rate))
+        begin = time.perf_counter()
+        for start in range(0, count, self.block):
+            stop = min(start + self.block, count)
+            if self.realtime:
+                delay = begin + stop / self.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            x = self.amplitude * np.sin(2 * np.pi * self.frequency * np.arange(start, stop) / self.rate)
+            q = self.characteristic.forward(x)
+            if self.noise:
+                q = q + rng.normal(0.0, self.noise, len(q))
+            yield Block(start, q, time.perf_counter(), x)
+            await asyncio.sleep(0)
+
+
+class FileSource:
+    """Воспроизведение записанных измерений: .npy или текст (столбец column)
+
+    rate - частота воспроизведения, Гц (None - без задержек).
+    """
+
+    def __init__(self, path, rate=None, block=BLOCK, column=0):
+        self.path, self.rate, self.block, self.column = path, rate, block, column
+
+    def load(self):
+        if self.path.lower().endswith(".npy"):
+            return np.load(self.path, mmap_mode="r")
+        values = np.loadtxt(self.path, delimiter=",", ndmin=2)
+        return values[:, self.column]
+
+    async def blocks(self):
+        values = self.load()
+        begin = time.perf_counter()
+        for start in range(0, len(values), self.block):
+            stop = min(start + self.block, len(values))
+            if self.rate:
+                delay = begin + stop / self.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield Block(start, np.array(values[start:stop], dtype=float), time.perf_counter())
+            await asyncio.sleep(0)
+
+
+class SocketSource:
+    """Измерения из TCP-соединения: поток чисел float64 little-endian"""
+
+    def __init__(self, host="127.0.0.1", port=5025, block=BLOCK):
+        self.host, self.port, self.block = host, port, block
+
+    async def blocks(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        start = 0
+        try:
+            while True:
+                try:
+                    data = await reader.readexactly(8 * self.block)
+                except asyncio.IncompleteReadError as error:
+                    data = error.partial[:len(error.partial) // 8 * 8]
+                    if data:
+                        yield Block(start, np.frombuffer(data, dtype="<f8").astype(float), time.perf_counter())
+                    return
+                yield Block(start, np.frombuffer(data, dtype="<f8").astype(float), time.perf_counter())
+                start += self.block
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+
+async def serve(source, host="127.0.0.1", port=0):
+    """Локальный сервер - заменитель измерительного стенда
+
+    Каждому подключению передаются блоки source.blocks() в формате
+    SocketSource; drain() приостанавливает передачу, если клиент не успевает.
+    Возвращает asyncio.Server (порт - server.sockets[0].getsockname()[1]).
+    """
+    async def handle(reader, writer):
+        try:
+            async for block in source.blocks():
+                writer.write(np.asarray(block.values, dtype="<f8").tobytes())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+class StreamStats:
+    """Пропускная способность и задержки потокового преобразования
+
+    Задержка блока - от поступления блока от источника до выдачи
+    перемещений приемнику (включая ожидание в очереди).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.samples = 0
+        self.blocks = 0
+        self.latencies = []
+        self.max_error = 0.0
+
+    def add(self, block, x, emitted):
+        self.samples += len(x)
+        self.blocks += 1
+        self.latencies.append(emitted - block.received)
+        if block.truth is not None and len(x):
+            self.max_error = max(self.max_error, float(np.max(np.abs(x - block.truth))))
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.samples / elapsed if elapsed > 0 else float("inf")
+
+    def percentiles(self, q=(50, 90, 99, 100)):
+        """Процентили задержки блока, с"""
+        if not self.latencies:
+            return {p: float("nan") for p in q}
+        return dict(zip(q, np.percentile(self.latencies, q).tolist()))
+
+
+async def convert_stream(source, convert, sink=None, queue_size=QUEUE_SIZE, stats=None):
+    """Потоковое преобразование измерений q в перемещения x
+
+    source - объект с асинхронным генератором blocks() (GeneratorSource,
+    FileSource, SocketSource), convert - векторизованная функция q -> x
+    (например, LookupTable.evaluate или Characteristic.inverse), sink(start, x) -
+    приемник (обычная или асинхронная функция). Между чтением и
+    преобразованием - очередь из queue_size блоков: если приемник не
+    успевает, чтение приостанавливается, и задержка остается ограниченной.
+    Возвращает StreamStats.
+    """
+    stats = stats if stats is not None else StreamStats()
+    queue = asyncio.Queue(maxsize=queue_size)
+
+    async def produce():
+        try:
+            async for block in source.blocks():
+                await queue.put(block)
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (block := await queue.get()) is not None:
+            x = convert(block.values)
+            if sink is not None:
+                result = sink(block.start, x)
+                if inspect.isawaitable(result):
+                    await result
+            stats.add(block, x, time.perf_counter())
+    finally:
+        if not producer.done():
+            producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+    return stats
@@ -0,0 +1,210 @@
+import itertools
+import time
+
+import numpy as np
+from scipy.stats import qmc
+
+from core.validation import geometry_violation
+from models.batch import table_columns
+from models.sensor_zip import calc_batch, DEFAULTS
+
+
+# Аппроксимируемые результаты по умолчанию
+OUTPUTS = ("d_z", "eta", "f_p")
+
+# Допустимая относительная погрешность аппроксимации на контрольной выборке
+TOLERANCE = 1e-3
+
+
+def exponents(k, degree):
+    """Показатели степеней многочленов от k переменных полной степени не выше degree
+
+    Член - сочетание с повторениями degree множителей из 1, x_1..x_k, поэтому
+    перебираются только C(k + degree, degree) нужных наборов (первый -
+    свободный член).
+    """
+    factors = np.array(list(itertools.combinations_with_replacement(range(k + 1), degree)),
+                       dtype=np.int64, ndmin=2)
+    counts = np.zeros((len(factors), k + 1), dtype=np.int64)
+    np.add.at(counts, (np.arange(len(factors))[:, None], factors), 1)
+    return counts[:, 1:]
+
+
+def legendre(u, degree):
+    """Многочлены Лежандра P_0..P_degree от u (последняя ось - точки)"""
+    P = np.empty((degree + 1,) + u.shape)
+    P[0] = 1.0
+    if degree:
+        P[1] = u
+    for n in range(1, degree):
+        P[n + 1] = ((2 * n + 1) * u * P[n] - n * P[n - 1]) / (n + 1)
+    return P
+
+
+def calc_exact(params, outputs):
+    """Точные результаты ДЗИП; варианты с недопустимой геометрией - nan"""
+    results = calc_batch(params)
+    feasible = geometry_violation(params["D1"], params["D2"], params["d1"], params["d2"],
+                                  params["h1"], params["h2"], params["h3"], params["l0"], params["xv"]) == 0
+    return {name: np.where(feasible, results[name], np.nan) for name in outputs}
+
+
+class Surrogate:
+    """Полиномиальная аппроксимация (разложение по многочленам Лежандра) результатов ДЗИП
+
+    Аппроксимация строится в границах bounds варьируемых параметров names при
+    остальных параметрах settings. Положительные результаты аппроксимируются
+    в логарифмическом масштабе (log). errors - наибольшая относительная
+    погрешность на контрольной выборке; если она больше tolerance, а также
+    для точек вне границ calc использует точный расчет.
+    """
+
+    def __init__(self, names, low, high, settings, outputs, exponents, coefficients, log, errors,
+                 tolerance=TOLERANCE):
+        self.names = tuple(names)
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.settings = settings
+        self.outputs = tuple(outputs)
+        self.exponents = exponents
+        self.coefficients = coefficients  # (членов, результатов)
+        self.log = np.asarray(log, dtype=bool)
+        self.errors = errors
+        self.tolerance = tolerance
+
+    @property
+    def degree(self):
+        return int(self.exponents.sum(axis=1).max())
+
+    @property
+    def bounds(self):
+        return {name: (low, high) for name, low, high in zip(self.names, self.low, self.high)}
+
+    def basis(self, X):
+        """Значения членов разложения: (членов, точек) для X формы (точек, параметров)"""
+        u = 2 * (X - self.low) / (self.high - self.low) - 1
+        P = legendre(u.T, self.degree)
+        Phi = P[self.exponents[:, 0], 0]
+        for j in range(1, len(self.names)):
+            Phi = Phi * P[self.exponents[:, j], j]
+        return Phi
+
+    def predict(self, X, chunk_size=2048):
+        """Аппроксимация результатов в точках X (точек, параметров): (точек, результатов)
+
+        Небольшие части (chunk_size точек) помещаются в кэш процессора.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        Y = np.empty((len(X), len(self.outputs)))
+        for start in range(0, len(X), chunk_size):
+            Y[start:start + chunk_size] = self.basis(X[start:start + chunk_size]).T @ self.coefficients
+        Y[:, self.log] = np.exp(Y[:, self.log])
+        return Y
+
+    def calc(self, table=None, **common):
+        """Результаты outputs для вариантов table (как models.sensor_zip.calc_batch)
+
+        Задаются только параметры names, остальные берутся из settings.
+        Если погрешность какого-либо результата больше tolerance, все
+        результаты рассчитываются точно (точный расчет дает их одновременно),
+        иначе точно - только варианты вне границ. Варианты с недопустимой
+        геометрией (nan) не рассчитываются.
+        """
+        params = table_columns(table, self.names, {}, **common)
+        shape = np.broadcast_shapes(*(np.shape(v) for v in params.values()))
+        columns = {name: np.broadcast_to(params[name], shape).ravel() for name in self.names}
+        inside = np.ones(int(np.prod(shape)), dtype=bool)
+        for name, low, high in zip(self.names, self.low, self.high):
+            inside &= (columns[name] >= low) & (columns[name] <= high)
+        feasible = geometry_violation(*(columns[n] if n in columns else self.settings[n]
+                                        for n in ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0", "xv"))) == 0
+
+        if any(self.errors[name] > self.tolerance for name in self.outputs):
+            results = {name: np.full(len(inside), np.nan) for name in self.outputs}
+            rows = feasible
+        else:
+            Y = self.predict(np.stack(list(columns.values()), axis=-1))
+            Y[~feasible] = np.nan
+            results = {name: Y[:, j] for j, name in enumerate(self.outputs)}
+            rows = feasible & ~inside
+        if np.all(rows):
+            index = slice(None)
+        elif np.any(rows):
+            index = np.flatnonzero(rows)
+        else:
+            index = None
+        if index is not None:
+            # Геометрия вариантов rows уже проверена
+            exact = calc_batch({**self.settings, **{name: column[index] for name, column in columns.items()}})
+            for name in self.outputs:
+                results[name][index] = exact[name]
+        return {name: value.reshape(shape) for name, value in results.items()}
+
+    def save(self, path):
+        np.savez_compressed(
+            path, names=np.array(self.names), low=self.low, high=self.high,
+            settings_keys=np.array(list(self.settings)),
+            settings_values=np.array(list(self.settings.values()), dtype=float),
+            outputs=np.array(self.outputs), exponents=self.exponents, coefficients=self.coefficients,
+            log=self.log, errors=np.array([self.errors[name] for name in self.outputs]),
+            tolerance=self.tolerance
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            outputs = [str(n) for n in data["outputs"]]
+            return cls([str(n) for n in data["names"]], data["low"], data["high"],
+                       dict(zip([str(k) for k in data["settings_keys"]], data["settings_values"].tolist())),
+                       outputs, data["exponents"], data["coefficients"], data["log"],
+                       dict(zip(outputs, data["errors"].tolist())), float(data["tolerance"]))
+
+
+def fit(bounds, nominal=None, outputs=OUTPUTS, degree=4, samples=None, validation=2048,
+        tolerance=TOLERANCE, seed=None):
+    """Построение аппроксимации по пакетному расчету ДЗИП
+
+    bounds - имя -> (мин, макс) варьируемых параметров, nominal - остальные
+    параметры ZIPSensor (xv обязателен). Коэффициенты находятся методом
+    наименьших квадратов по samples точкам последовательности Соболя (по
+    умолчанию - вчетверо больше числа членов), погрешность оценивается на
+    validation случайных точках. Варианты с недопустимой геометрией в
+    построение не входят. Возвращает Surrogate и время построения, с.
+    """
+    start = time.perf_counter()
+    names = tuple(bounds)
+    settings = {name: float(value) for name, value in {**DEFAULTS, **(nominal or {})}.items()
+                if name not in names}
+    low = np.array([bounds[name][0] for name in names], dtype=float)
+    high = np.array([bounds[name][1] for name in names], dtype=float)
+    if np.any(low >= high):
+        raise ValueError("Нижняя граница параметра должна быть меньше верхней")
+
+    terms = exponents(len(names), degree)
+    samples = samples or 4 * len(terms)
+    points = qmc.Sobol(len(names), scramble=True, seed=seed).random_base2(int(np.ceil(np.log2(samples))))
+    X = low + points * (high - low)
+    Y = calc_exact({**settings, **dict(zip(names, X.T))}, outputs)
+
+    surrogate = Surrogate(names, low, high, settings, outputs, terms, None, np.zeros(len(outputs)), {}, tolerance)
+    Phi = surrogate.basis(X).T
+    coefficients = np.zeros((len(terms), len(outputs)))
+    for j, name in enumerate(outputs):
+        y = Y[name]
+        valid = np.isfinite(y)
+        if np.count_nonzero(valid) < len(terms):
+            raise ValueError(f"Недостаточно допустимых вариантов для аппроксимации {name}")
+        surrogate.log[j] = np.all(y[valid] > 0)
+        target = np.log(y[valid]) if surrogate.log[j] else y[valid]
+        coefficients[:, j] = np.linalg.lstsq(Phi[valid], target, rcond=None)[0]
+    surrogate.coefficients = coefficients
+
+    rng = np.random.default_rng(seed)
+    X = low + rng.random((validation, len(names))) * (high - low)
+    exact = calc_exact({**settings, **dict(zip(names, X.T))}, outputs)
+    Y = surrogate.predict(X)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, name in enumerate(outputs):
+            error = np.abs(Y[:, j] - exact[name]) / np.abs(exact[name])
+            surrogate.errors[name] = float(np.nanmax(error)) if np.any(np.isfinite(error)) else np.inf
+    return surrogate, time.perf_counter() - start
@@ -0,0 +1,140 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from core.bridge import SCHEMES
+from models import sensor_zip, sensor_pip, sensor_sip, bridge
+
+
+# Пакетные вычислители по типу датчика: calc_batch(table, **common) -> dict массивов
+EVALUATORS = {
+    "ДЗИП": sensor_zip.calc_batch,
+    "ДПИП": sensor_pip.calc_batch,
+    "ДСИП": sensor_sip.calc_batch,
+}
+
+# Датчик вместе со схемой включения, например "ДЗИП/ПРСМ" (models.bridge.calc_batch)
+EVALUATORS.update({f"{sensor}/{scheme}": partial(bridge.calc_batch, sensor, scheme=scheme)
+                   for sensor in bridge.SENSORS for scheme in SCHEMES})
+
+# Часть результатов перебора: строки [start, stop) сетки
+SweepChunk = namedtuple("SweepChunk", "start stop params results worker elapsed")
+
+
+class ParameterGrid:
+    """Декартова сетка параметров без хранения всех ее точек в памяти"""
+
+    def __init__(self, axes, common=None):
+        self.axes = {name: np.atleast_1d(np.asarray(values, dtype=float))
+                     for name, values in axes.items()}
+        self.common = dict(common or {})
+        self.shape = tuple(len(values) for values in self.axes.values())
+        self.size = int(np.prod(self.shape)) if self.shape else 1
+
+    def __len__(self):
+        return self.size
+
+    def rows(self, start, stop):
+        """Параметры точек сетки с номерами [start, stop) (порядок C, последняя ось быстрее)"""
+        index = np.arange(start, min(stop, self.size))
+        coords = np.unravel_index(index, self.shape) if self.shape else ()
+        return {name: values[i] for (name, values), i in zip(self.axes.items(), coords)}
+
+    def chunks(self, chunk_size):
+        for start in range(0, self.size, chunk_size):
+            yield start, min(start + chunk_size, self.size)
+
+
+class SweepStats:
+    """Производительность перебора по процессам-исполнителям"""
+
+    def __init__(self):
+        self.workers = {}  # pid -> [вариантов, секунд]
+        self.started = time.perf_counter()
+        self.designs = 0
+
+    def add(self, chunk):
+        count = chunk.stop - chunk.start
+        totals = self.workers.setdefault(chunk.worker, [0, 0.0])
+        totals[0] += count
+        totals[1] += chunk.elapsed
+        self.designs += count
+
+    def worker_rates(self):
+        """Вариантов в секунду для каждого исполнителя"""
+        return {pid: count / seconds if seconds > 0 else float("inf")
+                for pid, (count, seconds) in self.workers.items()}
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.designs / elapsed if elapsed > 0 else float("inf")
+
+
+def calc_chunk(sensor, grid, start, stop, keys=None):
+    """Расчет одной части сетки (выполняется в процессе-исполнителе)
+
+    Параметры точек не возвращаются: их дешевле восстановить по сетке,
+    чем передавать между процессами.
+    """
+    begin = time.perf_counter()
+    results = EVALUATORS[sensor]({**grid.common, **grid.rows(start, stop)})
+    if keys is not None:
+        results = {key: results[key] for key in keys}
+    return SweepChunk(start, stop, None, results, os.getpid(), time.perf_counter() - begin)
+
+
+def _collect(chunk, grid, stats):
+    stats.add(chunk)
+    return chunk._replace(params=grid.rows(chunk.start, chunk.stop))
+
+
+def run_sweep(grid, sensor="ДЗИП", chunk_size=100_000, workers=None, keys=None,
+              cancel=None, stats=None):
+    """Перебор сетки параметров по частям на нескольких процессах
+
+    Генератор выдает SweepChunk строго в порядке возрастания номеров строк,
+    поэтому результат совпадает с последовательным расчетом. В работе
+    одновременно не более 2*workers частей, что ограничивает расход памяти.
+    cancel - объект с методом is_set() (например, threading.Event): перебор
+    прекращается после текущей части. workers=1 - расчет в текущем процессе.
+    """
+    if sensor not in EVALUATORS:
+        raise ValueError(f"Пакетный расчет для датчика {sensor} не реализован")
+
+    workers = workers or os.cpu_count() or 1
+    stats = stats if stats is not None else SweepStats()
+    chunks = grid.chunks(chunk_size)
+
+    if workers == 1:
+        for start, stop in chunks:
+            if cancel is not None and cancel.is_set():
+                return
+            yield _collect(calc_chunk(sensor, grid, start, stop, keys), grid, stats)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = []
+    try:
+        for start, stop in chunks:
+            pending.append(executor.submit(calc_chunk, sensor, grid, start, stop, keys))
+            if len(pending) < 2 * workers:
+                continue
+            yield _collect(pending.pop(0).result(), grid, stats)
+            if cancel is not None and cancel.is_set():
+                return
+
+        while pending:
+            yield _collect(pending.pop(0).result(), grid, stats)
+            if cancel is not None and cancel.is_set():
+                return
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
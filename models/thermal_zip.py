@@ -0,0 +1,84 @@
+import numpy as np
+
+from core import electrical_ZIP
+from core.trace import calc_mode, MODE_SILENT
+from models.sensor_zip import calc_batch, DEFAULTS
+
+
+# Температура, при которой заданы параметры датчика, °C
+T_REF = 20.0
+
+# Рабочий диапазон температур по умолчанию, °C
+T_RANGE = (-40.0, 120.0)
+
+# Температурные коэффициенты (ориентировочные), 1/K
+COEFFICIENTS = {
+    "p_n": 3.93e-3,    # удельное сопротивление меди
+    "mu_c": 1.0e-3,    # магнитная проницаемость стали
+    "steel": 11.6e-6,  # линейное расширение стали (размеры магнитопровода)
+    "l0": 11.6e-6,     # линейное расширение зазора (материал, задающий зазор)
+    "d_n": 16.5e-6,    # линейное расширение медного провода
+}
+
+# Размеры магнитопровода, меняющиеся с коэффициентом "steel"
+STEEL_PARAMETERS = ("D1", "D2", "d1", "d2", "h1", "h2", "h3")
+
+
+def apply_temperature(params, T, coefficients=None, T_ref=T_REF):
+    """Параметры ZIPSensor при температурах T, °C
+
+    К форме S параметров (пакет вариантов) спереди добавляется ось
+    температур: результат имеет форму (len(T),) + S. Параметр p меняется
+    как p*(1 + alpha*(T - T_ref)).
+    """
+    coefficients = {**COEFFICIENTS, **(coefficients or {})}
+    params = {**DEFAULTS, **params}
+    shape = np.broadcast_shapes(*(np.shape(value) for value in params.values()))
+    dT = (np.atleast_1d(np.asarray(T, dtype=float)) - T_ref).reshape((-1,) + (1,) * len(shape))
+
+    scale = {name: coefficients["steel"] for name in STEEL_PARAMETERS}
+    scale.update({name: coefficients[name] for name in ("p_n", "mu_c", "l0", "d_n")})
+    return {name: np.asarray(value, dtype=float) * (1 + scale[name] * dT) if name in scale
+            else np.broadcast_to(value, dT.shape[:1] + shape) for name, value in params.items()}
+
+
+def calc_temperature(params, T=None, coefficients=None, T_ref=T_REF, points=9):
+    """Температурная погрешность ДЗИП: расчет по вектору температур одним пакетом
+
+    params - параметры ZIPSensor при T_ref (можно пакет вариантов формы S),
+    T - температуры, °C (по умолчанию points точек на T_RANGE). Датчик
+    изготовлен при T_ref: число витков w и частота питания f_p с
+    температурой не меняются, а сопротивление катушки R_k, магнитные
+    сопротивления и d_z пересчитываются по параметрам apply_temperature.
+
+    Результаты имеют форму (len(T),) + S: d_z, eta, z_0 - при неизменной
+    частоте f_p, f_p - частота, которая дала бы z0 при температуре T;
+    delta_d_z, delta_z_0 - относительные изменения d_z и z_0 от значений
+    при T_ref; k_T - температурный коэффициент чувствительности (наклон
+    прямой delta_d_z(T)), 1/K; error - наибольшая |delta_d_z|.
+    """
+    T = np.linspace(*T_RANGE, points) if T is None else np.atleast_1d(np.asarray(T, dtype=float))
+    params = {**DEFAULTS, **params}
+    nominal = calc_batch(params)
+    heated = calc_batch(apply_temperature(params, T, coefficients, T_ref))
+
+    with np.errstate(divide="ignore", invalid="ignore"), calc_mode(MODE_SILENT):
+        # Витки намотаны при T_ref: R_k пропорционально w
+        w = nominal["w"]
+        R_k = heated["R_k"] * w / heated["w"]
+        d_z = heated["d_z"]
+        eta = electrical_ZIP.calc_eta(R_k, params["z0"], d_z)
+        z_0 = electrical_ZIP.calc_z_0(nominal["f_p"], heated["R_mC"], heated["R_B0"], w, eta)
+        f_p = electrical_ZIP.calc_f_p(params["z0"], w, eta, heated["R_mC"], heated["R_B0"])
+
+        delta_d_z = d_z / nominal["d_z"] - 1
+        delta_z_0 = z_0 / nominal["z_0"] - 1
+        dT = (T - T_ref).reshape((-1,) + (1,) * (delta_d_z.ndim - 1))
+        centered = dT - dT.mean()
+        k_T = np.sum(centered * delta_d_z, axis=0) / np.sum(centered ** 2) if len(T) > 1 else delta_d_z[0] / dT[0]
+
+    return {
+        'T': T, 'd_z': d_z, 'eta': eta, 'f_p': f_p, 'z_0': z_0, 'R_k': R_k,
+        'delta_d_z': delta_d_z, 'delta_z_0': delta_z_0, 'k_T': k_T,
+        'error': np.max(np.abs(delta_d_z), axis=0), 'nominal': nominal,
+    }
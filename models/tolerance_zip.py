@@ -0,0 +1,180 @@
+import time
+
+import numpy as np
+
+from models.sensor_zip import calc_batch, DEFAULTS
+from models.optimize_zip import violation
+from models.cache import uncached
+
+
+# Параметры ДЗИП с производственным разбросом (размеры, провод, материал)
+TOLERANCE_PARAMETERS = ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0", "d_n", "mu_c")
+
+# Результаты, распределение которых накапливается по умолчанию
+OUTPUTS = ("d_z", "k_x", "z_0", "f_p")
+
+# Законы распределения отклонения: допуск - половина поля допуска
+# (для нормального закона поле допуска равно 6 sigma)
+DISTRIBUTIONS = ("normal", "uniform")
+
+
+class StreamingHistogram:
+    """Гистограмма и моменты выборки, накапливаемые по частям
+
+    Границы бинов задаются по первой части с запасом margin размаха с каждой
+    стороны; значения за границами учитываются в below/above. Память не
+    зависит от объема выборки. nan и inf (недопустимые варианты) считаются
+    отдельно в invalid.
+    """
+
+    def __init__(self, bins=1024, margin=0.5):
+        self.bins = bins
+        self.margin = margin
+        self.edges = None
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.below = 0
+        self.above = 0
+        self.invalid = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        finite = np.isfinite(values)
+        self.invalid += int(values.size - np.count_nonzero(finite))
+        values = values[finite]
+        if not values.size:
+            return
+
+        if self.edges is None:
+            low, high = values.min(), values.max()
+            # Почти постоянная величина: ширина не меньше 1e-6 от значения
+            span = max(high - low, 1e-6 * abs(high)) or 1.0
+            self.edges = np.linspace(low - self.margin * span, high + self.margin * span, self.bins + 1)
+
+        width = self.edges[1] - self.edges[0]
+        index = np.floor((values - self.edges[0]) / width).astype(np.int64)
+        self.below += int(np.count_nonzero(index < 0))
+        self.above += int(np.count_nonzero(index >= self.bins))
+        inside = index[(index >= 0) & (index < self.bins)]
+        self.counts += np.bincount(inside, minlength=self.bins)
+
+        # Объединение моментов частей (формулы Чана)
+        n = values.size
+        mean = float(values.mean())
+        m2 = float(np.sum((values - mean) ** 2))
+        total = self.count + n
+        delta = mean - self.mean
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+    def quantile(self, q):
+        """Квантиль уровня q (0..1) с линейной интерполяцией внутри бина"""
+        if not self.count:
+            return np.nan
+        q = np.asarray(q, dtype=float)
+        target = q * self.count - self.below
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        i = np.clip(np.searchsorted(cumulative, target, side="right") - 1, 0, self.bins - 1)
+        fraction = (target - cumulative[i]) / np.maximum(self.counts[i], 1)
+        value = self.edges[i] + np.clip(fraction, 0, 1) * (self.edges[1] - self.edges[0])
+        # Вне границ бинов - крайние значения выборки
+        value = np.where(target <= 0, self.min, value)
+        value = np.clip(np.where(target >= cumulative[-1], self.max, value), self.min, self.max)
+        return value if value.ndim else float(value)
+
+    def density(self):
+        """Границы бинов и плотность распределения (для построения графика)"""
+        width = self.edges[1] - self.edges[0]
+        return self.edges, self.counts / (max(self.count, 1) * width)
+
+
+class ToleranceResult:
+    """Результат анализа допусков ДЗИП"""
+
+    def __init__(self, histograms, samples, passed, elapsed):
+        self.histograms = histograms  # результат -> StreamingHistogram
+        self.samples = samples
+        self.passed = passed          # вариантов, удовлетворяющих требованиям
+        self.elapsed = elapsed
+
+    @property
+    def yield_(self):
+        """Доля годных датчиков"""
+        return self.passed / self.samples if self.samples else 0.0
+
+    @property
+    def rate(self):
+        """Расчетов вариантов в секунду"""
+        return self.samples / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def summary(self, levels=(0.00135, 0.5, 0.99865)):
+        """Среднее, СКО и квантили каждого результата"""
+        return {name: {"mean": float(h.mean), "std": float(h.std), "min": float(h.min), "max": float(h.max),
+                       "quantiles": dict(zip(levels, np.atleast_1d(h.quantile(levels)).tolist()))}
+                for name, h in self.histograms.items()}
+
+
+def perturb(nominal, tolerances, size, distribution, rng):
+    """Случайные отклонения параметров от номинала: имя -> массив size"""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Неизвестный закон распределения: {distribution}")
+    params = {}
+    for name, tolerance in tolerances.items():
+        if distribution == "normal":
+            deviation = rng.normal(0.0, tolerance / 3, size)
+        else:
+            deviation = rng.uniform(-tolerance, tolerance, size)
+        params[name] = nominal[name] + deviation
+    return params
+
+
+def analyze(nominal, tolerances, samples=1_000_000, chunk_size=200_000, distribution="normal",
+            outputs=OUTPUTS, bins=1024, seed=None, callback=None):
+    """Монте-Карло анализ разброса результатов ДЗИП от допусков изготовления
+
+    nominal - номинальные параметры ZIPSensor (xv, d_zT_min, eta_max - требования),
+    tolerances - имя -> допуск (половина поля допуска) в единицах параметра.
+    Варианты рассчитываются частями по chunk_size, поэтому память не зависит
+    от samples. Годный вариант удовлетворяет тем же требованиям, что и при
+    подборе (optimize_zip.violation). callback(рассчитано, всего) может
+    вернуть True для остановки.
+    """
+    unknown = set(tolerances) - set(TOLERANCE_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Допуск не поддерживается для параметров: {', '.join(sorted(unknown))}")
+
+    nominal = {**DEFAULTS, **nominal}
+    xv = nominal["xv"]
+    d_zT_min = nominal.get("d_zT_min", 0.0)
+    eta_max = nominal["eta_max"]
+
+    rng = np.random.default_rng(seed)
+    histograms = {name: StreamingHistogram(bins) for name in outputs}
+    start = time.perf_counter()
+    done = passed = 0
+
+    while done < samples:
+        size = min(chunk_size, samples - done)
+        params = {**nominal, **perturb(nominal, tolerances, size, distribution, rng)}
+        with uncached():  # варианты не повторяются: кэш геометрии только занимал бы память
+            results = calc_batch(params)
+        for name, histogram in histograms.items():
+            histogram.add(results[name])
+        passed += int(np.count_nonzero(violation(params, results, xv, d_zT_min, eta_max) == 0))
+        done += size
+
+        if callback is not None and callback(done, samples):
+            break
+
+    return ToleranceResult(histograms, done, passed, time.perf_counter() - start)
@@ -0,0 +1,211 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import diags
+
+from core import electrical_ZIP
+from core.trace import calc_mode, MODE_SILENT
+
+
+# Жесткие методы solve_ivp
+METHODS = ("Radau", "BDF", "LSODA")
+
+# Отсчетов выходного сигнала на период питания
+SAMPLES = 16
+
+# Периодов питания в одной части потока
+WINDOW = 50
+
+# Частей в очереди run_profiles на процесс-исполнитель
+QUEUE_SIZE = 4
+
+# Часть временной реализации: отсчеты [t, ...] для всех законов движения группы,
+# first - номер первого закона группы (run_profiles)
+TransientChunk = namedtuple("TransientChunk", "t x i_1 i_2 u steps worker elapsed first", defaults=(0,))
+
+
+def sine(amplitude, frequency, duration, points=2001):
+    """Гармоническое движение якоря: (t, x), с и мм"""
+    t = np.linspace(0.0, duration, points)
+    return t, amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def step(amplitude, start, rise, duration):
+    """Перемещение якоря на amplitude, мм, за время rise, начиная с start, с"""
+    return np.array([0.0, start, start + rise, max(duration, start + rise)]), np.array([0.0, 0.0, amplitude, amplitude])
+
+
+class ZIPCircuit:
+    """Цепь питания ДЗИП: каждая половина последовательно с резистором R_b
+
+    Половины питаются напряжением U*sin(2*pi*f*t), выходной сигнал
+    u = R_b*(i_1 - i_2). Индуктивность половины L(x) = w²/(R_mC + R_B(l0 -+ x))
+    по формулам calc_R_mC и calc_R_B (в СИ, как в field_zip.lumped_inductance).
+    Неизвестные - потокосцепления psi = L*i катушек, поэтому ЭДС движения
+    якоря учитывается без производной x(t).
+    """
+
+    def __init__(self, results, params, U=1.0, f=None, R_b=None):
+        value = lambda name: float(np.asarray(results[name] if name in results else params[name]))
+        self.w = value("w")
+        self.R_k = value("R_k")
+        self.R_mC = value("R_mC")
+        self.S_B = value("S_B")
+        self.l0 = float(params["l0"])
+        self.mu_0 = float(params["mu_0"])
+        self.U = U
+        self.f = f or float(electrical_ZIP.f_p_hz(value("f_p")))
+        self.R_b = value("z_0") if R_b is None else R_b
+        self.R = self.R_k + self.R_b
+
+    def inductance(self, x):
+        """Индуктивности половин L_1, L_2, Гн, при перемещении x, мм"""
+        x = np.asarray(x, dtype=float)
+        with calc_mode(MODE_SILENT):
+            R_B = electrical_ZIP.calc_R_B(self.l0, np.stack([x, -x]), self.mu_0, self.S_B)
+        L_1, L_2 = self.w ** 2 / ((self.R_mC + R_B) * 1e3)
+        return L_1, L_2
+
+    def steady(self, x):
+        """Потокосцепления установившегося режима при t = 0 и неподвижном якоре"""
+        omega = 2 * np.pi * self.f
+        psi = [self.U * np.imag(1 / (1j * omega + self.R / L)) for L in self.inductance(x)]
+        return np.concatenate(psi)
+
+
+class Motion:
+    """Законы движения якоря x_p(t), заданные таблицами (t, x)"""
+
+    def __init__(self, profiles):
+        self.profiles = [(np.asarray(t, dtype=float), np.asarray(x, dtype=float)) for t, x in profiles]
+        self.duration = min(t[-1] for t, _ in self.profiles)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __call__(self, t):
+        """Перемещения всех законов в моменты t: (законов,) + форма t"""
+        return np.array([np.interp(t, tp, xp) for tp, xp in self.profiles])
+
+
+def simulate(results, params, profiles, U=1.0, f=None, R_b=None, duration=None, samples=SAMPLES,
+             window=WINDOW, method="Radau", rtol=1e-6, atol=None, steady=True):
+    """Переходный процесс ДЗИП при движении якоря - поток частей TransientChunk
+
+    results, params - результаты и параметры расчета ZIPSensor (один
+    вариант), profiles - законы движения (t, x) в с и мм (см. sine, step).
+    Все законы интегрируются одной системой: якобиан диагональный и
+    передается solve_ivp в разреженном виде. Интегрирование идет частями по
+    window периодов питания, состояние передается от части к части, и на
+    выход попадают только samples отсчетов на период - выходной поток не
+    зависит от числа внутренних шагов решателя. steady - начальное
+    состояние установившегося режима при x(0), иначе - включение питания
+    при t = 0. Отсчеты: t (N,), x, i_1, i_2, u - (законов, N).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод интегрирования: {method}")
+    circuit = ZIPCircuit(results, params, U, f, R_b)
+    motion = Motion(profiles)
+    duration = duration or motion.duration
+    count = len(motion)
+    omega = 2 * np.pi * circuit.f
+
+    def rates(t, psi):
+        L_1, L_2 = circuit.inductance(motion(t))
+        return circuit.U * np.sin(omega * t) - circuit.R * psi / np.concatenate([L_1, L_2])
+
+    def jacobian(t, psi):
+        L_1, L_2 = circuit.inductance(motion(t))
+        return diags(-circuit.R / np.concatenate([L_1, L_2]), format="csc")
+
+    psi = circuit.steady(motion(0.0)) if steady else np.zeros(2 * count)
+    atol = atol or 1e-9 * circuit.U / omega
+    dt = 1 / (circuit.f * samples)
+    grid = np.arange(0, int(np.floor(duration / dt * (1 + 1e-12))) + 1) * dt
+    edges = np.arange(0, len(grid) + window * samples - 1, window * samples)
+    for first, last in zip(edges[:-1], np.minimum(edges[1:], len(grid) - 1)):
+        begin = time.perf_counter()
+        # Отсчеты [first, last]: последний - начало следующей части
+        t = grid[first:last + 1]
+        solution = solve_ivp(rates, (t[0], t[-1]), psi, method=method, t_eval=t, jac=jacobian,
+                             rtol=rtol, atol=atol)
+        if not solution.success:
+            raise ValueError(f"Интегрирование не выполнено: {solution.message}")
+        psi = solution.y[:, -1]
+        if last < len(grid) - 1:
+            t, y = t[:-1], solution.y[:, :-1]
+        else:
+            y = solution.y
+
+        x = motion(t)
+        L_1, L_2 = circuit.inductance(x)
+        i_1, i_2 = y[:count] / L_1, y[count:] / L_2
+        yield TransientChunk(t, x, i_1, i_2, circuit.R_b * (i_1 - i_2), solution.nfev,
+                             os.getpid(), time.perf_counter() - begin)
+
+
+def stream_group(results, params, profiles, first, options, chunks, stop):
+    """Части реализации группы законов движения - в очередь chunks по мере расчета
+
+    Выполняется в процессе-исполнителе; расчет прекращается, если
+    установлено событие stop. После последней части (и при ошибке) в
+    очередь помещается None.
+    """
+    try:
+        for chunk in simulate(results, params, profiles, **options):
+            if stop.is_set():
+                break
+            chunks.put(chunk._replace(first=first))
+    finally:
+        chunks.put(None)
+
+
+def run_profiles(results, params, profiles, group_size=8, workers=None, **options):
+    """Расчет многих законов движения на нескольких процессах - поток частей TransientChunk
+
+    Законы делятся на группы по group_size (одна система уравнений на
+    группу), first части - номер первого закона ее группы. Части выдаются
+    по мере расчета, не дожидаясь конца реализаций: для каждой группы - по
+    порядку времени, группы разных процессов чередуются. Очередь частей
+    ограничена, поэтому расчет приостанавливается, если приемник не
+    успевает. Остальные аргументы - как в simulate. workers=1 - в текущем
+    процессе (группы по порядку).
+    """
+    results = {name: float(np.asarray(value)) for name, value in results.items()}
+    params = {name: float(np.asarray(value)) for name, value in params.items()}
+    groups = [(first, profiles[first:first + group_size]) for first in range(0, len(profiles), group_size)]
+    workers = min(workers or os.cpu_count() or 1, len(groups))
+    if workers <= 1:
+        for first, group in groups:
+            for chunk in simulate(results, params, group, **options):
+                yield chunk._replace(first=first)
+        return
+
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks, stop = manager.Queue(maxsize=QUEUE_SIZE * workers), manager.Event()
+        futures = [executor.submit(stream_group, results, params, group, first, options, chunks, stop)
+                   for first, group in groups]
+        try:
+            running = len(futures)
+            while running:
+                chunk = chunks.get()
+                if chunk is None:
+                    running -= 1
+                else:
+                    yield chunk
+            for future in futures:
+                future.result()
+        finally:
+            # Приемник прекратил чтение: останов исполнителей, ожидающих места в очереди
+            stop.set()
+            for future in futures:
+                future.cancel()
+            while not all(future.done() for future in futures):
+                while not chunks.empty():
+                    chunks.get()
+                time.sleep(0.01)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from models.sensor_zip import DEFAULTS
+
+
+@pytest.fixture
+def nominal():
+    """Параметры ДЗИП из Тестовое.json с xv = 0.1 мм"""
+    return {**DEFAULTS, "D1": 12.0, "D2": 8.0, "d1": 2.0, "d2": 4.0, "h1": 8.0, "h2": 10.0, "h3": 12.0,
+            "l0": 0.12, "d_n": 0.08, "p_n": 1.75e-07, "mu_c": 3000.0, "z0": 500.0, "xv": 0.1}
+
+
+@pytest.fixture
+def designs(nominal):
+    """Пакет вариантов: сетка d2 x d_n вокруг номинала"""
+    d2, d_n = np.meshgrid(np.linspace(3.5, 4.5, 5), np.linspace(0.06, 0.1, 4), indexing="ij")
+    return {**nominal, "d2": d2, "d_n": d_n}
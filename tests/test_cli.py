@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from IO.cli import calculation_parameters, main, read_calculation
+from models.optimize_zip import VARIABLES
+
+# Поля ввода ZIPWindow (ZIPWindow.input_entries): ZIPWindow.load_calculation заполняет только их
+WINDOW_FIELDS = ("D1", "D2", "d1", "d2", "h1", "h2", "h3", "l0", "d_n", "p_n_user", "mu_c_user", "z0_user")
+
+
+def test_optimize_output_round_trip(tmp_path, capsys):
+    path = tmp_path / "подбор.json"
+    code = main(["optimize", "--xv", "0.1", "--d-zT-min", "15", "--param", "p_n=1.75e-07", "--param", "mu_c=3000",
+                 "--param", "z0=500", "--param", "d_n=0.08", "--population", "12", "--generations", "5",
+                 "--seed", "1", "-o", str(path)])
+    assert code in (0, 2)
+    printed = dict(line.split(" = ") for line in capsys.readouterr().out.splitlines()[1:1 + len(VARIABLES)])
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    fields = data["user_parameters"]
+    assert set(WINDOW_FIELDS) <= set(fields)
+    assert fields["p_n_user"] == 1.75e-07 and fields["mu_c_user"] == 3000 and fields["z0_user"] == 500
+    assert all(isinstance(fields[name], float) for name in WINDOW_FIELDS)
+
+    params = calculation_parameters(read_calculation(path))
+    assert params["xv"] == 0.1
+    for name, value in printed.items():
+        assert params[name] == pytest.approx(float(value), rel=1e-5)
@@ -0,0 +1,80 @@
+import numpy as np
+
+from core import electrical_ZIP
+from core.trace import calc_mode, CalcTrace, MODE_PRINT, MODE_SILENT
+from models.sensitivity_zip import jacobian
+from models.sensor_zip import build_graph, calc_batch, GEOMETRY_CACHE, PARAMETERS, ZIPSensor
+
+
+def scalar(params):
+    return ZIPSensor(**{name: params[name] for name in PARAMETERS}).calc(MODE_SILENT)
+
+
+def test_batch_matches_scalar(designs):
+    batch = calc_batch(designs)
+    for index in np.ndindex(designs["d2"].shape):
+        params = {name: np.asarray(value)[index] if np.ndim(value) else value for name, value in designs.items()}
+        expected = scalar(params)
+        for name, value in expected.items():
+            np.testing.assert_allclose(batch[name][index], value, rtol=1e-12, err_msg=name)
+
+
+def test_gamma_regression(nominal):
+    # gamma = q/(2*(1+sqrt(1-q^2))) - табл. 2.2; прежняя q/2*(1+sqrt(1-q^2)) давала ~0.1151
+    results = calc_batch(nominal)
+    np.testing.assert_allclose(results["q"], 0.11551903161939986, rtol=1e-12)
+    np.testing.assert_allclose(results["gamma"], 0.028976753720379944, rtol=1e-12)
+    np.testing.assert_allclose(results["gamma_pi"], 0.019879698950187544, rtol=1e-12)
+
+    characteristic = electrical_ZIP.calc_characteristic(results["z_0"], results["k_x"], nominal["xv"])
+    np.testing.assert_allclose(np.abs(characteristic["delta"]).max(), results["gamma"], rtol=1e-6)
+
+
+def test_dual_jacobian_matches_finite_differences(nominal):
+    inputs = ("d2", "l0", "d_n", "mu_c", "z0")
+    sensitivity = jacobian(nominal, inputs=inputs)
+    for j, name in enumerate(inputs):
+        h = 1e-6 * nominal[name]
+        upper = calc_batch({**nominal, name: nominal[name] + h})
+        lower = calc_batch({**nominal, name: nominal[name] - h})
+        for i, output in enumerate(sensitivity.outputs):
+            expected = (upper[output] - lower[output]) / (2 * h)
+            # Погрешность округления разностной производной ~ eps*|f|/h
+            noise = 1e-9 * abs(sensitivity.values[output]) / h
+            np.testing.assert_allclose(sensitivity.jacobian[i, j], expected, rtol=1e-5, atol=noise,
+                                       err_msg=f"d{output}/d{name}")
+
+
+def test_graph_incremental_matches_full(nominal):
+    inputs = {name: nominal[name] for name in PARAMETERS if name not in ("d_zT_min", "eta_max")}
+    graph = build_graph()
+    graph.set(**inputs)
+    graph.evaluate()
+
+    graph.set(mu_c=2500.0, d_n=0.07)
+    incremental = graph.evaluate()
+    assert "geometry" not in graph.recomputed
+
+    full = build_graph()
+    full.set(**{**inputs, "mu_c": 2500.0, "d_n": 0.07})
+    expected = full.evaluate()
+    assert incremental.keys() == expected.keys()
+    for name, value in expected.items():
+        np.testing.assert_allclose(incremental[name], value, rtol=0, atol=0, err_msg=name)
+
+
+def test_silent_mode_prints_nothing(nominal, capsys):
+    GEOMETRY_CACHE.clear()
+    calc_batch(nominal)
+    calc_batch(nominal)  # повторно - через кэш геометрии
+    scalar(nominal)
+    assert capsys.readouterr().out == ""
+
+    with calc_mode(MODE_SILENT, CalcTrace()) as trace:
+        calc_batch(nominal)
+    assert capsys.readouterr().out == ""
+    assert len(trace) > 0
+
+    scalar_print = ZIPSensor(**{name: nominal[name] for name in PARAMETERS}).calc(MODE_PRINT)
+    assert capsys.readouterr().out != ""
+    assert scalar_print.keys() == scalar(nominal).keys()
@@ -0,0 +1,36 @@
+import threading
+
+import numpy as np
+import pytest
+
+from models.sensor_zip import calc_batch
+from models.sweep import ParameterGrid, run_sweep
+
+
+@pytest.fixture
+def grid(nominal):
+    axes = {"d2": np.linspace(3.5, 4.5, 9), "d_n": np.linspace(0.06, 0.1, 7)}
+    return ParameterGrid(axes, {name: value for name, value in nominal.items() if name not in axes})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunks_in_order(grid, workers):
+    chunks = list(run_sweep(grid, chunk_size=10, workers=workers, keys=["d_z", "f_p"]))
+    assert [chunk.start for chunk in chunks] == list(range(0, len(grid), 10))
+    assert chunks[-1].stop == len(grid)
+
+    expected = calc_batch({**grid.common, **grid.rows(0, len(grid))})
+    for name in ("d_z", "f_p"):
+        values = np.concatenate([np.broadcast_to(chunk.results[name], chunk.stop - chunk.start) for chunk in chunks])
+        np.testing.assert_allclose(values, expected[name], rtol=1e-12)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cancel_stops_after_current_chunk(grid, workers):
+    cancel = threading.Event()
+    chunks = []
+    for chunk in run_sweep(grid, chunk_size=10, workers=workers, cancel=cancel):
+        chunks.append(chunk)
+        cancel.set()
+    assert len(chunks) == 1
+    assert chunks[0].start == 0
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from core.validation import geometry_violation, pip_geometry_violation, sip_geometry_violation, MARGIN
+
+ZIP = {"D1": 12.0, "D2": 8.0, "d1": 2.0, "d2": 4.0, "h1": 8.0, "h2": 10.0, "h3": 12.0, "l0": 0.12, "xv": 0.1}
+PIP = {"D1": 12.0, "D2": 8.0, "d1": 4.0, "d2": 2.0, "h2": 8.0, "h3": 10.0, "l0": 0.12, "t_B": 1.0, "xv": 0.1}
+SIP = {"R": 6.0, "r": 4.0, "l_k": 20.0, "l_c": 30.0, "t_B": 1.0, "xv": 5.0}
+
+
+# Равенства, которые окна отклоняют (условия _validate_geometry строгие)
+@pytest.mark.parametrize("check, nominal, changes", [
+    (geometry_violation, ZIP, {"D2": 12.0}),
+    (geometry_violation, ZIP, {"d2": 8.0}),
+    (geometry_violation, ZIP, {"d1": 4.0}),
+    (geometry_violation, ZIP, {"h1": 10.0}),
+    (geometry_violation, ZIP, {"l0": 0.1}),
+    (geometry_violation, ZIP, {"h3": 0.0}),
+    (pip_geometry_violation, PIP, {"D2": 12.0}),
+    (pip_geometry_violation, PIP, {"D2": 6.0}),
+    (pip_geometry_violation, PIP, {"d2": 4.0}),
+    (pip_geometry_violation, PIP, {"h3": 8.0}),
+    (pip_geometry_violation, PIP, {"l0": 0.1}),
+    (sip_geometry_violation, SIP, {"R": 5.0}),
+    (sip_geometry_violation, SIP, {"l_k": 10.0}),
+])
+def test_boundary_is_infeasible(check, nominal, changes):
+    assert check(**nominal) == 0
+    assert check(**{**nominal, **changes}) > 0
+
+
+def test_margin_is_feasible():
+    assert geometry_violation(**{**ZIP, "D2": 12.0 - 2 * MARGIN, "l0": 0.1 + 2 * MARGIN}) == 0
+
+
+def test_arrays():
+    violation = geometry_violation(**{**ZIP, "D2": np.array([8.0, 12.0, 13.0])})
+    assert violation[0] == 0 and 0 < violation[1] < violation[2]